@@ -43,14 +43,12 @@ def make_atlas(image_glob, atlas_output, padding, remove, size: Optional[str] =
     # detect max width and height
     # The atlas size must be at least this size
     if not size:
+        from mindref.lib.adapters.atlas.fs.utils import read_img_sizes
+
         max_w, max_h = padding, padding
-        for f in img_files:
-            with Image.open(f) as im:
-                im_w, im_h = im.size
-                im_w += padding
-                im_h += padding
-                max_w = max(im_w, max_w)
-                max_h = max(im_h, max_h)
+        for im_w, im_h in read_img_sizes(img_files).values():
+            max_w = max(im_w + padding, max_w)
+            max_h = max(im_h + padding, max_h)
 
         atlas_size = max(max_w, max_h)
         atlas_size *= 6
@@ -4,11 +4,17 @@ $(PROJECT_ROOT)/%.c: $(PROJECT_ROOT)/%.pyx
 
 cythonize: $(PYX_C_FILES)
 
+kv-cache :
+	# Precompile .kv rules into __kvcache__ directories
+	uv run python -m mindref.lib.utils.kv_cache $(PROJECT_ROOT)
+.PHONY : kv-cache
+
 clean-bytecode :
 	# Remove this projects bytecode
 	find $(PROJECT_ROOT) -name "*.pyc" -delete
 	find $(PROJECT_ROOT) -name "__pycache__" -type d -print0 | xargs -0 rm -rf
 	find $(PROJECT_ROOT) -name ".mypy_cache" -type d -print0 | xargs -0 rm -rf
+	find $(PROJECT_ROOT) -name "__kvcache__" -type d -print0 | xargs -0 rm -rf
 .PHONY : clean-bytecode
 
 $(BUILD_DIR):
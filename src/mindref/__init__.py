@@ -0,0 +1,4 @@
+from . import startup
+
+if startup.enabled():
+    startup.install()
@@ -1,7 +1,7 @@
 import json
 from collections.abc import Callable
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from kivy import platform
 from kivy._clock import ClockEvent  # noqa
@@ -23,9 +23,8 @@ from kivy.properties import (
 )
 from kivy.uix.settings import Settings
 
+from mindref import startup
 from mindref.lib import DisplayState
-from mindref.lib.adapters.atlas import AtlasService
-from mindref.lib.adapters.editor import FileSystemEditor
 from mindref.lib.adapters.notes import NoteRepositoryFactory
 from mindref.lib.domain.events import (
     AddNoteEvent,
@@ -44,27 +43,54 @@ from mindref.lib.domain.events import (
     PaginationEvent,
     RefreshNotesEvent,
     SaveNoteEvent,
+    SaveNoteFailureEvent,
     TypeAheadQueryEvent,
 )
+from mindref.lib.domain.note_meta import ObservableNoteMeta
 from mindref.lib.domain.settings import app_settings
 from mindref.lib.plugins import PluginManager
 from mindref.lib.service import Registry
-from mindref.lib.utils import attrsetter, get_app, sch_cb, schedulable, trigger_factory
-from mindref.lib.widgets.screens.manager import NoteAppScreenManager
+from mindref.lib.utils import (
+    LazyLoaded,
+    attrsetter,
+    get_app,
+    sch_cb,
+    schedulable,
+    trigger_factory,
+)
+
+if TYPE_CHECKING:
+    from mindref.lib.adapters.atlas import (
+        AtlasService,
+        CategoryAtlas,
+        ThumbnailService,
+    )
+    from mindref.lib.adapters.editor import FileSystemEditor
+    from mindref.lib.adapters.notes.android.android_note_repository import (
+        AndroidNoteRepository,
+    )
+    from mindref.lib.adapters.notes.fs.fs_note_repository import (
+        FileSystemNoteRepository,
+    )
 
 
 class MindRefApp(App):
     APP_NAME = "MindRef"
-    atlas_service = AtlasService(storage_path=Path(__file__).parent / "static")
-    note_service = NoteRepositoryFactory.get_repo()(get_app=get_app)
-    editor_service = FileSystemEditor(get_app=get_app)
+    atlas_service: LazyLoaded["AtlasService"] = LazyLoaded()
+    thumbnail_service: LazyLoaded["ThumbnailService"] = LazyLoaded()
+    category_atlas: LazyLoaded["CategoryAtlas"] = LazyLoaded()
+    note_service: LazyLoaded["FileSystemNoteRepository | AndroidNoteRepository"] = (
+        LazyLoaded()
+    )
+    editor_service: LazyLoaded["FileSystemEditor"] = LazyLoaded()
     plugin_manager = PluginManager()
     platform_android = BooleanProperty(defaultvalue=False)
     registry = Registry()
 
     note_categories = ListProperty()
     note_category = StringProperty(allownone=True)
-    note_category_meta = ListProperty()
+    note_storage_path = ObjectProperty(allownone=True)
+    note_category_meta = ObjectProperty()
 
     editor_note = ObjectProperty(allownone=True)
 
@@ -111,12 +137,14 @@ class MindRefApp(App):
         note_service: AbstractNoteRepository
         note_categories: ListProperty
             All known note categories
+        note_storage_path: ObjectProperty
+            Root of note storage, or None if not set. Set through `Registry.set_note_storage_path`.
         note_category: StringProperty
             The active Category. If no active category, value is empty string
         editor_note: ObjectProperty
             Ephemeral note used by editor service
-        note_category_meta: ListProperty
-            Metadata for notes associated with active Category. Info such as Title and index
+        note_category_meta: ObjectProperty
+            `ObservableNoteMeta` of notes associated with active Category. Info such as Title and index
         next_note_scheduler: ObjectProperty
         current_display_state: OptionProperty
             One of ["choose", "display", "list", "edit", "add", "error"]
@@ -138,6 +166,41 @@ class MindRefApp(App):
 
     settings_cls = "MindRefSettings"
 
+    # Services are constructed on first access, keeping their import cost out of `import mindref.app`
+
+    @atlas_service
+    def _load_atlas_service(self) -> "AtlasService":
+        from mindref.lib.adapters.atlas import AtlasService
+
+        return AtlasService(storage_path=Path(__file__).parent / "static")
+
+    @thumbnail_service
+    def _load_thumbnail_service(self) -> "ThumbnailService":
+        from mindref.lib.adapters.atlas import ThumbnailService
+
+        return ThumbnailService(storage_path=Path(self.user_data_dir) / "thumbnails")
+
+    @category_atlas
+    def _load_category_atlas(self) -> "CategoryAtlas":
+        from mindref.lib.adapters.atlas import AtlasService, CategoryAtlas
+
+        storage_path = Path(self.user_data_dir) / "atlas"
+        storage_path.mkdir(parents=True, exist_ok=True)
+        atlas_service = AtlasService(
+            storage_path=storage_path, builtin_atlases={CategoryAtlas.atlas_name}
+        )
+        return CategoryAtlas(atlas_service, self.thumbnail_service)
+
+    @note_service
+    def _load_note_service(self) -> "FileSystemNoteRepository | AndroidNoteRepository":
+        return NoteRepositoryFactory.get_repo()(get_app=get_app)
+
+    @editor_service
+    def _load_editor_service(self) -> "FileSystemEditor":
+        from mindref.lib.adapters.editor import FileSystemEditor
+
+        return FileSystemEditor(get_app=get_app)
+
     def get_display_state(self) -> tuple[DisplayState, DisplayState]:
         return self.display_state_last, self.display_state_current
 
@@ -240,7 +303,7 @@ class MindRefApp(App):
 
                 match error:
                     case "permission_error" | "not_found":
-                        self.note_service.storage_path = None
+                        registry.set_note_storage_path(None)
                         app_config: ConfigParser | None = Config.get_configparser("app")
                         if app_config:
                             app_config.set(
@@ -280,7 +343,7 @@ class MindRefApp(App):
                     case str():
 
                         def set_note_category_meta(meta):
-                            self.note_category_meta = meta
+                            self.note_category_meta.assign(meta)
                             sch_cb(
                                 set_note_category,
                                 refresh_note_page,
@@ -310,7 +373,9 @@ class MindRefApp(App):
                             f"{type(self).__name__}: process_note_category_event - Scheduled Updating Note Data"
                         )
                     case None:
-                        clear_note_meta = attrsetter(self, "note_category_meta", [])
+                        clear_note_meta = schedulable(
+                            self.note_category_meta.assign, []
+                        )
                         sch_cb(set_note_category, clear_note_meta)
                         Logger.info(
                             f"{type(self).__name__}: process_note_category_event - Scheduled Clearing Note Data"
@@ -340,6 +405,10 @@ class MindRefApp(App):
                 remove_edit_note_widget = attrsetter(self, "editor_note", None)
                 persist_note = schedulable(registry.save_note, note=data_note)
                 return sch_cb(persist_note, remove_edit_note_widget, timeout=0.1)
+            case SaveNoteFailureEvent(path=path, error=error):
+                Logger.error(event)
+                self.error_message = f"{event.message}\n\n{path.name}\n{error}"
+                return self.display_state_trigger(DisplayState.ERROR)
             case AddNoteEvent():
                 data_note = registry.new_note(category=self.note_category, idx=None)
                 add_edit_note_widget = attrsetter(self, "editor_note", data_note)
@@ -414,7 +483,14 @@ class MindRefApp(App):
 
     """Kivy"""
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.note_category_meta = ObservableNoteMeta()
+
     def build(self):
+        from mindref.lib.widgets.screens.manager import NoteAppScreenManager
+
+        startup.mark("build")
         truthy = {True, "1", "True"}
         # noinspection PyUnresolvedReferences
         self.register_event_type("on_paginate")
@@ -447,6 +523,9 @@ class MindRefApp(App):
         self.registry.query_all()
 
         self.base_font_size = self.config.get("Display", "BASE_FONT_SIZE")
+        self.category_atlas.enabled = (
+            self.config.get("Display", "CATEGORY_ATLAS") in truthy
+        )
         Clock.schedule_interval(self.process_event, 1e-4)
         self.plugin_manager.init_app(self)
         sm.fbind(
@@ -472,7 +551,9 @@ class MindRefApp(App):
         match platform:  # We can't use self.platform_android yet
             case "android":
                 config.setdefaults("Storage", {"NOTES_PATH": None})
-                config.setdefaults("Display", {"BASE_FONT_SIZE": 18})
+                config.setdefaults(
+                    "Display", {"BASE_FONT_SIZE": 18, "CATEGORY_ATLAS": False}
+                )
                 config.setdefaults(
                     "Plugins", {"SCREEN_SAVER_ENABLE": False, "SCREEN_SAVER_DELAY": 60}
                 )
@@ -482,7 +563,9 @@ class MindRefApp(App):
                     "Storage",
                     {"NOTES_PATH": self.user_data_dir},
                 )
-                config.setdefaults("Display", {"BASE_FONT_SIZE": 16})
+                config.setdefaults(
+                    "Display", {"BASE_FONT_SIZE": 16, "CATEGORY_ATLAS": False}
+                )
                 config.setdefaults(
                     "Plugins", {"SCREEN_SAVER_ENABLE": False, "SCREEN_SAVER_DELAY": 60}
                 )
@@ -492,7 +575,7 @@ class MindRefApp(App):
         Logger.info(f"{type(self).__name__}: on_config_change - {section},{key}")
         match section, key:
             case "Storage", "NOTES_PATH" if not self.platform_android:
-                self.note_service.storage_path = value
+                self.registry.set_note_storage_path(value)
                 self.display_state_trigger(DisplayState.CHOOSE)
                 self.registry.push_event(RefreshNotesEvent(on_complete=None))
             case "Storage", "NOTES_PATH" if self.platform_android:
@@ -521,8 +604,20 @@ class MindRefApp(App):
                 self.registry.push_event(RefreshNotesEvent(on_complete=None))
             case "Display", "BASE_FONT_SIZE":
                 self.base_font_size = int(value)
+            case "Display", "CATEGORY_ATLAS":
+                # Applies to category buttons created from now on
+                self.category_atlas.enabled = value in truthy
             case "Plugins", _:
                 ...
 
+    def on_start(self):
+        startup.mark("start")
+        # Scheduled callbacks run after the first frame has been drawn
+        Clock.schedule_once(startup.first_frame)
+
     def on_pause(self):
+        self.note_service.flush()
         return True
+
+    def on_stop(self):
+        self.note_service.flush()
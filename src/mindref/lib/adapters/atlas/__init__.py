@@ -1,2 +1,2 @@
 from .atlas_repository import AbstractAtlasRepository
-from .fs import AtlasService
+from .fs import AtlasService, CategoryAtlas, ThumbnailService
@@ -1,13 +1,18 @@
+from __future__ import annotations
+
 import abc
-from collections.abc import Sequence
-from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
 
-import PIL.Image
+    import PIL.Image
 
 
 class AbstractAtlasRepository(abc.ABC):
     @abc.abstractmethod
-    def get_from_atlas(self, name: str, atlas_name: str) -> PIL.Image:
+    def get_from_atlas(self, name: str, atlas_name: str) -> PIL.Image.Image:
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -21,6 +26,13 @@ class AbstractAtlasRepository(abc.ABC):
     ):
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def compact_atlas(
+        self, atlas_name: str, max_page_size: int = 2048, padding: int = 2
+    ) -> list[tuple[int, int]]:
+        """Repack an atlas into the fewest pages"""
+        raise NotImplementedError
+
     @abc.abstractmethod
     def uri_for(self, name: str, atlas_name: str) -> str:
         """Return URI for Image"""
@@ -1 +1,3 @@
-from .fs_atlas_repository import AtlasService
\ No newline at end of file
+from .category_atlas import CategoryAtlas
+from .fs_atlas_repository import AtlasService
+from .thumbnails import ThumbnailService
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+from functools import partial
+from typing import TYPE_CHECKING
+
+from kivy import Logger
+from kivy.clock import Clock
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from mindref.lib.adapters.atlas.fs.fs_atlas_repository import AtlasService
+    from mindref.lib.adapters.atlas.fs.thumbnails import ThumbnailService
+
+    AtlasRequest = tuple[str, Path | str, tuple[int, int], Callable[[str | None], None]]
+
+
+class CategoryAtlas:
+    """
+    Packs category image thumbnails into a runtime atlas, so the chooser screen draws from a single texture.
+
+    Requests made within the same frames are batched: their thumbnails are created on worker threads, then the ones
+    missing from the atlas are packed with a single `AtlasService.save_to_atlas` call. Existing pages are filled
+    before new ones are created, so adding a category updates the atlas incrementally.
+
+    Members are named `{category key}-{thumbnail key}`. When a category's image changes its previous member is
+    removed, freeing its area for later additions.
+
+    Parameters
+    ----------
+    atlas_service
+        Service storing the runtime atlas, separate from the bundled atlases
+    thumbnail_service
+    page_size
+        Size of the atlas pages
+    """
+
+    atlas_name = "categories"
+
+    def __init__(
+        self,
+        atlas_service: AtlasService,
+        thumbnail_service: ThumbnailService,
+        page_size: tuple[int, int] = (1024, 1024),
+    ):
+        self.atlas_service = atlas_service
+        self.thumbnail_service = thumbnail_service
+        self.page_size = page_size
+        self.enabled = False
+        self._pending: list[AtlasRequest] = []
+        self._flush_trigger = Clock.create_trigger(self._flush, 0.1)
+
+    @staticmethod
+    def category_key(category: str) -> str:
+        return hashlib.sha1(category.encode()).hexdigest()[:12]
+
+    def member_name(self, category: str, thumbnail: Path) -> str:
+        return f"{self.category_key(category)}-{thumbnail.stem[:16]}"
+
+    def request(
+        self,
+        category: str,
+        source: Path | str,
+        on_complete: Callable[[str | None], None],
+        size: tuple[int, int],
+    ):
+        """
+        Get the `atlas://` uri of a category's image. `on_complete` is called with the uri, or None on failure.
+        """
+        self._pending.append((category, source, size, on_complete))
+        self._flush_trigger()
+
+    def _flush(self, *_args):
+        pending, self._pending = self._pending, []
+        thumbnails: dict[int, Path | None] = {}
+
+        def thumbnail_loaded(i: int, thumbnail: Path | None):
+            thumbnails[i] = thumbnail
+            if len(thumbnails) == len(pending):
+                self._pack(pending, thumbnails)
+
+        for i, (_, source, size, _) in enumerate(pending):
+            self.thumbnail_service.request(
+                source, on_complete=partial(thumbnail_loaded, i), size=size
+            )
+
+    def _pack(self, pending: list[AtlasRequest], thumbnails: dict[int, Path | None]):
+        atlas_service, atlas_name = self.atlas_service, self.atlas_name
+        names: dict[int, str] = {}
+        additions: dict[str, Path] = {}
+        for i, (category, *_) in enumerate(pending):
+            if (thumbnail := thumbnails[i]) is None:
+                continue
+            name = names[i] = self.member_name(category, thumbnail)
+            if f"{atlas_name}.{name}" not in atlas_service:
+                additions[name] = thumbnail
+
+        # Members of these categories made from a previous image
+        category_keys = {self.category_key(category) for category, *_ in pending}
+        current = set(names.values())
+        stale = [
+            member
+            for member in atlas_service.image_names(atlas_name)
+            if member.split("-", 1)[0] in category_keys and member not in current
+        ]
+
+        try:
+            if stale:
+                atlas_service.remove_from_atlas(stale, atlas_name)
+            if additions:
+                atlas_service.save_to_atlas(
+                    list(additions.values()),
+                    list(additions),
+                    atlas_name=atlas_name,
+                    atlas_size=self.page_size,
+                )
+        except Exception as e:
+            Logger.error(f"{type(self).__name__}: _pack - {e}")
+            names.clear()
+
+        Logger.info(
+            f"{type(self).__name__}: _pack - {len(additions)} added, {len(stale)} removed"
+        )
+        for i, (*_, on_complete) in enumerate(pending):
+            name = names.get(i)
+            on_complete(atlas_service.uri_for(name, atlas_name) if name else None)
@@ -1,22 +1,20 @@
 from __future__ import annotations
 
 import json
-import os
 import re
-import shutil
-import tempfile
-from operator import itemgetter
+from collections import OrderedDict
 from pathlib import Path
 from typing import TYPE_CHECKING, ClassVar, NamedTuple, NewType
 
-import PIL.Image
-from kivy.atlas import Atlas as KivyAtlas
-
 from mindref.lib.adapters.atlas import AbstractAtlasRepository
-from mindref.lib.utils import EnvironContext, LazyLoaded
+from mindref.lib.adapters.atlas.fs.packing import MaxRectsBin, Rect, pack, pack_pages
+from mindref.lib.adapters.atlas.fs.utils import read_img_sizes
+from mindref.lib.utils import LazyLoaded
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterable, Sequence
+
+    import PIL.Image
 
 
 class AtlasItem(NamedTuple):
@@ -32,6 +30,67 @@ ImgPos = NewType("ImgPos", tuple[X, Y, W, H])
 AtlasFileData = dict[str, dict[str, ImgPos]]
 
 
+_PAGE_NUMBER = re.compile(r"(\d+)(?=\.png$)")
+
+
+def _page_number(page_name: str) -> int:
+    """Atlas pages follow a pattern of `{atlas}-{n}.png`"""
+    matched = _PAGE_NUMBER.search(page_name)
+    return int(matched.group(1)) if matched else -1
+
+
+def _crop_box(page_height: int, pos: ImgPos) -> tuple[int, int, int, int]:
+    """PIL crop box of an atlas position, which has its origin at the bottom left"""
+    x, y, w, h = pos
+    return x, page_height - h - y, x + w, page_height - y
+
+
+def _slot(page_height: int, pos: ImgPos, padding: int) -> Rect:
+    """Area an atlas member occupies when packed with `padding`, in image coordinates"""
+    x, top, _, _ = _crop_box(page_height, pos)
+    _, _, w, h = pos
+    return Rect(x - padding, top - padding, w + padding, h + padding)
+
+
+def _paste_padded(
+    out: PIL.Image.Image, img: PIL.Image.Image, slot: Rect, padding: int
+) -> ImgPos:
+    """
+    Paste `img` into its `slot` of an atlas page, bleeding the edge pixels into the padding as Kivy's atlas does.
+    Returns the atlas position of the image.
+    """
+    img = img.convert("RGBA")
+    w, h = img.size
+    x, y = slot.x + padding, slot.y + padding
+    out.paste(img, (x, y))
+    if padding > 1:
+        out.paste(img.crop((0, 0, w, 1)), (x, y - 1))
+        out.paste(img.crop((0, h - 1, w, h)), (x, y + h))
+        out.paste(img.crop((0, 0, 1, h)), (x - 1, y))
+        out.paste(img.crop((w - 1, 0, w, h)), (x + w, y))
+    return ImgPos((x, out.height - y - h, w, h))
+
+
+class AtlasIndex(NamedTuple):
+    """
+    Loaded contents of an atlas file
+
+    `stamp` is the (mtime, size) of the file when read. `members` maps each image name to its atlas page and position.
+    """
+
+    stamp: tuple[int, int]
+    data: AtlasFileData
+    members: dict[str, tuple[str, ImgPos]]
+
+    @classmethod
+    def from_data(cls, stamp: tuple[int, int], data: AtlasFileData) -> AtlasIndex:
+        members: dict[str, tuple[str, ImgPos]] = {}
+        for atlas_img, img_positions in data.items():
+            for img_name, img_pos in img_positions.items():
+                members.setdefault(img_name, (atlas_img, img_pos))
+        return cls(stamp, data, members)
+
+
 class AtlasService(AbstractAtlasRepository):
     """
     Manages Atlases
@@ -45,9 +104,21 @@ class AtlasService(AbstractAtlasRepository):
     _storage_path: Path | None
     _instance = None
 
-    def __init__(self, storage_path: Path | str | None = None):
+    def __init__(
+        self,
+        storage_path: Path | str | None = None,
+        page_cache_size: int = 4,
+        builtin_atlases: set[str] | None = None,
+    ):
         self.storage_path = storage_path
+        if builtin_atlases is not None:
+            self.builtin_atlases = builtin_atlases
         self._atlases = None
+        self._indexes: dict[str, AtlasIndex] = {}
+        self.page_cache_size = page_cache_size
+        self._pages: OrderedDict[Path, tuple[tuple[int, int], PIL.Image.Image]] = (
+            OrderedDict()
+        )
 
     def __contains__(self, item):
         """
@@ -58,9 +129,7 @@ class AtlasService(AbstractAtlasRepository):
         if "." not in item:
             raise ValueError(f"Expected {item} to be of form atlas_name.image_name")
         atlas_name, image_name = item.split(".")
-        atlas_data = self._read_atlas(atlas_name)
-        image_names = {name for name_grp in atlas_data.values() for name in name_grp}
-        return image_name in image_names
+        return image_name in self._atlas_index(atlas_name).members
 
     @property
     def storage_path(self) -> Path:
@@ -100,15 +169,36 @@ class AtlasService(AbstractAtlasRepository):
         except StopIteration as e:
             raise KeyError(f"{atlas_name} does not exist") from e
 
-    def _read_atlas(self, atlas_name: str) -> AtlasFileData:
+    @staticmethod
+    def _stamp(path: Path) -> tuple[int, int]:
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def _atlas_index(self, atlas_name: str) -> AtlasIndex:
+        """Return the index of an atlas, rereading the atlas file only if it changed since last read"""
         matched_item = self._match_atlas(atlas_name)
-        with matched_item.path.open(mode="r", encoding="utf-8") as fp:
-            return json.load(fp)
+        stamp = self._stamp(matched_item.path)
+        index = self._indexes.get(atlas_name)
+        if index is None or index.stamp != stamp:
+            with matched_item.path.open(mode="r", encoding="utf-8") as fp:
+                index = AtlasIndex.from_data(stamp, json.load(fp))
+            self._indexes[atlas_name] = index
+        return index
+
+    def image_names(self, atlas_name: str) -> set[str]:
+        """Names of all images stored in an atlas"""
+        return set(self._atlas_index(atlas_name).members)
+
+    def _read_atlas(self, atlas_name: str) -> AtlasFileData:
+        return dict(self._atlas_index(atlas_name).data)
 
     def _store_atlas(self, atlas_name, data):
         matched_item = self._match_atlas(atlas_name)
         with matched_item.path.open(mode="w+", encoding="utf-8") as fp:
             json.dump(data, fp)
+        self._indexes[atlas_name] = AtlasIndex.from_data(
+            self._stamp(matched_item.path), data
+        )
 
     def _atlas_path(self, atlas_name: str) -> Path:
         matched_item = self._match_atlas(atlas_name)
@@ -123,52 +213,25 @@ class AtlasService(AbstractAtlasRepository):
         padding: int = 2,
     ):
         """
-        Lazy implementation that will create an n+1 atlas image large enough to contain the passed images.
+        Pack images into the atlas, filling free space in existing pages before creating new ones.
 
         Parameters
         ----------
-        padding
-        image_names
         images
+            Paths of the images to add
+        image_names
+            Name to store each image under, matched to `images` by position
         atlas_name
         atlas_size
             Optional, if not passed, will be inferred from existing atlas.
-            If passed, expects to be of form (width, height)
+            If passed, expects to be of form (width, height). Applies to newly created pages.
         padding
             Defaults to 2
-
-        Returns
-        -------
-
         """
-
-        def get_width(x: ImgPos):
-            return sum(itemgetter(0, 2)(x)) + padding
-
-        def get_height(x: ImgPos):
-            return sum(itemgetter(1, 3)(x)) + padding
-
-        def get_max_dimension(data: AtlasFileData):
-            w_max, h_max = 0, 0
-            for _, img_names in data.items():
-                w_max = max(w_max, *(get_width(img_names[k]) for k in img_names))
-                h_max = max(h_max, *(get_height(img_names[k]) for k in img_names))
-            return w_max, h_max
-
-        def get_last_image(data: AtlasFileData) -> int:
-            """
-            We know atlas images follow a pattern of `n.png`. Find the last `n` so we can increment
-            """
-            pattern = re.compile(r"(\d+)(?=.png)")
-            atlas_image_names = ",".join(data.keys())
-            atlas_image_numbers = (int(x) for x in pattern.findall(atlas_image_names))
-            try:
-                return max(atlas_image_numbers)
-            except ValueError:
-                return -1
+        import PIL.Image
 
         def ensure_name_integrity(data: AtlasFileData) -> bool:
-            img_name_set = set(image_names)
+            img_name_set = {*image_names, *(name.lower() for name in image_names)}
             img_names = {
                 name for name_grp in (v for v in data.values()) for name in name_grp
             }
@@ -179,49 +242,204 @@ class AtlasService(AbstractAtlasRepository):
 
         atlas_data = self._read_atlas(atlas_name)
         ensure_name_integrity(atlas_data)
-        if not atlas_size:
-            atlas_w, atlas_h = get_max_dimension(atlas_data)
+        atlas_path = self._atlas_path(atlas_name)
+
+        # Enforce lower casing
+        sources = {
+            name.lower(): img for img, name in zip(images, image_names, strict=True)
+        }
+        if not sources:
+            return
+        page_names = sorted(atlas_data, key=_page_number)
+        img_sizes = read_img_sizes(
+            [*sources.values(), *(atlas_path / page_name for page_name in page_names)]
+        )
+        sizes = {
+            name: (img_sizes[img][0] + padding, img_sizes[img][1] + padding)
+            for name, img in sources.items()
+        }
+
+        bins = []
+        for page_name in page_names:
+            page_w, page_h = img_sizes[atlas_path / page_name]
+            occupied = (
+                _slot(page_h, pos, padding) for pos in atlas_data[page_name].values()
+            )
+            bins.append(MaxRectsBin(page_w, page_h, occupied))
+
+        if atlas_size:
+            page_size = atlas_size
+        elif bins:
+            page_size = max(b.width for b in bins), max(b.height for b in bins)
         else:
-            atlas_w, atlas_h = atlas_size
+            (page_size, *_), _ = pack_pages(sizes)
 
-        temp_dir_container = tempfile.TemporaryDirectory()
-        temp_dir_atlas = Path(temp_dir_container.name) / "kv_temp_atlas"
+        placements = pack(sizes, bins, page_size)
 
-        with EnvironContext({"KIVY_NO_ARGS": "1"}):
-            out_name, meta = KivyAtlas.create(
-                os.fspath(temp_dir_atlas), images, (atlas_w, atlas_w)
-            )
+        prefix = atlas_name.replace("_", "-")
+        next_n = max(map(_page_number, page_names), default=-1) + 1
+        page_names.extend(
+            f"{prefix}-{next_n + i}.png" for i in range(len(bins) - len(page_names))
+        )
 
-        # Now set about appending these atlas images
-        atlas_n_start = get_last_image(atlas_data) + 1
-
-        def sort_atlas_imgs(p: Path):
-            return int(p.stem.rsplit("-")[-1])
-
-        atlas_img_dst_folder = self._atlas_path(atlas_name)
-
-        img_files = (f for f in Path(temp_dir_container.name).iterdir() if f.is_file())
-        img_files = (f for f in img_files if f.suffix in {".png", ".jpg", ".jpeg"})
-        for i, atlas_img in enumerate(sorted(img_files, key=sort_atlas_imgs)):
-            atlas_img_name = f"{atlas_name}-{atlas_n_start + i}.png".replace("_", "-")
-            dst = (atlas_img_dst_folder / atlas_img_name).with_suffix(".png")
-            # Enforce lower casing
-            atlas_data.update(
-                {
-                    atlas_img_name: {
-                        k.lower(): v for k, v in meta[atlas_img.name].items()
-                    }
-                }
-            )
-            shutil.move(atlas_img, dst)
+        by_page: dict[int, list[str]] = {}
+        for name, (i, _) in placements.items():
+            by_page.setdefault(i, []).append(name)
+
+        for i, names in sorted(by_page.items()):
+            page_name, page = page_names[i], bins[i]
+            page_fp = atlas_path / page_name
+            if page_name in atlas_data:
+                with PIL.Image.open(page_fp) as page_img:
+                    out = page_img.convert("RGBA")
+            else:
+                out = PIL.Image.new("RGBA", (page.width, page.height))
+            members = dict(atlas_data.get(page_name, {}))
+            for name in names:
+                _, rect = placements[name]
+                with PIL.Image.open(sources[name]) as img:
+                    members[name] = _paste_padded(out, img, rect, padding)
+            out.save(page_fp)
+            atlas_data[page_name] = members
 
-        temp_dir_container.cleanup()
+        self._store_atlas(atlas_name, atlas_data)
+        self._invalidate_kivy_atlas(
+            atlas_name,
+            self._atlas_index(atlas_name).members,
+            (page_names[i] for i in by_page),
+        )
+
+    def remove_from_atlas(self, image_names: Iterable[str], atlas_name: str):
+        """
+        Remove images from an atlas. The area they occupied is reused by later `save_to_atlas` calls,
+        pages left empty are deleted.
+
+        Parameters
+        ----------
+        image_names
+        atlas_name
+        """
+        removed = set(image_names)
+        atlas_data = self._read_atlas(atlas_name)
+        atlas_path = self._atlas_path(atlas_name)
+        deleted = []
+        for page_name, members in list(atlas_data.items()):
+            if removed.isdisjoint(members):
+                continue
+            remaining = {k: v for k, v in members.items() if k not in removed}
+            if remaining:
+                atlas_data[page_name] = remaining
+            else:
+                del atlas_data[page_name]
+                (atlas_path / page_name).unlink(missing_ok=True)
+                deleted.append(page_name)
 
         self._store_atlas(atlas_name, atlas_data)
+        self._invalidate_kivy_atlas(atlas_name, removed, deleted)
+
+    def compact_atlas(
+        self, atlas_name: str, max_page_size: int = 2048, padding: int = 2
+    ) -> list[tuple[int, int]]:
+        """
+        Repack every image of an atlas into the fewest power-of-two pages, removing pages left unused.
+
+        Parameters
+        ----------
+        atlas_name
+        max_page_size
+            Largest width or height of a page, unless a single image requires more
+        padding
+            Defaults to 2
+
+        Returns
+        -------
+        The (width, height) of each resulting page
+        """
+        import PIL.Image
+
+        atlas_data = self._read_atlas(atlas_name)
+        atlas_path = self._atlas_path(atlas_name)
+        sources = self.get_many_from_atlas(
+            [name for members in atlas_data.values() for name in members], atlas_name
+        )
+
+        sizes = {
+            name: (img.width + padding, img.height + padding)
+            for name, img in sources.items()
+        }
+        pages, placements = pack_pages(sizes, max_page_size)
+
+        prefix = atlas_name.replace("_", "-")
+        outs = [PIL.Image.new("RGBA", size) for size in pages]
+        compacted: AtlasFileData = {f"{prefix}-{i}.png": {} for i in range(len(pages))}
+        page_names = list(compacted)
+        for name, (i, rect) in placements.items():
+            compacted[page_names[i]][name] = _paste_padded(
+                outs[i], sources[name], rect, padding
+            )
+
+        for page_name, out in zip(page_names, outs, strict=True):
+            out.save(atlas_path / page_name)
+        for page_name in atlas_data.keys() - compacted.keys():
+            (atlas_path / page_name).unlink(missing_ok=True)
 
-    def get_from_atlas(self, name: str, atlas_name: str) -> "PIL.Image.Image":
+        self._store_atlas(atlas_name, compacted)
+        self._invalidate_kivy_atlas(
+            atlas_name, sources, atlas_data.keys() | compacted.keys()
+        )
+        return pages
+
+    def _invalidate_kivy_atlas(
+        self, atlas_name: str, image_names: Iterable[str], page_names: Iterable[str]
+    ):
+        """
+        Drop Kivy's cached copy of an atlas so `atlas://` uris load the updated pages
+
+        Parameters
+        ----------
+        atlas_name
+        image_names
+            Members whose region textures are evicted
+        page_names
+            Pages written or deleted. Kivy caches each page's image under its path, reloading the atlas would
+            otherwise cut regions from the stale page.
+        """
+        from kivy.cache import Cache
+
+        atlas_fp = self._match_atlas(atlas_name).path
+        rfn = str(atlas_fp.with_suffix(""))
+        Cache.remove("kv.atlas", rfn)
+        for name in image_names:
+            Cache.remove("kv.texture", f"atlas://{rfn}/{name}|0|0")
+        for page_name in page_names:
+            uid = f"{atlas_fp.parent / page_name}|0|0"
+            Cache.remove("kv.image", uid)
+            Cache.remove("kv.texture", uid)
+
+    def _get_page(self, page_path: Path) -> PIL.Image.Image:
+        """
+        Return a decoded atlas page. The `page_cache_size` most recently used pages are kept, a page is decoded
+        again only if evicted or its file changed.
+        """
+        import PIL.Image
+
+        stamp = self._stamp(page_path)
+        cached = self._pages.get(page_path)
+        if cached is not None and cached[0] == stamp:
+            self._pages.move_to_end(page_path)
+            return cached[1]
+        with PIL.Image.open(page_path) as page_img:
+            page_img.load()
+        self._pages[page_path] = (stamp, page_img)
+        self._pages.move_to_end(page_path)
+        while len(self._pages) > self.page_cache_size:
+            self._pages.popitem(last=False)
+        return page_img
+
+    def get_from_atlas(self, name: str, atlas_name: str) -> PIL.Image.Image:
         """
         Retrieve an image by name and atlas name
+
         Parameters
         ----------
         name
@@ -229,30 +447,46 @@ class AtlasService(AbstractAtlasRepository):
 
         Returns
         -------
+        A copy of the image, cropped from its decoded atlas page
+        """
+        matched_atlas_img, matched_img_size = self._match_atlas_member(atlas_name, name)
+        page_img = self._get_page(self._atlas_path(atlas_name) / matched_atlas_img)
+        return page_img.crop(_crop_box(page_img.height, matched_img_size))
 
+    def get_many_from_atlas(
+        self, names: Iterable[str], atlas_name: str
+    ) -> dict[str, PIL.Image.Image]:
         """
-        atlas_data = self._read_atlas(atlas_name)
-        matched_atlas_img, matched_img = self._match_atlas_member(
-            atlas_data, atlas_name, name
-        )
+        Retrieve several images of an atlas, decoding each atlas page at most once
+
+        Parameters
+        ----------
+        names
+        atlas_name
+
+        Returns
+        -------
+        Image name to image
+        """
+        by_page: dict[str, list[tuple[str, ImgPos]]] = {}
+        for name in names:
+            atlas_img, img_pos = self._match_atlas_member(atlas_name, name)
+            by_page.setdefault(atlas_img, []).append((name, img_pos))
 
-        matched_img_size = matched_img[1]
         atlas_path = self._atlas_path(atlas_name)
-        atlas_img_path = atlas_path / matched_atlas_img
-        img_obj = PIL.Image.open(atlas_img_path)
-        x, y, w, h = matched_img_size
-        return img_obj.crop((x, (img_obj.height - h - y), x + w, y + h))
-
-    def _match_atlas_member(
-        self, atlas_data: AtlasFileData, atlas_name: str, name: str
-    ) -> tuple[str, ImgPos]:
-        """Find an atlas member"""
-        for atlas_img, members in atlas_data.items():
-            matched_img = next((members[img] for img in members if img == name), None)
-            if matched_img:
-                return atlas_img, matched_img
-
-        raise KeyError(f"{name} not found in atlas {atlas_name}")
+        images = {}
+        for atlas_img, members in by_page.items():
+            page_img = self._get_page(atlas_path / atlas_img)
+            for name, img_pos in members:
+                images[name] = page_img.crop(_crop_box(page_img.height, img_pos))
+        return images
+
+    def _match_atlas_member(self, atlas_name: str, name: str) -> tuple[str, ImgPos]:
+        """Find an atlas member, returning the atlas image it's stored in and its position"""
+        try:
+            return self._atlas_index(atlas_name).members[name]
+        except KeyError as e:
+            raise KeyError(f"{name} not found in atlas {atlas_name}") from e
 
     def uri_for(self, name: str, atlas_name: str):
         matched = self._match_atlas(atlas_name)
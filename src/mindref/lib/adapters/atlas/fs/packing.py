@@ -0,0 +1,216 @@
+"""
+MaxRects bin packing for atlas pages
+
+Rectangles use image coordinates (origin at the top left), as PIL does. Kivy's `.atlas` files store positions with the
+origin at the bottom left, conversion happens in `AtlasService`.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Iterable, Mapping
+
+    K = TypeVar("K", bound=Hashable)
+
+
+class Rect(NamedTuple):
+    x: int
+    y: int
+    w: int
+    h: int
+
+    @property
+    def right(self) -> int:
+        return self.x + self.w
+
+    @property
+    def bottom(self) -> int:
+        return self.y + self.h
+
+    def contains(self, other: Rect) -> bool:
+        return (
+            self.x <= other.x
+            and self.y <= other.y
+            and other.right <= self.right
+            and other.bottom <= self.bottom
+        )
+
+    def intersects(self, other: Rect) -> bool:
+        return (
+            self.x < other.right
+            and other.x < self.right
+            and self.y < other.bottom
+            and other.y < self.bottom
+        )
+
+
+def next_power_of_two(n: int) -> int:
+    return 1 << max(n - 1, 0).bit_length()
+
+
+class MaxRectsBin:
+    """
+    A single page, tracking the maximal free rectangles left after each placement.
+
+    Parameters
+    ----------
+    width
+    height
+    occupied
+        Areas already in use, such as the images of an existing atlas page
+    """
+
+    def __init__(self, width: int, height: int, occupied: Iterable[Rect] = ()):
+        self.width = width
+        self.height = height
+        self.used: list[Rect] = []
+        self.free: list[Rect] = [Rect(0, 0, width, height)]
+        bounds = Rect(0, 0, width, height)
+        for rect in occupied:
+            # Clip to the page, existing members may have their padding hanging off the edge
+            x, y = max(rect.x, 0), max(rect.y, 0)
+            clipped = Rect(
+                x, y, min(rect.right, width) - x, min(rect.bottom, height) - y
+            )
+            if clipped.w > 0 and clipped.h > 0 and bounds.intersects(clipped):
+                self.place(clipped)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.width}x{self.height}, occupancy={self.occupancy:.2f})"
+
+    @property
+    def occupancy(self) -> float:
+        return sum(r.w * r.h for r in self.used) / (self.width * self.height)
+
+    def find(self, w: int, h: int) -> Rect | None:
+        """Best short side fit: the free rectangle leaving the smallest leftover on its shorter side"""
+        best, best_score = None, None
+        for free in self.free:
+            if free.w < w or free.h < h:
+                continue
+            leftover_w, leftover_h = free.w - w, free.h - h
+            score = (min(leftover_w, leftover_h), max(leftover_w, leftover_h))
+            if best_score is None or score < best_score:
+                best, best_score = Rect(free.x, free.y, w, h), score
+        return best
+
+    def insert(self, w: int, h: int) -> Rect | None:
+        rect = self.find(w, h)
+        if rect is not None:
+            self.place(rect)
+        return rect
+
+    def place(self, used: Rect) -> None:
+        self.used.append(used)
+        split: list[Rect] = []
+        for free in self.free:
+            if not free.intersects(used):
+                split.append(free)
+                continue
+            if used.x > free.x:
+                split.append(Rect(free.x, free.y, used.x - free.x, free.h))
+            if used.right < free.right:
+                split.append(Rect(used.right, free.y, free.right - used.right, free.h))
+            if used.y > free.y:
+                split.append(Rect(free.x, free.y, free.w, used.y - free.y))
+            if used.bottom < free.bottom:
+                split.append(
+                    Rect(free.x, used.bottom, free.w, free.bottom - used.bottom)
+                )
+        # Drop free rectangles enclosed by another
+        self.free = [
+            r
+            for i, r in enumerate(split)
+            if not any(
+                j != i and o.contains(r) and (o != r or j < i)
+                for j, o in enumerate(split)
+            )
+        ]
+
+    def used_bounds(self) -> tuple[int, int]:
+        """Smallest (width, height) enclosing every placed rectangle"""
+        return (
+            max((r.right for r in self.used), default=0),
+            max((r.bottom for r in self.used), default=0),
+        )
+
+
+def _pack_order(sizes: Mapping[K, tuple[int, int]]) -> list[K]:
+    return sorted(
+        sizes, key=lambda k: (max(sizes[k]), sizes[k][0] * sizes[k][1]), reverse=True
+    )
+
+
+def pack(
+    sizes: Mapping[K, tuple[int, int]],
+    bins: list[MaxRectsBin],
+    page_size: tuple[int, int],
+) -> dict[K, tuple[int, Rect]]:
+    """
+    Place each item into the first bin with room, opening new bins of `page_size` as needed.
+
+    Items larger than `page_size` get a bin of their own, sized to the next power of two.
+
+    Parameters
+    ----------
+    sizes
+        Item key to (width, height), including any padding
+    bins
+        Existing bins, which are filled first. New bins are appended.
+    page_size
+        (width, height) of new bins
+
+    Returns
+    -------
+    Item key to (bin index, placement)
+    """
+    placements: dict[K, tuple[int, Rect]] = {}
+    for key in _pack_order(sizes):
+        w, h = sizes[key]
+        for i, page in enumerate(bins):
+            rect = page.insert(w, h)
+            if rect is not None:
+                placements[key] = (i, rect)
+                break
+        else:
+            page = MaxRectsBin(
+                max(page_size[0], next_power_of_two(w)),
+                max(page_size[1], next_power_of_two(h)),
+            )
+            bins.append(page)
+            placements[key] = (len(bins) - 1, page.insert(w, h))
+    return placements
+
+
+def pack_pages(
+    sizes: Mapping[K, tuple[int, int]], max_page_size: int = 2048
+) -> tuple[list[tuple[int, int]], dict[K, tuple[int, Rect]]]:
+    """
+    Pack items into the fewest power-of-two pages no larger than `max_page_size`, preferring the least total area.
+
+    Pages are trimmed to the smallest power-of-two dimensions holding their contents.
+
+    Returns
+    -------
+    Page sizes and item key to (page index, placement)
+    """
+    if not sizes:
+        return [], {}
+    side = next_power_of_two(max(max(s) for s in sizes.values()))
+    area = sum(w * h for w, h in sizes.values())
+    best = None
+    while True:
+        for page_size in ((side, side), (side, side // 2), (side // 2, side)):
+            bins: list[MaxRectsBin] = []
+            placements = pack(sizes, bins, page_size)
+            pages = [tuple(map(next_power_of_two, b.used_bounds())) for b in bins]
+            score = (len(pages), sum(w * h for w, h in pages))
+            if best is None or score < best[0]:
+                best = score, pages, placements
+        if side >= max_page_size or side * side >= 4 * area:
+            break
+        side *= 2
+    _, pages, placements = best
+    return pages, placements
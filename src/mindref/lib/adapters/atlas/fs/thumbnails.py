@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from kivy import Logger
+from kivy.clock import mainthread
+
+from mindref.lib.utils import atomic_replace
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from concurrent.futures import Future
+
+
+class ThumbnailService:
+    """
+    On-disk cache of downscaled images
+
+    Thumbnails are stored as PNG files named by a hash of the source path, its modification time and the thumbnail
+    size. An edited (or replaced) source therefore maps to a new thumbnail and stale entries are never served.
+
+    Parameters
+    ----------
+    storage_path
+        Directory holding the thumbnails
+    size
+        Default bounding (width, height) of thumbnails
+    max_workers
+        Threads used by `request`
+    """
+
+    def __init__(
+        self,
+        storage_path: Path | str,
+        size: tuple[int, int] = (256, 256),
+        max_workers: int = 2,
+    ):
+        self.storage_path = Path(storage_path)
+        self.size = size
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="thumbnail"
+            )
+        return self._executor
+
+    def thumbnail_path(
+        self, source: Path | str, size: tuple[int, int] | None = None
+    ) -> Path:
+        """Path the thumbnail of `source` is stored at. Stats `source`."""
+        w, h = size or self.size
+        source = Path(source).resolve()
+        mtime_ns = source.stat().st_mtime_ns
+        key = hashlib.sha1(f"{source}|{mtime_ns}|{w}x{h}".encode()).hexdigest()
+        return self.storage_path / key[:2] / f"{key}.png"
+
+    def get_thumbnail(
+        self, source: Path | str, size: tuple[int, int] | None = None
+    ) -> Path:
+        """
+        Return the path of a thumbnail of `source`, creating it if not cached. Blocking.
+
+        Parameters
+        ----------
+        source
+            Image file to thumbnail
+        size
+            Bounding (width, height), aspect ratio is preserved. Defaults to `self.size`.
+        """
+        size = size or self.size
+        target = self.thumbnail_path(source, size)
+        if not target.exists():
+            self._make_thumbnail(Path(source), target, size)
+        return target
+
+    def request(
+        self,
+        source: Path | str,
+        on_complete: Callable[[Path | None], None],
+        size: tuple[int, int] | None = None,
+    ) -> Future[Path]:
+        """
+        Get a thumbnail from a worker thread. `on_complete` is called on the main thread with the thumbnail path,
+        or None if it could not be created.
+        """
+
+        @mainthread
+        def complete(future: Future[Path]):
+            try:
+                result = future.result()
+            except Exception as e:
+                Logger.warning(
+                    f"{type(self).__name__}: request - Unable to thumbnail {source} - {e}"
+                )
+                result = None
+            on_complete(result)
+
+        future = self.executor.submit(self.get_thumbnail, source, size)
+        future.add_done_callback(complete)
+        return future
+
+    @staticmethod
+    def _make_thumbnail(source: Path, target: Path, size: tuple[int, int]):
+        from PIL import Image, ImageOps
+
+        with Image.open(source) as img:
+            if img.format == "JPEG":
+                # Let the decoder downscale by up to 8x, rather than decoding every pixel
+                img.draft("RGB", size)
+            thumb = ImageOps.exif_transpose(img)
+            thumb.thumbnail(size, Image.Resampling.LANCZOS)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_replace(target) as tmp:
+                thumb.save(tmp, format="PNG")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import asyncio
+import struct
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
 from PIL import Image
@@ -9,14 +10,31 @@ if TYPE_CHECKING:
     from collections.abc import Sequence
     from pathlib import Path
 
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
 
-async def _read_img_size(f: Path | str) -> tuple[int, int]:
-    img = Image.open(f)
-    return img.width, img.height
 
+def read_img_size(f: Path | str) -> tuple[int, int]:
+    """
+    Read the (width, height) of an image from its header, without decoding pixel data.
 
-async def read_img_sizes(
-    imgs: Sequence[Path | str],
+    PNG dimensions are read directly from the IHDR chunk. Other formats fall back to `PIL.Image.open`, which parses
+    the header and defers decoding until the pixels are accessed.
+    """
+    with open(f, "rb") as fp:
+        head = fp.read(24)
+        if head[:8] == _PNG_SIGNATURE and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+        fp.seek(0)
+        with Image.open(fp) as img:
+            return img.size
+
+
+def read_img_sizes(
+    imgs: Sequence[Path | str], max_workers: int | None = None
 ) -> dict[Path | str, tuple[int, int]]:
-    sizes = await asyncio.gather(*[_read_img_size(f) for f in imgs])
-    return dict(zip(imgs, sizes, strict=False))
+    """Probe image sizes concurrently across a thread pool"""
+    if len(imgs) < 2:
+        return {f: read_img_size(f) for f in imgs}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        sizes = executor.map(read_img_size, imgs)
+        return dict(zip(imgs, sizes, strict=True))
@@ -1,4 +1,5 @@
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Future
 from enum import Flag, auto
 from functools import partial
 from os import PathLike
@@ -6,8 +7,6 @@ from pathlib import Path
 from typing import (
     TYPE_CHECKING,
     Any,
-    Literal,
-    cast,
 )
 
 from kivy import Logger
@@ -15,6 +14,17 @@ from kivy.clock import Clock, mainthread
 
 from mindref.lib.adapters.notes.android.annotations import MIME_TYPE
 from mindref.lib.adapters.notes.android.interface import AndroidStorageManager
+from mindref.lib.adapters.notes.android.listing import (
+    decode_listing,
+    listed_categories,
+    listed_category_resources,
+)
+from mindref.lib.adapters.notes.android.mirror import ExternalEntry, StorageMirror
+from mindref.lib.adapters.notes.android.operations import (
+    OperationFailed,
+    PendingOperations,
+)
+from mindref.lib.adapters.notes.android.write_behind import WriteBehindQueue
 from mindref.lib.adapters.notes.fs.fs_note_repository import (
     FileSystemNoteRepository,
     TGetCategoriesCallback,
@@ -29,24 +39,9 @@ if TYPE_CHECKING:
         MindRefUtilsCallbackPyMediator,
     )
     from mindref.lib.domain.editable import EditableNote
+    from mindref.lib.domain.note_resource import CategoryResourceFiles
     from mindref.lib.domain.protocols import GetApp
 
-CodeNames = Literal[
-    "MIRROR",
-    "READ",
-    "WRITE",
-    "REMOVE",
-    "CATEGORIES",
-    "NOTES",
-    "EXTERNAL_STORAGE",
-    "APP_STORAGE",
-    "FILE",
-    "DIRECTORY",
-    "PROMPT_EXTERNAL",
-    "PROMPT_EXTERNAL_DIRECTORY",
-    "PROMPT_EXTERNAL_FILE",
-]
-
 
 class MindRefCallCodes(Flag):
     MIRROR = auto()  # Mirroring a filesystem
@@ -67,27 +62,88 @@ class MindRefCallCodes(Flag):
     WRITE_DIRECTORY = WRITE | DIRECTORY
     WRITE_IMAGE = WRITE | IMAGE
 
-    @staticmethod
-    def check_field(x: int, n: int) -> bool:
-        return (x & n) != 0
-
-    @classmethod
-    def deconstruct_int(cls, val: int) -> tuple[tuple[CodeNames, ...], bool]:
-        fields_true = []
-        a_val = abs(val)
-        n_bits = a_val.bit_count()
-        n_found = 0
-        # noinspection PyTypeChecker
-        members: Iterable[tuple[CodeNames, int]] = (
-            (member.name, member.value) for member in cls
+
+class AndroidMirrorStorage:
+    """`MirrorStorage` backed by MindRefUtils, with results routed through the repository's operations"""
+
+    def __init__(self, repository: "AndroidNoteRepository"):
+        self.repository = repository
+
+    def list_external(self, on_complete: Callable[[list[ExternalEntry] | None], None]):
+        repository = self.repository
+
+        def listed(*arrays):
+            try:
+                listing = decode_listing(*arrays)
+            except (TypeError, ValueError) as e:
+                Logger.error(f"{type(self).__name__}: list_external - {e}")
+                listing = None
+            on_complete(listing)
+
+        def start(key: int):
+            if not AndroidStorageManager.list_external_storage(
+                repository._native_path, repository._storage_path, key
+            ):
+                # Fails the operation, `on_failure` then has the mirror copy the whole tree
+                raise OperationFailed("MindRefUtils.listExternalStorage is unavailable")
+
+        repository._submit(
+            MindRefCallCodes.MIRROR
+            | MindRefCallCodes.READ
+            | MindRefCallCodes.EXTERNAL_STORAGE,
+            start,
+            on_success=listed,
+            on_failure=lambda: on_complete(None),
+        )
+
+    def copy_to_app_storage(
+        self, paths: list[str], on_complete: Callable[[bool], None]
+    ):
+        repository = self.repository
+        # A batch of changed files, its copy time grows with the batch
+        repository._submit(
+            MindRefCallCodes.MIRROR
+            | MindRefCallCodes.EXTERNAL_STORAGE
+            | MindRefCallCodes.FILE,
+            lambda key: AndroidStorageManager.copy_files_to_app_storage(
+                repository._native_path, repository._storage_path, paths, key
+            ),
+            on_success=lambda *_args: on_complete(True),
+            on_failure=lambda: on_complete(False),
+            timeout=None,
+        )
+
+    def copy_all_to_app_storage(self, on_complete: Callable[[bool], None]):
+        repository = self.repository
+        # Copies the whole tree, which can take any amount of time
+        repository._submit(
+            MindRefCallCodes.MIRROR | MindRefCallCodes.EXTERNAL_STORAGE,
+            lambda key: AndroidStorageManager.clone_external_storage(
+                repository._native_path, repository._storage_path, key
+            ),
+            on_success=lambda *_args: on_complete(True),
+            on_failure=lambda: on_complete(False),
+            timeout=None,
+        )
+
+
+class AndroidExternalWriter:
+    """`ExternalWriter` backed by MindRefUtils, with results routed through the repository's operations"""
+
+    def __init__(self, repository: "AndroidNoteRepository"):
+        self.repository = repository
+
+    def write_external(self, path: Path, on_complete: Callable[[bool], None]):
+        repository = self.repository
+        Logger.info(f"{type(self).__name__} : storing {path} to external storage")
+        repository._submit(
+            MindRefCallCodes.WRITE | MindRefCallCodes.NOTES,
+            lambda key: AndroidStorageManager.copy_to_external_storage(
+                path, str(repository.storage_path), repository._native_path, key
+            ),
+            on_success=lambda *_args: on_complete(True),
+            on_failure=lambda: on_complete(False),
         )
-        for name, value in members:
-            if n_found == n_bits:
-                return tuple(fields_true), val >= 0
-            if MindRefCallCodes.check_field(val, value):
-                fields_true.append(name)
-                n_found += 1
-        return tuple(fields_true), val >= 0
 
 
 class AndroidNoteRepository(FileSystemNoteRepository):
@@ -98,13 +154,23 @@ class AndroidNoteRepository(FileSystemNoteRepository):
         Commonly accessible filepath
     _native_path
         Android content URI
+    _mirror
+        Mirrors `_native_path` into `_storage_path`
+    _write_behind
+        Saved notes waiting to be copied to `_native_path`
+    operations
+        MindRefUtils calls awaiting their callback, by request id
     """
 
     _storage_path: Path | None
     _native_path: str | None
-    _mediator_callbacks: dict[int, Callable]
+    _mirror: StorageMirror | None
+    _write_behind: WriteBehindQueue | None
+    operations: PendingOperations
     py_mediator: "MindRefUtilsCallbackPyMediator"
 
+    mirrored_storage = True
+
     def __init__(
         self,
         get_app: "GetApp",
@@ -123,7 +189,9 @@ class AndroidNoteRepository(FileSystemNoteRepository):
             **kwargs,
         )
         self._native_path = None
-        self._mediator_callbacks = {}
+        self._mirror = None
+        self._write_behind = None
+        self.operations = PendingOperations()
         AndroidStorageManager._mindref_callback_py_mediator = self.py_mediator
 
     @property
@@ -151,34 +219,78 @@ class AndroidNoteRepository(FileSystemNoteRepository):
         self._native_path = str(path)
         self._storage_path = Path(get_app().user_data_dir) / "notes"
         self._storage_path.mkdir(exist_ok=True, parents=True)
+        self._mirror = StorageMirror(AndroidMirrorStorage(self), self._storage_path)
+        self._write_behind = WriteBehindQueue(
+            AndroidExternalWriter(self), self._storage_path
+        )
         self.current_category = None
         self.category_files.clear()
         Logger.info(f"{type(self).__name__}: set storage path : {self._storage_path!s}")
 
+    def _submit(
+        self,
+        code: MindRefCallCodes,
+        start: Callable[[int], None],
+        on_success: Callable[..., None] | None = None,
+        on_failure: Callable[[], None] | None = None,
+        **kwargs,
+    ) -> Future:
+        """
+        Start a MindRefUtils call through `operations`
+
+        Parameters
+        ----------
+        code
+            Describes the call
+        start
+            Invokes `AndroidStorageManager` with the request id as its key
+        on_success
+            Called with the arguments MindRefUtils passed back
+        on_failure
+            Called if the call failed, timed out or was cancelled
+        kwargs
+            Passed to `PendingOperations.submit`
+        """
+
+        def done(future: Future):
+            if future.cancelled() or (error := future.exception()) is not None:
+                reason = "cancelled" if future.cancelled() else repr(error)
+                Logger.warning(f"{type(self).__name__}: {code.name} - {reason}")
+                if on_failure:
+                    on_failure()
+            elif on_success:
+                on_success(*future.result())
+
+        future = self.operations.submit(code.name, start, **kwargs)
+        future.add_done_callback(done)
+        return future
+
     @mainthread
     def py_mediator(self, key: int, *args):
         Logger.info(
             f"{type(self).__name__}: py_mediator - Got Key : {key}, Args: {args}"
         )
-        if key not in self._mediator_callbacks:
+        self.operations.resolve(key, *args)
+
+    def _copy_storage(self, on_complete: Callable[[Any], None]):
+        """
+        Bring app storage up to date with external storage, copying only new or changed files.
+
+        Queued writes are flushed first, so they aren't overwritten by the external copies they replace.
+        """
+
+        def flushed(_success: bool):
             Logger.info(
-                f"{type(self).__name__}: py_mediator - No callback for code {key}"
+                f"{type(self).__name__} : Mirroring {self._native_path} to {self._storage_path}"
             )
-            return
-        cb = self._mediator_callbacks.pop(key)
-        cb(*args)
+            self._mirror.sync(on_complete)
 
-    def _copy_storage(self, on_complete: Callable[[Any], None]):
-        Logger.info(
-            f"{type(self).__name__} : Invoking AndroidStorageManager to copy_storage from {self._native_path} to {self._storage_path}"
-        )
+        self._write_behind.flush(flushed)
 
-        key_ = MindRefCallCodes.MIRROR | MindRefCallCodes.EXTERNAL_STORAGE
-        key = cast(int, key_.value)
-        self._mediator_callbacks[key] = on_complete
-        AndroidStorageManager.clone_external_storage(
-            self._native_path, self._storage_path, key
-        )
+    def flush(self):
+        super().flush()
+        if self._write_behind is not None:
+            self._write_behind.flush()
 
     def discover_categories(self, on_complete: Callable[[], None] | None, *args):
         """
@@ -190,6 +302,13 @@ class AndroidNoteRepository(FileSystemNoteRepository):
         -----
         Several chained callbacks
 
+        _copy_storage:
+            Mirrors External Storage to App Storage, listing it in a single call where supported
+        listed_category_resources:
+            If External Storage was listed, create each category's `CategoryResourceFiles` from the listing
+
+        Otherwise, or if mirroring failed
+
         get_external_storage_categories:
             Syncs External Storage to App Storage (Limited to Directories and Images)
         get_categories:
@@ -198,17 +317,15 @@ class AndroidNoteRepository(FileSystemNoteRepository):
             For each category, create a `CategoryResourceFiles` instance
 
 
-        get_categories -> copy_storage -> emit NotesDiscoverCategoryEvents
+        copy_storage -> (listing | get_external_storage_categories -> get_categories) -> emit NotesDiscoverCategoryEvents
         """
 
-        def after_reflect_external_storage_files(
-            categories: Iterable[str], on_complete_inner: Callable | None, *_iargs
+        def emit_categories(
+            category_resources: dict[str, "CategoryResourceFiles"],
+            on_complete_inner: Callable | None,
         ):
             app = self.get_app()
-            for category_name in categories:
-                category_resource = self.discover_category(
-                    category=category_name, on_complete=None
-                )
+            for category_name, category_resource in category_resources.items():
                 self.category_files[category_name] = category_resource
                 app.registry.push_event(
                     DiscoverCategoryEvent(
@@ -216,12 +333,27 @@ class AndroidNoteRepository(FileSystemNoteRepository):
                     )
                 )
             Logger.info(
-                f"{type(self).__name__}: after_get_categories - Found App Storage Categories, Created "
-                f"CategoryResourceFiles, Emitted Discovery "
+                f"{type(self).__name__}: emit_categories - Created CategoryResourceFiles, Emitted Discovery "
             )
             if on_complete_inner:
                 on_complete_inner()
 
+        def after_reflect_external_storage_files(
+            categories: Iterable[str], on_complete_inner: Callable | None, *_iargs
+        ):
+            Logger.info(
+                f"{type(self).__name__}: after_get_categories - Found App Storage Categories"
+            )
+            emit_categories(
+                {
+                    category_name: self.discover_category(
+                        category=category_name, on_complete=None
+                    )
+                    for category_name in categories
+                },
+                on_complete_inner,
+            )
+
         @schedulable
         def after_get_external_storage_categories():
             Logger.info(
@@ -229,8 +361,6 @@ class AndroidNoteRepository(FileSystemNoteRepository):
                 f" after_get_external_storage_categories - External Storage Categories Copied"
             )
 
-            # Reflect Markdown Files
-
             # Emit App Storage Categories
             emit_app_categories = partial(
                 after_reflect_external_storage_files, on_complete_inner=on_complete
@@ -240,22 +370,42 @@ class AndroidNoteRepository(FileSystemNoteRepository):
                 self.get_categories, on_complete=emit_app_categories
             )
 
-            # Sync Markdown Files
+            Clock.schedule_once(get_categories_with_cb)
 
-            sync_external = schedulable(
-                self._copy_storage, on_complete=get_categories_with_cb
+        def after_sync_external(success: bool):
+            listing = self._mirror.listing
+            if not success or listing is None:
+                # Discover Categories
+                reflect_categories = schedulable(
+                    self.get_external_storage_categories,
+                    on_complete=after_get_external_storage_categories,
+                )
+                Clock.schedule_once(reflect_categories)
+                return
+
+            category_resources = listed_category_resources(
+                listing,
+                self.storage_path,
+                sort_strategy=self.note_sorting,
+                ascending=self.note_sorting_ascending,
+            )
+            emit_categories(
+                {
+                    category_name: category_resources[category_name]
+                    for category_name in listed_categories(
+                        listing,
+                        sort_strategy=self.category_sorting,
+                        ascending=self.category_sorting_ascending,
+                    )
+                },
+                on_complete,
             )
-
-            Clock.schedule_once(sync_external)
 
         self.category_files.clear()
-        # Discover Categories
-        reflect_categories = schedulable(
-            self.get_external_storage_categories,
-            on_complete=after_get_external_storage_categories,
-        )
+        # Sync External Storage
+        sync_external = schedulable(self._copy_storage, on_complete=after_sync_external)
 
-        Clock.schedule_once(reflect_categories)
+        Clock.schedule_once(sync_external)
 
     def get_external_storage_categories(
         self, on_complete: TGetCategoriesCallback
@@ -275,34 +425,43 @@ class AndroidNoteRepository(FileSystemNoteRepository):
         Logger.info(
             f"{type(self).__name__}: get_external_storage_categories - {fmt_attrs(self, '_native_path', '_storage_path')}"
         )
-        callback_code_ = MindRefCallCodes.READ | MindRefCallCodes.CATEGORIES
-        callback_code = cast(int, callback_code_.value)
-        self._mediator_callbacks[callback_code] = on_complete
-        AndroidStorageManager.get_categories(
-            self._native_path, self._storage_path, callback_code
+        self._submit(
+            MindRefCallCodes.READ | MindRefCallCodes.CATEGORIES,
+            lambda key: AndroidStorageManager.get_categories(
+                self._native_path, self._storage_path, key
+            ),
+            on_success=on_complete,
         )
 
     def save_note(self, note: "EditableNote", on_complete):
+        """Save to app storage, and queue the note to be copied to external storage"""
         Logger.info(f"{type(self).__name__} : Saving Note : {note}")
 
-        key_ = MindRefCallCodes.WRITE | MindRefCallCodes.NOTES
-        key = cast(int, key_.value)
-
-        def store_to_external(md_note: MarkdownNote):
-            Logger.info(
-                f"{type(self).__name__} : storing {md_note.title}.md to external storage"
-            )
-            note_fp = md_note.filepath
-
-            def inject_md():
+        def queue_to_external(md_note: MarkdownNote):
+            self._write_behind.enqueue(md_note.filepath)
+            if on_complete:
                 on_complete(md_note)
 
-            self._mediator_callbacks[key] = inject_md
-            AndroidStorageManager.copy_to_external_storage(
-                note_fp, str(self.storage_path), self._native_path, key
-            )
+        super().save_note(note, queue_to_external)
+
+    def refresh_categories(
+        self,
+        categories: Iterable[str],
+        changed: Iterable[Path],
+        loaded: Mapping[Path, MarkdownNote] | None = None,
+    ):
+        """
+        Queue changed files that exist in app storage to be copied to external storage, then rescan `categories`
 
-        super().save_note(note, store_to_external)
+        Notes
+        -----
+        Moves and deletes can't be propagated to external storage, `FileSystemUnitOfWork` refuses them
+        """
+        changed = set(changed)
+        for path in changed:
+            if path.is_file():
+                self._write_behind.enqueue(path)
+        super().refresh_categories(categories, changed, loaded)
 
     def prompt_for_external_folder(self, on_complete: Callable[[], None]):
         """
@@ -316,18 +475,20 @@ class AndroidNoteRepository(FileSystemNoteRepository):
         -------
 
         """
-        code = cast(int, MindRefCallCodes.PROMPT_EXTERNAL_DIRECTORY.value)
-        self._mediator_callbacks[code] = on_complete
-
-        func = schedulable(AndroidStorageManager.prompt_for_external_folder, code)
-        sch_cb(func)
+        # Waits on the user, so neither bounded nor timed
+        self._submit(
+            MindRefCallCodes.PROMPT_EXTERNAL_DIRECTORY,
+            lambda key: sch_cb(
+                schedulable(AndroidStorageManager.prompt_for_external_folder, key)
+            ),
+            on_success=on_complete,
+            bounded=False,
+            timeout=None,
+        )
 
     def prompt_for_external_file(
         self, ext_filter: list[str], on_complete: Callable[[str], None]
     ):
-        code = cast(int, MindRefCallCodes.PROMPT_EXTERNAL_FILE.value)
-        self._mediator_callbacks[code] = on_complete
-
         def get_mime_types(filters: list[str]) -> set[MIME_TYPE]:
             result = set()
             image_exts = (".jpg", ".jpeg", ".png")
@@ -345,10 +506,17 @@ class AndroidNoteRepository(FileSystemNoteRepository):
             return result
 
         mime_types = get_mime_types(ext_filter)
-        func = schedulable(
-            AndroidStorageManager.prompt_for_external_file, code, mime_types
+        self._submit(
+            MindRefCallCodes.PROMPT_EXTERNAL_FILE,
+            lambda key: sch_cb(
+                schedulable(
+                    AndroidStorageManager.prompt_for_external_file, key, mime_types
+                )
+            ),
+            on_success=on_complete,
+            bounded=False,
+            timeout=None,
         )
-        sch_cb(func)
 
     def create_category(
         self,
@@ -376,11 +544,7 @@ class AndroidNoteRepository(FileSystemNoteRepository):
         # We need to create the category directory in our app storage, and copy the image to that directory
         # We have to ensure that the directory is created before we copy the image
 
-        # We will register our image copy callback with this code
-        category_callback_code = cast(int, MindRefCallCodes.WRITE_DIRECTORY.value)
-
-        @schedulable
-        def create_category_android():
+        def create_category_android(key: int):
             Logger.info(
                 f"{type(self).__name__}: create_category_android - [directory={name}]"
             )
@@ -388,23 +552,28 @@ class AndroidNoteRepository(FileSystemNoteRepository):
                 directoryName=name,
                 appStorageRoot=str(self.storage_path),
                 externalStorageRoot=self._native_path,
-                key=category_callback_code,
+                key=key,
             )
 
-        # We will call the on_complete callback with this code
-        image_callback_code = cast(int, MindRefCallCodes.WRITE_IMAGE.value)
-
-        @schedulable
-        def copy_image_android():
+        def copy_image_android(key: int):
             AndroidStorageManager.add_category_image(
                 directoryName=name,
                 appStorageRoot=str(self.storage_path),
                 externalStorageRoot=self._native_path,
                 imageUri=str(image_path),
-                key=image_callback_code,
+                key=key,
             )
 
-        self._mediator_callbacks[category_callback_code] = copy_image_android
-        self._mediator_callbacks[image_callback_code] = on_complete
+        @schedulable
+        def create_category_then_copy_image():
+            self._submit(
+                MindRefCallCodes.WRITE_DIRECTORY,
+                create_category_android,
+                on_success=lambda *_args: self._submit(
+                    MindRefCallCodes.WRITE_IMAGE,
+                    copy_image_android,
+                    on_success=on_complete,
+                ),
+            )
 
-        Clock.schedule_once(create_category_android)
+        Clock.schedule_once(create_category_then_copy_image)
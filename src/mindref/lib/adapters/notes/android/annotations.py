@@ -97,6 +97,9 @@ class ActivityProtocol(Protocol):
 class MindRefUtilsCallback(Protocol):
     onCompleteCreateCategory: Callable[[int, str], None]
     onCompleteGetCategories: Callable[[int, list[str]], None]
+    onCompleteListStorage: Callable[
+        [int, list[str], list[int], list[int], list[bool]], None
+    ]
     onCompleteCopyStorage: Callable[[int], None]
     onFailure: Callable[[int], None]
 
@@ -108,6 +111,16 @@ class MindRefUtilsCallbackPyMediator(Protocol):
     @overload
     def __call__(self, _key: int, categories: list[str]): ...
 
+    @overload
+    def __call__(
+        self,
+        _key: int,
+        paths: list[str],
+        sizes: list[int],
+        last_modified: list[int],
+        is_dir: list[bool],
+    ): ...
+
     @overload
     def __call__(self, _key: int): ...
 
@@ -130,6 +143,10 @@ class MindRefUtilsProtocol(Protocol):
 
     def copyToAppStorage(self, key: int): ...
 
+    def listExternalStorage(self, key: int): ...
+
+    def copyFilesToAppStorage(self, key: int, paths: list[str]): ...
+
     def copyToManagedExternal(self, key: int, sourceUri: str, targetRoot: str): ...
 
     def copyToExternalStorage(
@@ -69,6 +69,21 @@ class MindRefUtilsCallback(PythonJavaClass):
         sched_mediator = schedulable(mediator, key, categories)
         Clock.schedule_once(sched_mediator)
 
+    @java_method("(I[Ljava/lang/String;[J[J[Z)V", name="onComplete")
+    def onCompleteListStorage(
+        self,
+        key: int,
+        paths: list[str],
+        sizes: list[int],
+        lastModified: list[int],
+        isDirectory: list[bool],
+    ):
+        mediator = self.py_mediator()
+        sched_mediator = schedulable(
+            mediator, key, paths, sizes, lastModified, isDirectory
+        )
+        Clock.schedule_once(sched_mediator)
+
     @java_method("(I)V", name="onComplete")
     def onCompleteCopyStorage(self, key: int):
         mediator = self.py_mediator()
@@ -405,6 +420,46 @@ class AndroidStorageManager:
                 cls._register_mindref_utils_callback(mrUtils)
         mrUtils.copyToAppStorage(key)
 
+    @classmethod
+    def list_external_storage(cls, source: str, target: str | Path, key: int) -> bool:
+        """
+        List external storage recursively, in a single round trip. The mediator receives parallel arrays of paths,
+        sizes, last modified times (ms) and whether each is a directory.
+
+        See Also
+        --------
+        `mindref.lib.adapters.notes.android.listing.decode_listing`
+
+        Returns
+        -------
+        False if MindRefUtils predates listing support, and nothing was invoked
+        """
+        target = str(target)
+        with cls._lock:
+            activity = cls._get_activity()
+            context: ContextProtocol = cls._get_context(activity)
+            mrUtils = cls._get_mindref_utils_cls(source, target, context)
+            if not cls._mindref_callback_java:
+                cls._register_mindref_utils_callback(mrUtils)
+        if not hasattr(mrUtils, "listExternalStorage"):
+            return False
+        mrUtils.listExternalStorage(key)
+        return True
+
+    @classmethod
+    def copy_files_to_app_storage(
+        cls, source: str, target: str | Path, paths: list[str], key: int
+    ) -> None:
+        """Copy files, relative to the external storage root, to the same relative paths in app storage"""
+        target = str(target)
+        with cls._lock:
+            activity = cls._get_activity()
+            context: ContextProtocol = cls._get_context(activity)
+            mrUtils = cls._get_mindref_utils_cls(source, target, context)
+            if not cls._mindref_callback_java:
+                cls._register_mindref_utils_callback(mrUtils)
+        mrUtils.copyFilesToAppStorage(key, paths)
+
     @classmethod
     def copy_to_external_storage(
         cls,
@@ -0,0 +1,130 @@
+"""
+Decoding of batched external storage listings
+
+MindRefUtils lists the whole external tree in one call, and returns it as parallel arrays rather than a callback per
+file. This module turns those arrays into `ExternalEntry` rows, and the rows into the repository's categories and
+`CategoryResourceFiles`, so discovery doesn't list or stat app storage again.
+
+This module does not depend on jnius, the arrays may come from any `MirrorStorage`.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from operator import attrgetter
+from pathlib import PurePosixPath
+from typing import TYPE_CHECKING
+
+from kivy import Logger
+
+from mindref.lib.adapters.notes.android.mirror import ExternalEntry
+from mindref.lib.domain.note_resource import CategoryResourceFiles, ResourceFile
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from pathlib import Path
+
+    from mindref.lib.domain.settings import SortOptions
+
+# Files of a category are directly beneath its folder, at the top level of the listing
+CATEGORY_FILE_PARTS = 2
+
+
+def decode_listing(
+    paths: Sequence[str],
+    sizes: Sequence[int],
+    last_modified: Sequence[int],
+    is_dir: Sequence[bool],
+) -> list[ExternalEntry]:
+    """
+    Zip the arrays of a listing into entries
+
+    Parameters
+    ----------
+    paths
+        Paths relative to the external storage root, '/' separated
+    sizes
+        Sizes in bytes
+    last_modified
+        Milliseconds since the epoch
+    is_dir
+
+    Raises
+    ------
+    ValueError
+        If the arrays differ in length
+    """
+    return [
+        ExternalEntry(path, int(size), int(mtime), bool(kind))
+        for path, size, mtime, kind in zip(
+            paths, sizes, last_modified, is_dir, strict=True
+        )
+    ]
+
+
+def listed_categories(
+    listing: Iterable[ExternalEntry], sort_strategy: SortOptions, ascending: bool
+) -> list[str]:
+    """
+    Category names, the top level directories of `listing`
+
+    Notes
+    -----
+    Listings don't include creation dates, "Creation Date" sorts by modification date
+    """
+    directories = [
+        entry
+        for entry in listing
+        if entry.is_dir and len(PurePosixPath(entry.path).parts) == 1
+    ]
+    match sort_strategy:
+        case "Title":
+            key = attrgetter("path")
+        case "Creation Date" | "Last Modified Date":
+            key = attrgetter("last_modified")
+        case _:
+            Logger.error(f"listed_categories: Unhandled sort_strategy {sort_strategy}")
+            key = attrgetter("last_modified")
+    directories.sort(key=key, reverse=not ascending)
+    return [entry.path for entry in directories]
+
+
+def listed_category_resources(
+    listing: Iterable[ExternalEntry],
+    root: Path,
+    sort_strategy: SortOptions,
+    ascending: bool,
+) -> dict[str, CategoryResourceFiles]:
+    """
+    Build `CategoryResourceFiles` for each category of `listing`, with ages taken from the listing
+
+    Parameters
+    ----------
+    listing
+    root
+        App storage root, the listed paths are mirrored beneath it
+    sort_strategy
+    ascending
+    """
+    files: dict[str, list[ResourceFile]] = defaultdict(list)
+    categories = []
+    for entry in listing:
+        parts = PurePosixPath(entry.path).parts
+        if entry.is_dir:
+            if len(parts) == 1:
+                categories.append(entry.path)
+        elif len(parts) == CATEGORY_FILE_PARTS:
+            category = parts[0]
+            files[category].append(
+                ResourceFile.to_concrete(
+                    root.joinpath(*parts),
+                    category,
+                    age=entry.last_modified * 1_000_000,
+                )
+            )
+    return {
+        category: CategoryResourceFiles.from_resources(
+            category, files.get(category, []), sort_strategy, ascending
+        )
+        for category in categories
+    }
@@ -0,0 +1,226 @@
+"""
+Incremental mirroring of external storage into app storage
+
+Android only grants access to external storage through the Storage Access Framework, so notes are read from a copy in
+app storage. Rather than copying the whole external tree on every discovery, `StorageMirror` compares a listing of
+external storage against a manifest of what was last copied, and only transfers new or changed files. Files removed
+from external storage are removed from the copy.
+
+This module does not depend on jnius. The platform side is reached through `MirrorStorage`.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING, NamedTuple, Protocol
+
+from kivy import Logger
+
+from mindref.lib.utils import atomic_replace
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+
+class ExternalEntry(NamedTuple):
+    """
+    A file or directory on external storage, as listed by `DocumentFile`
+
+    Attributes
+    ----------
+    path
+        Path relative to the external storage root, '/' separated
+    size
+        Size in bytes, 0 for directories
+    last_modified
+        Milliseconds since the epoch
+    is_dir
+    """
+
+    path: str
+    size: int
+    last_modified: int
+    is_dir: bool
+
+
+class MirrorPlan(NamedTuple):
+    copy: list[ExternalEntry]
+    delete: list[str]
+    directories: list[str]
+
+    def __bool__(self):
+        return bool(self.copy or self.delete or self.directories)
+
+
+class MirrorStorage(Protocol):
+    """Platform operations needed by `StorageMirror`. Callbacks may be called from any frame, but not re-entrantly."""
+
+    def list_external(
+        self, on_complete: Callable[[list[ExternalEntry] | None], None]
+    ) -> None:
+        """List external storage recursively. `on_complete` receives None if listing isn't supported."""
+
+    def copy_to_app_storage(
+        self, paths: list[str], on_complete: Callable[[bool], None]
+    ) -> None:
+        """Copy these files, relative to the external storage root, to the same relative paths in app storage"""
+
+    def copy_all_to_app_storage(self, on_complete: Callable[[bool], None]) -> None:
+        """Copy the whole external tree"""
+
+
+def _is_safe(path: str) -> bool:
+    parts = PurePosixPath(path).parts
+    return bool(parts) and not PurePosixPath(path).is_absolute() and ".." not in parts
+
+
+class MirrorManifest:
+    """
+    What was last copied from external storage, by relative path
+
+    Parameters
+    ----------
+    root
+        App storage root the manifest describes
+    """
+
+    filename = ".mirror-manifest.json"
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.path = root / self.filename
+        self.entries: dict[str, ExternalEntry] = {}
+        self.load()
+
+    def load(self):
+        try:
+            rows = json.loads(self.path.read_text(encoding="utf-8"))
+            self.entries = {row[0]: ExternalEntry(*row) for row in rows}
+        except FileNotFoundError:
+            self.entries = {}
+        except (ValueError, TypeError) as e:
+            Logger.warning(f"{type(self).__name__}: load - Discarding manifest - {e}")
+            self.entries = {}
+
+    def save(self):
+        with atomic_replace(self.path) as tmp:
+            tmp.write_text(json.dumps(list(self.entries.values())), encoding="utf-8")
+
+    def plan(self, listing: Iterable[ExternalEntry]) -> MirrorPlan:
+        """
+        Compare `listing` with the manifest and app storage.
+
+        Files are copied when they are new, their size or modification time changed, or the copy went missing.
+        Entries of the manifest no longer listed are deleted, anything else in app storage is left alone.
+        """
+        copy, directories = [], []
+        listed = set()
+        for entry in listing:
+            if not _is_safe(entry.path):
+                Logger.warning(
+                    f"{type(self).__name__}: plan - Skipping unsafe path {entry.path!r}"
+                )
+                continue
+            listed.add(entry.path)
+            local = self.root / entry.path
+            if entry.is_dir:
+                if not local.is_dir():
+                    directories.append(entry.path)
+            elif self.entries.get(entry.path) != entry or not local.is_file():
+                copy.append(entry)
+        # Delete children before their directories
+        delete = sorted(
+            (path for path in self.entries if path not in listed),
+            key=lambda p: len(PurePosixPath(p).parts),
+            reverse=True,
+        )
+        return MirrorPlan(copy=copy, delete=delete, directories=directories)
+
+    def delete(self, paths: Iterable[str]):
+        for path in paths:
+            local = self.root / path
+            entry = self.entries.pop(path)
+            try:
+                if entry.is_dir:
+                    shutil.rmtree(local)
+                else:
+                    local.unlink()
+            except FileNotFoundError:
+                pass
+
+    def make_directories(self, paths: Iterable[str]):
+        for path in paths:
+            (self.root / path).mkdir(parents=True, exist_ok=True)
+
+    def record(self, entries: Iterable[ExternalEntry]):
+        self.entries.update((entry.path, entry) for entry in entries)
+
+
+class StorageMirror:
+    """
+    Keeps app storage in sync with external storage, transferring only what changed
+
+    Parameters
+    ----------
+    storage
+        Platform side, lists and copies external storage
+    root
+        App storage root
+
+    Attributes
+    ----------
+    listing
+        External storage as listed by the last `sync`, None if listing isn't supported
+    """
+
+    def __init__(self, storage: MirrorStorage, root: Path):
+        self.storage = storage
+        self.manifest = MirrorManifest(root)
+        self.listing: list[ExternalEntry] | None = None
+
+    def sync(self, on_complete: Callable[[bool], None]):
+        """Mirror external storage, `on_complete` is called with whether every transfer succeeded"""
+        self.storage.list_external(
+            lambda listing: self._listed(listing, on_complete=on_complete)
+        )
+
+    def _listed(
+        self,
+        listing: list[ExternalEntry] | None,
+        on_complete: Callable[[bool], None],
+    ):
+        manifest = self.manifest
+        self.listing = listing
+        if listing is None:
+            Logger.info(
+                f"{type(self).__name__}: sync - Listing unavailable, copying all"
+            )
+            manifest.entries.clear()
+            manifest.save()
+            self.storage.copy_all_to_app_storage(on_complete)
+            return
+
+        plan = manifest.plan(listing)
+        Logger.info(
+            f"{type(self).__name__}: sync - {len(listing)} listed, {len(plan.copy)} to copy,"
+            f" {len(plan.delete)} to delete, {len(plan.directories)} new directories"
+        )
+        manifest.delete(plan.delete)
+        manifest.make_directories(plan.directories)
+        manifest.record(entry for entry in listing if entry.is_dir)
+        if not plan.copy:
+            manifest.save()
+            on_complete(True)
+            return
+
+        def copied(success: bool):
+            if success:
+                manifest.record(plan.copy)
+            else:
+                Logger.error(f"{type(self).__name__}: sync - Copy failed")
+            manifest.save()
+            on_complete(success)
+
+        self.storage.copy_to_app_storage([entry.path for entry in plan.copy], copied)
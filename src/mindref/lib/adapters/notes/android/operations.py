@@ -0,0 +1,188 @@
+"""
+Registry of in-flight MindRefUtils operations
+
+Every call into MindRefUtils is given a unique request id, which the Java side passes back as its callback key (negated
+on failure). The registry maps request ids to futures, so any number of operations of the same kind can be pending at
+once.
+
+Operations that may be slow on a Storage Access Framework provider (copying, creating, listing) are bounded: at most
+`max_in_flight` run at once, the rest wait in order. Each operation can time out, and its future can be cancelled.
+A result arriving for an operation that timed out or was cancelled is ignored.
+
+This module does not depend on jnius.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from kivy import Logger
+from kivy.clock import Clock
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import EllipsisType
+
+    from kivy.clock import ClockEvent
+
+MAX_REQUEST_ID = 0xFFFF
+"""Android only accepts request codes in the lower 16 bits, for `startActivityForResult`"""
+
+
+class OperationFailed(Exception):
+    """MindRefUtils reported the operation failed"""
+
+
+@dataclass(slots=True, eq=False)
+class Operation:
+    request_id: int
+    name: str
+    start: Callable[[int], None]
+    bounded: bool
+    timeout: float | None
+    future: Future = field(default_factory=Future)
+    started: bool = False
+    timeout_event: ClockEvent | None = None
+
+
+class PendingOperations:
+    """
+    Parameters
+    ----------
+    max_in_flight
+        Maximum bounded operations running at once
+    timeout
+        Default seconds before a running operation fails with `TimeoutError`
+    """
+
+    def __init__(self, max_in_flight: int = 4, timeout: float | None = 60.0):
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self._operations: dict[int, Operation] = {}
+        self._queued: deque[Operation] = deque()
+        self._in_flight = 0
+        self._last_id = 0
+
+    def __len__(self):
+        return len(self._operations)
+
+    def __contains__(self, request_id: int):
+        return request_id in self._operations
+
+    def _next_id(self) -> int:
+        while True:
+            self._last_id = self._last_id % MAX_REQUEST_ID + 1
+            if self._last_id not in self._operations:
+                return self._last_id
+
+    def submit(
+        self,
+        name: str,
+        start: Callable[[int], None],
+        bounded: bool = True,
+        timeout: float | EllipsisType | None = ...,
+    ) -> Future:
+        """
+        Register an operation, and start it once a slot is free.
+
+        Parameters
+        ----------
+        name
+            Describes the operation in logs and errors
+        start
+            Invokes MindRefUtils with the request id. Exceptions fail the operation.
+        bounded
+            Whether the operation counts towards `max_in_flight`. Prompts, which wait on the user, should not.
+        timeout
+            Seconds the operation may run for, defaults to `self.timeout`. None waits indefinitely.
+
+        Returns
+        -------
+        Future resolved with the tuple of arguments MindRefUtils passed back
+        """
+        operation = Operation(
+            request_id=self._next_id(),
+            name=name,
+            start=start,
+            bounded=bounded,
+            timeout=self.timeout if timeout is ... else timeout,
+        )
+        self._operations[operation.request_id] = operation
+        operation.future.add_done_callback(lambda _f: self._done(operation))
+        if bounded and self._in_flight >= self.max_in_flight:
+            Logger.debug(
+                f"{type(self).__name__}: submit - Queued {name} [{operation.request_id}]"
+            )
+            self._queued.append(operation)
+        else:
+            self._start(operation)
+        return operation.future
+
+    def _start(self, operation: Operation):
+        operation.started = True
+        if operation.bounded:
+            self._in_flight += 1
+        if operation.timeout is not None:
+            operation.timeout_event = Clock.schedule_once(
+                lambda _dt: self._timed_out(operation), operation.timeout
+            )
+        try:
+            operation.start(operation.request_id)
+        except Exception as e:
+            if not operation.future.done():
+                operation.future.set_exception(e)
+
+    def _timed_out(self, operation: Operation):
+        if not operation.future.done():
+            Logger.warning(
+                f"{type(self).__name__}: {operation.name} [{operation.request_id}] timed out"
+            )
+            operation.future.set_exception(
+                TimeoutError(f"{operation.name} timed out after {operation.timeout}s")
+            )
+
+    def _done(self, operation: Operation):
+        self._operations.pop(operation.request_id, None)
+        if operation.timeout_event is not None:
+            operation.timeout_event.cancel()
+        if not operation.started:
+            # Cancelled while queued
+            self._queued.remove(operation)
+            return
+        if operation.bounded:
+            self._in_flight -= 1
+        while self._queued and self._in_flight < self.max_in_flight:
+            self._start(self._queued.popleft())
+
+    def resolve(self, key: int, *args) -> bool:
+        """
+        Complete an operation with a result from MindRefUtils. A negative `key` reports failure.
+
+        Returns
+        -------
+        Whether `key` matched a pending operation
+        """
+        if (operation := self._operations.get(abs(key))) is None:
+            Logger.info(
+                f"{type(self).__name__}: resolve - No pending operation for key {key}"
+            )
+            return False
+        if key < 0:
+            operation.future.set_exception(
+                OperationFailed(f"{operation.name} [{operation.request_id}] failed")
+            )
+        else:
+            operation.future.set_result(args)
+        return True
+
+    def cancel(self, request_id: int) -> bool:
+        if (operation := self._operations.get(request_id)) is None:
+            return False
+        return operation.future.cancel()
+
+    def cancel_all(self):
+        for request_id in list(self._operations):
+            self.cancel(request_id)
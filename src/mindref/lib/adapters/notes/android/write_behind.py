@@ -0,0 +1,154 @@
+"""
+Write-behind of saved notes to external storage
+
+Notes are saved to app storage first, so a save can complete before its copy reaches external storage. `WriteBehindQueue`
+collects the notes waiting to be copied, coalescing repeated saves of the same note, and copies them in a batch once
+saving goes idle, or when the app is paused or stopped.
+
+The queue is journaled in app storage. A note saved shortly before the process is killed is still copied, when the
+queue is next created.
+
+This module does not depend on jnius. The platform side is reached through `ExternalWriter`.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Protocol
+
+from kivy import Logger
+from kivy.clock import Clock
+
+from mindref.lib.utils import atomic_replace
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from kivy.clock import ClockEvent
+
+
+class ExternalWriter(Protocol):
+    def write_external(self, path: Path, on_complete: Callable[[bool], None]) -> None:
+        """Copy `path`, a file in app storage, to the same relative path in external storage"""
+
+
+class WriteBehindQueue:
+    """
+    Parameters
+    ----------
+    writer
+        Platform side, copies files to external storage
+    root
+        App storage root, queued files are beneath it
+    idle_delay
+        Seconds without a new save before the queue is flushed
+
+    Attributes
+    ----------
+    pending
+        Queued paths, relative to `root`, mapped to when they were last queued. A path queued again while it's being
+        copied stays queued.
+    """
+
+    filename = ".write-behind.json"
+
+    def __init__(self, writer: ExternalWriter, root: Path, idle_delay: float = 2.0):
+        self.writer = writer
+        self.root = root
+        self.journal = root / self.filename
+        self.idle_delay = idle_delay
+        self.pending: dict[str, int] = {}
+        self._generation = 0
+        self._flushing = False
+        self._flushed: list[Callable[[bool], None]] = []
+        self._idle_event: ClockEvent | None = None
+        self.load()
+
+    def __len__(self):
+        return len(self.pending)
+
+    def load(self):
+        try:
+            paths = json.loads(self.journal.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except ValueError as e:
+            Logger.warning(f"{type(self).__name__}: load - Discarding journal - {e}")
+            return
+        for path in paths:
+            self._queue(path)
+        if self.pending:
+            Logger.info(
+                f"{type(self).__name__}: load - {len(self.pending)} writes recovered"
+            )
+            self._schedule_idle_flush()
+
+    def save(self):
+        with atomic_replace(self.journal) as tmp:
+            tmp.write_text(json.dumps(list(self.pending)), encoding="utf-8")
+
+    def _queue(self, path: str):
+        self._generation += 1
+        self.pending[path] = self._generation
+
+    def enqueue(self, path: Path):
+        """Queue `path` to be copied, once saving goes idle"""
+        rel = path.relative_to(self.root).as_posix()
+        is_new = rel not in self.pending
+        self._queue(rel)
+        if is_new:
+            self.save()
+        self._schedule_idle_flush()
+
+    def _schedule_idle_flush(self):
+        if self._idle_event is not None:
+            self._idle_event.cancel()
+        self._idle_event = Clock.schedule_once(
+            lambda _dt: self.flush(), self.idle_delay
+        )
+
+    def flush(self, on_complete: Callable[[bool], None] | None = None):
+        """
+        Copy every queued path, one at a time.
+
+        Paths that fail to copy stay queued, and the flush stops. `on_complete` is called with whether the queue was
+        emptied.
+        """
+        if self._idle_event is not None:
+            self._idle_event.cancel()
+            self._idle_event = None
+        if on_complete is not None:
+            self._flushed.append(on_complete)
+        if self._flushing:
+            return
+        self._flushing = True
+        Logger.info(f"{type(self).__name__}: flush - {len(self.pending)} pending")
+        self._write_next()
+
+    def _write_next(self):
+        if not self.pending:
+            self._finish(True)
+            return
+        path, generation = next(iter(self.pending.items()))
+
+        def written(success: bool):
+            if not success:
+                Logger.error(f"{type(self).__name__}: flush - Failed to write {path}")
+                self._finish(False)
+                return
+            if self.pending.get(path) == generation:
+                del self.pending[path]
+                self.save()
+            else:
+                # Saved again while copying, write the newer version
+                self.pending[path] = self.pending.pop(path)
+            self._write_next()
+
+        self.writer.write_external(self.root / path, written)
+
+    def _finish(self, success: bool):
+        self._flushing = False
+        flushed, self._flushed = self._flushed, []
+        for on_complete in flushed:
+            on_complete(success)
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
+import os
 import shutil
 from collections import namedtuple
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from operator import attrgetter, itemgetter
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from kivy import Logger
+from kivy.clock import mainthread
 
 from mindref.lib.adapters.notes.note_repository import (
     AbstractNoteRepository,
@@ -17,23 +20,45 @@ from mindref.lib.domain.events import (
     DiscoverCategoryEvent,
     NotesQueryErrorFailureEvent,
     NotesQueryNotSetFailureEvent,
+    SaveNoteFailureEvent,
 )
-from mindref.lib.domain.note_resource import CategoryResourceFiles
+from mindref.lib.domain.note_resource import CategoryResourceFiles, ResourceFile
 from mindref.lib.ext import RollingIndex
-from mindref.lib.utils import def_cb, sch_cb, schedulable
-from mindref.lib.widgets.typeahead.typeahead_dropdown import Suggestion
+from mindref.lib.utils import atomic_replace, def_cb, sch_cb, schedulable
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future
     from os import PathLike
 
     from mindref.lib.domain.editable import EditableNote
     from mindref.lib.domain.markdown_note import MarkdownNote, MarkdownNoteDict
     from mindref.lib.domain.protocols import GetApp
     from mindref.lib.domain.settings import SortOptions
+    from mindref.lib.widgets.typeahead.typeahead_dropdown import Suggestion
 
 TGetCategoriesCallback = Callable[[Iterable[str]], None]
 
 
+def write_text_atomic(path: Path, text: str, tmp_dir: Path, fsync: bool = True):
+    """
+    Replace the contents of `path`, such that it's never left partially written
+
+    Parameters
+    ----------
+    path
+    text
+    tmp_dir
+        Directory for the temporary file, on the same filesystem as `path`
+    fsync
+        Flush the file to disk before it replaces `path`
+    """
+    with atomic_replace(path, tmp_dir) as tmp, tmp.open("w", encoding="utf-8") as f:
+        f.write(text)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
 class FileSystemNoteRepository(AbstractNoteRepository):
     category_files: dict[str, CategoryResourceFiles]
     category_sorting: SortOptions
@@ -43,14 +68,26 @@ class FileSystemNoteRepository(AbstractNoteRepository):
 
     _storage_path: Path | None
     _index: RollingIndex | None
+    _writer: ThreadPoolExecutor | None
 
     """
     Categories are defined with directories
     Categories Contain
         - .md Note Files
         - .png | .jpg | .jpeg Category Image File, Optional
+
+    Attributes
+    ----------
+    fsync_writes
+        Flush saved notes to disk before they replace the previous version
+    mirrored_storage
+        Storage mirrors another location, which receives written notes only. Moved or deleted notes would be restored
+        by the next mirror, so units of work refuse to move or delete them.
     """
 
+    fsync_writes = True
+    mirrored_storage = False
+
     def __init__(
         self,
         get_app: GetApp,
@@ -62,6 +99,7 @@ class FileSystemNoteRepository(AbstractNoteRepository):
     ):
         self._storage_path = None
         self._index = None
+        self._writer = None
         self._current_category = None
         self.get_app = get_app
         self.note_sorting = note_sorting
@@ -204,6 +242,64 @@ class FileSystemNoteRepository(AbstractNoteRepository):
             on_complete(category_resource)
         return category_resource
 
+    def refresh_categories(
+        self,
+        categories: Iterable[str],
+        changed: Iterable[Path],
+        loaded: Mapping[Path, MarkdownNote] | None = None,
+    ):
+        """
+        Bring `category_files` up to date after files of `categories` were written, moved or deleted
+
+        Each category is listed once and sorted once. Notes whose paths are not in `changed` keep their resource, and
+        their loaded `MarkdownNote`, so only changed notes are read again. New categories push a
+        DiscoverCategoryEvent, when the app is running.
+
+        Parameters
+        ----------
+        categories
+            Names of the categories to rescan
+        changed
+            Paths that were written, moved or deleted
+        loaded
+            Notes already parsed from the text written to their path, these aren't read again
+        """
+        changed = set(changed)
+        loaded = loaded or {}
+        app = self.get_app()
+        for category in categories:
+            category_folder = self.storage_path / category
+            if not category_folder.is_dir():
+                self.category_files.pop(category, None)
+                continue
+            previous = self.category_files.get(category)
+            known = {note.path: note for note in previous.notes} if previous else {}
+            resources = []
+            for fp in category_folder.iterdir():
+                if fp in known and fp not in changed:
+                    resources.append(known[fp])
+                    continue
+                resource = ResourceFile.to_concrete(fp, category)
+                if fp in loaded and not resource.is_image:
+                    resource.note_ = loaded[fp]
+                resources.append(resource)
+            category_resource = CategoryResourceFiles.from_resources(
+                category,
+                resources,
+                sort_strategy=self.note_sorting,
+                ascending=self.note_sorting_ascending,
+            )
+            # Read the new and changed notes, the others are already loaded
+            category_resource.get_md_notes(refresh=False)
+            self.category_files[category] = category_resource
+            if previous is None and app is not None:
+                app.registry.push_event(DiscoverCategoryEvent(category=category))
+            if category == self.current_category:
+                self._resize_index()
+        Logger.info(
+            f"{type(self).__name__}: refresh_categories - {len(changed)} changed paths"
+        )
+
     def discover_categories(self, on_complete: Callable[[], None] | None, *args):
         """
         Find Categories, and associated image files
@@ -233,6 +329,8 @@ class FileSystemNoteRepository(AbstractNoteRepository):
     def query_notes(
         self, category: str, query: str, on_complete
     ) -> list[Suggestion] | None:
+        from mindref.lib.widgets.typeahead.typeahead_dropdown import Suggestion
+
         query = query.lower()
         notes = self._get_category_meta(category=category, refresh=False)
         QueryDoc = namedtuple("QueryDoc", "idx, title, text, score")
@@ -434,6 +532,46 @@ class FileSystemNoteRepository(AbstractNoteRepository):
         )
         Logger.info(f"{type(self).__name__}: _resize_index")
 
+    @property
+    def writer(self) -> ThreadPoolExecutor:
+        """Single thread, so writes of a note are applied in the order they were saved"""
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="note-writer"
+            )
+        return self._writer
+
+    def flush(self):
+        """Wait for notes being written"""
+        if self._writer is not None:
+            self._writer.submit(lambda: None).result()
+
+    def _write_note(
+        self, fp: Path, text: str, on_complete: Callable[[None], MarkdownNote]
+    ) -> Future[None]:
+        """
+        Write `fp` on the writer thread, `on_complete` is called on the main thread once it's written.
+        If it can't be written, a `SaveNoteFailureEvent` is pushed instead.
+        """
+
+        @mainthread
+        def written(future: Future[None]):
+            try:
+                future.result()
+            except OSError as e:
+                Logger.error(f"{type(self).__name__}: save_note - {fp} - {e}")
+                self.get_app().registry.push_event(
+                    SaveNoteFailureEvent(path=fp, error=str(e))
+                )
+                return
+            on_complete(None)
+
+        future = self.writer.submit(
+            write_text_atomic, fp, text, self.storage_path, self.fsync_writes
+        )
+        future.add_done_callback(written)
+        return future
+
     def save_note(
         self,
         note: EditableNote,
@@ -454,8 +592,8 @@ class FileSystemNoteRepository(AbstractNoteRepository):
             category_resource = self.category_files[category]
             note_resource = category_resource.get_note_by_path(note_path)
             category_resource.update_note_ages(note_resource)
+            category_resource.reposition_note(note_resource)
             md_note_inner = note_resource.get_note(refresh=True)
-            category_resource.reindex_notes()
             if callback:
                 callback(md_note_inner)
             return md_note_inner
@@ -465,57 +603,45 @@ class FileSystemNoteRepository(AbstractNoteRepository):
                 fp = (self.storage_path / note.category / note.edit_title).with_suffix(
                     ".md"
                 )
-                write_note = schedulable(
-                    fp.write_text, data=note.edit_text, encoding="utf-8"
-                )
                 after_write = partial(
                     after_write_new_note,
                     category=note.category,
                     note_path=fp,
                     callback=None,
                 )
-                sch_cb(write_note, after_write)
+                self._write_note(fp, note.edit_text, after_write)
                 Logger.info(f"{type(self).__name__}: save_note - new note")
             case True, _ as cb:
                 fp = (self.storage_path / note.category / note.edit_title).with_suffix(
                     ".md"
                 )
-                write_note = schedulable(
-                    fp.write_text, data=note.edit_text, encoding="utf-8"
-                )
                 after_write = partial(
                     after_write_new_note,
                     category=note.category,
                     note_path=fp,
                     callback=cb,
                 )
-                sch_cb(write_note, after_write)
+                self._write_note(fp, note.edit_text, after_write)
                 Logger.info(f"{type(self).__name__}: save_note - new note")
             case False, None:
                 fp = note.md_note.filepath
-                write_note = schedulable(
-                    fp.write_text, data=note.edit_text, encoding="utf-8"
-                )
                 after_write = partial(
                     after_write_edit_note,
                     category=note.category,
                     note_path=fp,
                     callback=None,
                 )
-                sch_cb(write_note, after_write)
+                self._write_note(fp, note.edit_text, after_write)
                 Logger.info(f"{type(self).__name__}: save_note - edit note")
             case False, _ as cb:
                 fp = note.md_note.filepath
-                write_note = schedulable(
-                    fp.write_text, data=note.edit_text, encoding="utf-8"
-                )
                 after_write = partial(
                     after_write_edit_note,
                     category=note.category,
                     note_path=fp,
                     callback=cb,
                 )
-                sch_cb(write_note, after_write)
+                self._write_note(fp, note.edit_text, after_write)
                 Logger.info(f"{type(self).__name__}: save_note - edit note")
             case _:
                 raise Exception("Logic Error")
@@ -142,6 +142,11 @@ class AbstractNoteRepository(ABC):
     ):
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def flush(self):
+        """Persist writes that are still pending. Called when the app is paused or stopped."""
+        raise NotImplementedError
+
     @abc.abstractmethod
     def set_index(self, n: int | None):
         raise NotImplementedError
@@ -76,6 +76,18 @@ class SaveNoteEvent(Event):
         return f"{type(self).__name__}({','.join(f'{p}={getattr(self, p)}' for p in attrs)})"
 
 
+@dataclass(slots=True)
+class SaveNoteFailureEvent(EventFailure, Event):
+    event_type = "save_note_failure"
+    message = "Could not save the note"
+    path: Path
+    error: str
+
+    def __repr__(self):
+        attrs = ("event_type", "path", "error")
+        return f"{type(self).__name__}({','.join(f'{p}={getattr(self, p)}' for p in attrs)})"
+
+
 @dataclass(slots=True)
 class NoteFetchedEvent(Event):
     event_type = "note_fetched"
@@ -51,6 +51,11 @@ class MarkdownNote:
     def from_file(cls, category: str, idx: int, fp: PathLike):
         filepath = Path(fp)
         text = filepath.read_text(encoding="utf-8")
+        return cls.from_text(category, idx, text, filepath)
+
+    @classmethod
+    def from_text(cls, category: str, idx: int, text: str, filepath: Path):
+        """Parse `text` as the contents of `filepath`, which needn't exist yet"""
         document = cls.parser.parse(text)
         document, doc_title = cls._get_title_from_doc(document)
         if not doc_title:
@@ -0,0 +1,197 @@
+"""
+Incremental updates of a category's note metadata
+
+`MindRefApp.note_category_meta` lists a `MarkdownNoteDict` per note, in index order. When a single note is saved, the
+list is patched with one slice assignment rather than being rebuilt for the whole category.
+
+`ObservableNoteMeta` holds that list, and reports how it changed as insert, remove, update and move events, so views
+can patch only the affected rows.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Literal
+
+from kivy.event import EventDispatcher
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    from mindref.lib.domain.markdown_note import MarkdownNoteDict
+
+MetaOp = tuple[
+    Literal["insert", "remove", "update", "move"], int, int, "MarkdownNoteDict"
+]
+"""(kind, index, target index, item). Only moves use the target index, for others it equals index."""
+
+
+def meta_patch(
+    meta: Sequence[MarkdownNoteDict], saved: MarkdownNoteDict
+) -> tuple[int, int, list[MarkdownNoteDict]]:
+    """
+    Slice of `meta` to replace, after `saved` was added or edited
+
+    `saved['idx']` is the note's position once saved. Notes shifted by its insertion or move are copied with their
+    new `idx`, the remaining entries are untouched.
+
+    Returns
+    -------
+    start, stop, replacement
+        Apply with `meta[start:stop] = replacement`
+    """
+    old = next(
+        (i for i, m in enumerate(meta) if m["filepath"] == saved["filepath"]), None
+    )
+    new = saved["idx"]
+    if old is None:
+        start, stop = new, len(meta)
+        moved = [saved, *meta[start:stop]]
+    else:
+        start, stop = min(old, new), max(old, new) + 1
+        moved = [m for i, m in enumerate(meta[start:stop], start=start) if i != old]
+        moved.insert(new - start, saved)
+    replacement = [
+        m if m["idx"] == i else {**m, "idx": i}
+        for i, m in enumerate(moved, start=start)
+    ]
+    return start, stop, replacement
+
+
+def meta_diff(
+    old: Sequence[MarkdownNoteDict], new: Sequence[MarkdownNoteDict], offset: int = 0
+) -> list[MetaOp]:
+    """
+    Operations turning `old` into `new`, matching entries by filepath
+
+    Operations apply in order, each index refers to the list as left by the operations before it. Removals come first,
+    then `new` is walked in order, moving, inserting or updating entries at each position.
+
+    Parameters
+    ----------
+    old
+    new
+    offset
+        Added to every index, when `old` is a slice of a longer list
+    """
+    keys = [m["filepath"] for m in old]
+    items = list(old)
+    wanted = {m["filepath"] for m in new}
+    ops: list[MetaOp] = []
+    for i in range(len(keys) - 1, -1, -1):
+        if keys[i] not in wanted:
+            del keys[i]
+            ops.append(("remove", offset + i, offset + i, items.pop(i)))
+    for i, item in enumerate(new):
+        key = item["filepath"]
+        if i < len(keys) and keys[i] == key:
+            current = items[i]
+        elif key in keys:
+            j = keys.index(key, i)
+            keys.insert(i, keys.pop(j))
+            current = items.pop(j)
+            items.insert(i, current)
+            ops.append(("move", offset + j, offset + i, current))
+        else:
+            keys.insert(i, key)
+            items.insert(i, item)
+            ops.append(("insert", offset + i, offset + i, item))
+            continue
+        if current is not item and current != item:
+            items[i] = item
+            ops.append(("update", offset + i, offset + i, item))
+    return ops
+
+
+class ObservableNoteMeta(EventDispatcher):
+    """
+    A category's note metadata, in index order
+
+    Changes are made with `assign` or `patch`, which dispatch the smallest set of events found by `meta_diff`. When
+    most of the list changed, `on_reset` is dispatched instead.
+
+    Events
+    ------
+    on_reset(items)
+        The whole list was replaced
+    on_insert(index, item)
+    on_remove(index, item)
+    on_update(index, item)
+        The entry at `index` was replaced by an entry for the same note
+    on_move(old, new, item)
+        The entry was removed from `old` and inserted at `new`
+
+    Attributes
+    ----------
+    reset_ratio
+        Fraction of the list that may change before a reset is dispatched rather than individual operations
+    """
+
+    __events__ = ("on_reset", "on_insert", "on_remove", "on_update", "on_move")
+
+    reset_ratio = 0.5
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._items: list[MarkdownNoteDict] = []
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[MarkdownNoteDict]:
+        return iter(self._items)
+
+    def __getitem__(self, item):
+        return self._items[item]
+
+    def __repr__(self):
+        return f"{type(self).__name__}({len(self)} items)"
+
+    def reset(self, items: Sequence[MarkdownNoteDict]):
+        self._items = list(items)
+        self.dispatch("on_reset", self._items)
+
+    def assign(self, items: Sequence[MarkdownNoteDict]):
+        """Replace the list with `items`"""
+        self.patch(0, len(self._items), items)
+
+    def patch(self, start: int, stop: int, replacement: Sequence[MarkdownNoteDict]):
+        """Equivalent to `meta[start:stop] = replacement`"""
+        ops = meta_diff(self._items[start:stop], replacement, offset=start)
+        if not ops:
+            return
+        size = max(
+            len(self._items), len(self._items) - (stop - start) + len(replacement)
+        )
+        if not self._items or len(ops) > size * self.reset_ratio:
+            self.reset([*self._items[:start], *replacement, *self._items[stop:]])
+            return
+        items = self._items
+        for kind, index, target, item in ops:
+            match kind:
+                case "remove":
+                    del items[index]
+                    self.dispatch("on_remove", index, item)
+                case "insert":
+                    items.insert(index, item)
+                    self.dispatch("on_insert", index, item)
+                case "update":
+                    items[index] = item
+                    self.dispatch("on_update", index, item)
+                case "move":
+                    items.insert(target, items.pop(index))
+                    self.dispatch("on_move", index, target, item)
+
+    def on_reset(self, items: list[MarkdownNoteDict]):
+        pass
+
+    def on_insert(self, index: int, item: MarkdownNoteDict):
+        pass
+
+    def on_remove(self, index: int, item: MarkdownNoteDict):
+        pass
+
+    def on_update(self, index: int, item: MarkdownNoteDict):
+        pass
+
+    def on_move(self, old: int, new: int, item: MarkdownNoteDict):
+        pass
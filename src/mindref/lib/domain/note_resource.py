@@ -21,9 +21,11 @@ class ResourceFile:
 
     @classmethod
     def to_concrete(
-        cls, fp: Path, category: str
+        cls, fp: Path, category: str, age: int | None = None
     ) -> "NoteResourceFile | ImageResourceFile":
-        age = fp.stat().st_mtime_ns
+        """Create a resource for `fp`, `age` defaults to its modification time in ns"""
+        if age is None:
+            age = fp.stat().st_mtime_ns
         fp_suffix = fp.suffix.lower() if fp.suffix else None
         match fp_suffix:
             case ".png" | ".jpg" | ".jpeg":
@@ -102,26 +104,35 @@ class CategoryResourceFiles:
         sort_strategy: SortOptions,
         ascending: bool,
     ):
+        resources = [ResourceFile.to_concrete(f, category) for f in files]
+        return cls.from_resources(category, resources, sort_strategy, ascending)
+
+    @classmethod
+    def from_resources(
+        cls,
+        category: str,
+        resources: Iterable["NoteResourceFile | ImageResourceFile"],
+        sort_strategy: SortOptions,
+        ascending: bool,
+    ):
+        """
+        Group and sort resources whose age is already known, e.g. from a storage listing
+
+        See Also
+        --------
+        `from_files`
+        """
         match sort_strategy:
-            case "Creation Date":
-                sorted_files = sorted(
-                    files, key=lambda x: x.stat().st_mtime_ns, reverse=not ascending
-                )
+            case "Creation Date" | "Last Modified Date":
+                resources = sorted(resources, reverse=not ascending)
             case "Title":
-                sorted_files = sorted(
-                    files, key=lambda x: x.name, reverse=not ascending
-                )
-            case "Last Modified Date":
-                sorted_files = sorted(
-                    files, key=lambda x: x.stat().st_mtime_ns, reverse=not ascending
+                resources = sorted(
+                    resources, key=lambda x: x.path.name, reverse=not ascending
                 )
             case _:
                 Logger.error(f"Invalid sort_strategy: {sort_strategy}")
-                sorted_files = sorted(
-                    files, key=lambda x: x.stat().st_mtime_ns, reverse=not ascending
-                )
+                resources = sorted(resources, reverse=not ascending)
 
-        resources = [ResourceFile.to_concrete(f, category) for f in sorted_files]
         resource_groups = groupby(attrgetter("is_image"), resources)
         image = resource_groups.get(True, None)
         notes: list[NoteResourceFile] = resource_groups.get(False, [])
@@ -169,40 +180,59 @@ class CategoryResourceFiles:
             for note in self.notes:
                 note.age = get_age(note)
 
+    def sort_key(self, note: "ResourceFile") -> int | str:
+        """Key `self.notes` is ordered by, from values cached on the resource"""
+        match self.sort_strategy:
+            case "Title":
+                return note.path.name
+            case _:
+                return note.age
+
+    def _insertion_point(self, key: int | str) -> int:
+        """Index to insert a note with `key` at, after any notes with an equal key"""
+        notes, ascending, sort_key = self.notes, self.ascending, self.sort_key
+        lo, hi = 0, len(notes)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_key = sort_key(notes[mid])
+            if mid_key <= key if ascending else mid_key >= key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _renumber(self, start: int, stop: int):
+        notes = self.notes
+        for i in range(start, stop):
+            notes[i].set_index(i)
+
     def reindex_notes(self):
-        """Recalculate indices of `self.notes`
+        """Recalculate indices of `self.notes`, sorting by the cached keys
 
         See Also
         ----------
         `update_note_ages`
         """
+        self.notes.sort(key=self.sort_key, reverse=not self.ascending)
+        self._renumber(0, len(self.notes))
 
-        match self.sort_strategy:
-            case "Creation Date":
-
-                def sort_func(x):
-                    return x.path.stat().st_ctime_ns
-            case "Title":
-
-                def sort_func(x):
-                    return x.path.name
-            case "Last Modified Date":
-
-                def sort_func(x):
-                    return x.path.stat().st_mtime_ns
-            case _:
-                Logger.error(f"Invalid sort_strategy: {self.sort_strategy}")
-
-                def sort_func(x):
-                    return x.path.stat().st_mtime_ns
-
-        self.notes.sort(key=sort_func, reverse=not self.ascending)
-        for i, note in enumerate(self.notes):
-            note.set_index(i)
+    def reposition_note(self, note: NoteResourceFile):
+        """
+        Move `note` to where its sort key now belongs, e.g. after `update_note_ages`. Only the notes between its
+        previous and new position are renumbered.
+        """
+        notes = self.notes
+        old = note.index_
+        if not (0 <= old < len(notes) and notes[old] is note):
+            old = notes.index(note)
+        del notes[old]
+        new = self._insertion_point(self.sort_key(note))
+        notes.insert(new, note)
+        self._renumber(min(old, new), max(old, new) + 1)
 
     def add_note_from_path(self, fp: "Path") -> NoteResourceFile:
         """
-        Add a path to `self.notes`, from a Path
+        Add a path to `self.notes`, from a Path, at its sorted position
         """
         resource = NoteResourceFile(
             path=fp,
@@ -211,9 +241,9 @@ class CategoryResourceFiles:
             index_=-1,
             category=self.category,
         )
-        self.notes.append(resource)
-        # This should be the head or tail, so skip updating ages
-        self.reindex_notes()
+        position = self._insertion_point(self.sort_key(resource))
+        self.notes.insert(position, resource)
+        self._renumber(position, len(self.notes))
         return resource
 
     def get_md_notes(self, refresh: bool = False):
@@ -254,6 +284,8 @@ class CategoryResourceFiles:
         return None
 
     def get_note_by_idx(self, idx) -> NoteResourceFile:
+        if 0 <= idx < len(self.notes) and self.notes[idx].index_ == idx:
+            return self.notes[idx]
         matched_note = next((note for note in self.notes if note.index_ == idx), None)
         if not matched_note:
             raise IndexError(f"{idx} not found")
@@ -10,7 +10,9 @@ if TYPE_CHECKING:
     from kivy.uix.screenmanager import ScreenManager
 
     from mindref.lib import DisplayState
+    from mindref.lib.adapters.atlas.fs.category_atlas import CategoryAtlas
     from mindref.lib.adapters.atlas.fs.fs_atlas_repository import AtlasService
+    from mindref.lib.adapters.atlas.fs.thumbnails import ThumbnailService
     from mindref.lib.adapters.editor.fs.fs_editor_repository import FileSystemEditor
     from mindref.lib.adapters.notes.android.android_note_repository import (
         AndroidNoteRepository,
@@ -25,6 +27,8 @@ if TYPE_CHECKING:
 
 class AppRegistryProtocol(Protocol):
     atlas_service: AtlasService
+    thumbnail_service: ThumbnailService
+    category_atlas: CategoryAtlas
     note_service: FileSystemNoteRepository | AndroidNoteRepository
     editor_service: FileSystemEditor
     plugin_manager: PluginManager
@@ -33,6 +37,7 @@ class AppRegistryProtocol(Protocol):
     platform_android: bool
     note_categories: list[str]
     note_category: str
+    note_storage_path: Path | None
     menu_open: bool
     display_state_last: DisplayState
     display_state_current: DisplayState
@@ -48,6 +48,13 @@ _common_settings = [
         "section": "Display",
         "key": "BASE_FONT_SIZE",
     },
+    {
+        "type": "bool",
+        "title": "Category Image Atlas",
+        "desc": "Pack category images into a single texture",
+        "section": "Display",
+        "key": "CATEGORY_ATLAS",
+    },
 ]
 
 _storage_settings = [
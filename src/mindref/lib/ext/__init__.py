@@ -3,6 +3,7 @@ from .ext import (
     color_str_components,
     compute_overscroll,
     compute_ref_coords,
+    compute_ref_rects,
     compute_text_contrast,
     normalize_coordinates,
 )
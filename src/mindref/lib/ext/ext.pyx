@@ -93,6 +93,37 @@ def compute_ref_coords(double width, double height, double wX, double wY, double
 
     return span_x1, span_y1, span_x2, span_y2
 
+def compute_ref_rects(double width, double height, double wX, double wY, double texture_width, double texture_height,
+                      const double[::1] spans, double hl_pad_x, double hl_pad_y):
+    """
+        Batched `compute_ref_coords`, converting every span of a label in a single call
+
+        Parameters
+        ----------
+        spans
+            Flat buffer of span coordinates, (x1, y1, x2, y2) for each span
+
+        Returns
+        -------
+        List of (x, y, w, h) for each span, in window coordinates. As with `compute_ref_coords`, h is negative as the
+            span's y1 is its top edge.
+    """
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n = spans.shape[0] // 4
+    cdef double pX = (width - texture_width) / 2.0
+    cdef double pY = (height - texture_height) / 2.0
+    cdef double x1, y1, x2, y2
+    cdef list rects = [None] * n
+
+    for i in range(n):
+        x1 = spans[4 * i] + pX - hl_pad_x + wX
+        x2 = spans[4 * i + 2] + pX + hl_pad_x + wX
+        y1 = height - spans[4 * i + 1] - pY - hl_pad_y + wY
+        y2 = height - spans[4 * i + 3] - pY + hl_pad_y + wY
+        rects[i] = (x1, y1, x2 - x1, y2 - y1)
+
+    return rects
+
 def color_str_components(color_str : str):
     """Convert hex color string to rgba float components"""
     cdef float r, g, b, a
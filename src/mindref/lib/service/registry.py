@@ -1,9 +1,10 @@
 from collections import deque
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from pathlib import Path
 from typing import TYPE_CHECKING, Literal, Optional
 
 from kivy import Logger
+from kivy.clock import mainthread
 
 from mindref.lib.domain.events import (
     EventFailure,
@@ -15,14 +16,19 @@ from mindref.lib.domain.events import (
     NotesQueryFailureEvent,
     NotesQueryNotSetFailureEvent,
 )
+from mindref.lib.domain.note_meta import meta_patch
 from mindref.lib.utils import def_cb, sch_cb, schedulable
-from mindref.lib.utils.caching import kivy_cache
+from mindref.lib.utils.caching import cache_remove_where, kivy_cache
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future
+
     from mindref.lib.domain.editable import EditableNote
     from mindref.lib.domain.events import Event
     from mindref.lib.domain.markdown_note import MarkdownNote, MarkdownNoteDict
     from mindref.lib.domain.protocols import AppRegistryProtocol
+    from mindref.lib.service.uow import FileSystemUnitOfWork
+    from mindref.lib.service.vault_import import VaultImport
     from mindref.lib.widgets.typeahead.typeahead_dropdown import Suggestion
 
 
@@ -47,8 +53,9 @@ class Registry:
     def app(self, app: "AppRegistryProtocol"):
         self._app = app
 
-    def set_note_storage_path(self, path: Path | str):
+    def set_note_storage_path(self, path: Path | str | None):
         self.app.note_service.storage_path = path
+        self.app.note_storage_path = None if path is None else Path(path)
         Logger.info(f"{type(self).__name__}: Set Note Service Storage Path - {path!s}")
 
     def push_event(self, event: "Event"):
@@ -215,6 +222,92 @@ class Registry:
 
         Cache.remove(category, key)
 
+    def invalidate_note(self, filepath: Path):
+        """Evict the cached widgets of a single note"""
+        key = str(filepath)
+        n = cache_remove_where("note_widget", lambda k: k[0] == key)
+        Logger.debug(f"{type(self).__name__}: invalidate_note - {n} evicted")
+
+    def invalidate_notes(self, filepaths: Iterable[Path]):
+        """Evict the cached widgets of several notes, in one pass over the cache"""
+        keys = {str(fp) for fp in filepaths}
+        n = cache_remove_where("note_widget", lambda k: k[0] in keys)
+        Logger.debug(f"{type(self).__name__}: invalidate_notes - {n} evicted")
+
+    def unit_of_work(self, fsync: bool | None = None) -> "FileSystemUnitOfWork":
+        """
+        Batch note writes, moves and deletes, see `FileSystemUnitOfWork`
+
+        On Android, storage mirrors external storage, and only writes can be staged
+        """
+        from mindref.lib.service.uow import FileSystemUnitOfWork
+
+        return FileSystemUnitOfWork(
+            self.app.note_service, invalidate=self.invalidate_notes, fsync=fsync
+        )
+
+    def import_vault(
+        self,
+        source: Path,
+        on_complete: Callable[[Optional["VaultImport"]], None] | None = None,
+        **kwargs,
+    ):
+        """
+        Import a directory or zip archive of notes, see `mindref.lib.service.vault_import`
+
+        Notes are read, parsed and staged on the note writer thread, then committed at once on the main thread. Only
+        new categories push an event, the active category's metadata is queried again once.
+
+        Parameters
+        ----------
+        source
+        on_complete
+            Called with the import, or None if it failed
+        kwargs
+            Passed to `read_vault`
+        """
+        from mindref.lib.service.vault_import import (
+            read_vault,
+            stage_vault,
+            sync_storage,
+        )
+
+        app = self.app
+        note_repo = app.note_service
+        uow = self.unit_of_work(fsync=False)
+
+        def stage() -> "VaultImport":
+            vault = read_vault(source, note_repo.storage_path, **kwargs)
+            stage_vault(vault, uow)
+            return vault
+
+        @mainthread
+        def staged(future: "Future[VaultImport]"):
+            try:
+                vault = future.result()
+                uow.commit()
+            except Exception as e:
+                Logger.exception(
+                    f"{type(self).__name__}: import_vault - {source} - {e}"
+                )
+                uow.rollback()
+                if on_complete:
+                    on_complete(None)
+                return
+            if note_repo.fsync_writes:
+                note_repo.writer.submit(sync_storage)
+            if app.note_category in vault.categories:
+                note_repo.get_category_meta(
+                    app.note_category,
+                    on_complete=app.note_category_meta.assign,
+                    refresh=False,
+                )
+            if on_complete:
+                on_complete(vault)
+
+        note_repo.writer.submit(stage).add_done_callback(staged)
+        Logger.info(f"{type(self).__name__}: import_vault - {source}")
+
     def new_note(self, category: str | None, idx: int | None) -> "EditableNote":
         category = category if category else self.app.note_category
         idx = idx if idx is not None else self.app.note_service.index_size() + 1
@@ -240,17 +333,31 @@ class Registry:
         """
 
         def update_app_meta(meta: list["MarkdownNoteDict"]) -> None:
-            self.app.note_category_meta = meta
+            self.app.note_category_meta.assign(meta)
+
+        def patch_app_meta(md_note: "MarkdownNote") -> None:
+            """Replace or insert the saved note's metadata, falling back to querying the category"""
+            app = self.app
+            if md_note.category != app.note_category:
+                return
+            meta = app.note_category_meta
+            is_new = not any(m["filepath"] == md_note.filepath for m in meta)
+            n_notes = len(app.note_service.category_files[md_note.category].notes)
+            if len(meta) + is_new != n_notes:
+                # Out of step with the repository
+                app.note_service.get_category_meta(
+                    app.note_category, on_complete=update_app_meta, refresh=False
+                )
+                return
+            start, stop, replacement = meta_patch(meta, md_note.to_dict())
+            meta.patch(start, stop, replacement)
 
         def push_fetched_event(md_note: "MarkdownNote") -> None:
             Logger.info(f"{type(self).__name__} : Note Service says note was saved")
-            self.clear_cache("category_meta")
-            self.clear_cache("note_widget")
+            self.invalidate_note(md_note.filepath)
             self.push_event(NoteFetchedEvent(note=md_note))
-            # We can leave refresh as False, the note was refreshed by note service
-            self.app.note_service.get_category_meta(
-                self.app.note_category, on_complete=update_app_meta, refresh=False
-            )
+            # The note service refreshed only the saved note
+            patch_app_meta(md_note)
 
         # store note to disk
         self.app.note_service.save_note(note, on_complete=push_fetched_event)
@@ -1,7 +1,40 @@
+"""
+Batched, all-or-nothing changes to note files
+
+A unit of work stages note writes, moves and deletes, and applies them together when committed. The repository is then
+brought up to date once, rather than once per note: each affected category is listed and sorted once, only the changed
+notes are read again, and cached widgets of the changed notes are evicted in one pass.
+
+If applying a change fails, the changes applied before it are undone and the repository is left as it was.
+"""
+
+from __future__ import annotations
+
 import abc
+import itertools
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from kivy import Logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from mindref.lib.adapters.notes.fs.fs_note_repository import (
+        FileSystemNoteRepository,
+    )
+    from mindref.lib.adapters.notes.note_repository import AbstractNoteRepository
+    from mindref.lib.domain.markdown_note import MarkdownNote
+
+# Notes are files within a category folder of the storage root
+NOTE_PATH_PARTS = 2
+
 
-from mindref.lib.adapters.notes.fs.fs_note_repository import FileSystemNoteRepository
-from mindref.lib.adapters.notes.note_repository import AbstractNoteRepository
+class UnsupportedChange(Exception):
+    """The repository can't keep a staged change"""
 
 
 class AbstractUnitOfWork(abc.ABC):
@@ -27,12 +60,197 @@ class AbstractUnitOfWork(abc.ABC):
         raise NotImplementedError
 
 
+@dataclass(slots=True)
+class StagedWrite:
+    path: Path
+    staged: Path
+    note: MarkdownNote | None = None
+
+
+@dataclass(slots=True)
+class StagedMove:
+    src: Path
+    dst: Path
+
+
+@dataclass(slots=True)
+class StagedDelete:
+    path: Path
+
+
 class FileSystemUnitOfWork(AbstractUnitOfWork):
-    def __init__(self, repo: FileSystemNoteRepository):
+    """
+    Examples
+    --------
+    >>> with FileSystemUnitOfWork(repo) as uow:
+    ...     uow.write(path, text)
+    ...     uow.move(old_path, new_path)
+    ...     uow.commit()
+
+    Leaving the block without committing discards what was staged.
+
+    Parameters
+    ----------
+    repo
+    invalidate
+        Called once after a commit, with every path that was written, moved or deleted. Evicts cached note widgets.
+    fsync
+        Flush each staged file to disk, defaults to the repository's `fsync_writes`. Bulk writers may disable it and
+        sync once after committing.
+
+    Raises
+    ------
+    UnsupportedChange
+        When staging a move or delete, if the repository has `mirrored_storage`
+
+    Notes
+    -----
+    Written text is staged to hidden files in the storage root, on the same filesystem as the notes, so committing only
+    renames files. Files replaced or deleted by a commit are kept aside until every change is applied.
+    """
+
+    def __init__(
+        self,
+        repo: FileSystemNoteRepository,
+        invalidate: Callable[[Iterable[Path]], None] | None = None,
+        fsync: bool | None = None,
+    ):
         self.repo = repo
+        self.invalidate = invalidate
+        self.fsync = repo.fsync_writes if fsync is None else fsync
+        self.staged: list[StagedWrite | StagedMove | StagedDelete] = []
+        self._token = uuid.uuid4().hex[:8]
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self.staged)
+
+    def _temp_path(self, suffix: str) -> Path:
+        return (
+            self.repo.storage_path / f".uow-{self._token}-{next(self._counter)}{suffix}"
+        )
+
+    def _check(self, path: Path) -> Path:
+        """
+        Raises
+        ------
+        ValueError
+            If `path` isn't a file within a category of the storage root
+        """
+        path = Path(path)
+        if len(path.relative_to(self.repo.storage_path).parts) != NOTE_PATH_PARTS:
+            raise ValueError(f"{path} is not a note path")
+        return path
+
+    def write(self, path: Path, text: str, note: MarkdownNote | None = None):
+        """
+        Stage writing `text` to `path`, creating or replacing the note
+
+        Parameters
+        ----------
+        path
+        text
+        note
+            `text` already parsed, the repository uses it rather than reading the note again
+        """
+        path = self._check(path)
+        staged = self._temp_path(".tmp")
+        with staged.open("w", encoding="utf-8") as f:
+            f.write(text)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        self.staged.append(StagedWrite(path=path, staged=staged, note=note))
+
+    def _check_removal(self, path: Path):
+        if self.repo.mirrored_storage:
+            raise UnsupportedChange(
+                f"{type(self.repo).__name__} would restore {path}, it can't be moved or deleted"
+            )
+
+    def move(self, src: Path, dst: Path):
+        """Stage moving a note, which may be to another category. Fails at commit if `dst` exists."""
+        self._check_removal(src)
+        self.staged.append(StagedMove(src=self._check(src), dst=self._check(dst)))
+
+    def delete(self, path: Path):
+        """Stage deleting a note"""
+        self._check_removal(path)
+        self.staged.append(StagedDelete(path=self._check(path)))
 
     def _commit(self):
-        pass
+        undo: list[Callable[[], None]] = []
+        kept_aside: list[Path] = []
+
+        def ensure_category(path: Path):
+            folder = path.parent
+            if not folder.is_dir():
+                folder.mkdir()
+                undo.append(folder.rmdir)
+
+        def set_aside(path: Path):
+            aside = self._temp_path(".bak")
+            path.replace(aside)
+            kept_aside.append(aside)
+            undo.append(lambda: aside.replace(path))
+
+        def move(src: Path, dst: Path):
+            if dst.exists():
+                raise FileExistsError(f"Cannot move {src}, {dst} exists")
+            ensure_category(dst)
+            src.replace(dst)
+            undo.append(lambda: dst.replace(src))
+
+        changed = []
+        loaded = {}
+        try:
+            for change in self.staged:
+                match change:
+                    case StagedWrite(path=path, staged=staged, note=note):
+                        if path.exists():
+                            set_aside(path)
+                        else:
+                            ensure_category(path)
+                        staged.replace(path)
+                        undo.append(lambda p=path: p.unlink())
+                        changed.append(path)
+                        loaded[path] = note
+                    case StagedMove(src=src, dst=dst):
+                        move(src, dst)
+                        changed.extend((src, dst))
+                        loaded.pop(src, None)
+                    case StagedDelete(path=path):
+                        set_aside(path)
+                        changed.append(path)
+                        loaded.pop(path, None)
+        except BaseException:
+            Logger.error(
+                f"{type(self).__name__}: commit - Failed, undoing {len(undo)} steps"
+            )
+            for step in reversed(undo):
+                try:
+                    step()
+                except OSError as e:
+                    Logger.error(f"{type(self).__name__}: commit - Undo failed - {e}")
+            raise
+
+        self.staged.clear()
+        for aside in kept_aside:
+            aside.unlink(missing_ok=True)
+
+        storage_path = self.repo.storage_path
+        categories = {path.relative_to(storage_path).parts[0] for path in changed}
+        loaded = {path: note for path, note in loaded.items() if note is not None}
+        self.repo.refresh_categories(categories, changed, loaded)
+        if self.invalidate is not None:
+            self.invalidate(changed)
+        Logger.info(
+            f"{type(self).__name__}: commit - {len(changed)} paths in {len(categories)} categories"
+        )
 
     def rollback(self):
-        pass
+        """Discard what was staged and not committed"""
+        for change in self.staged:
+            if isinstance(change, StagedWrite):
+                change.staged.unlink(missing_ok=True)
+        self.staged.clear()
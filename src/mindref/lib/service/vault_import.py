@@ -0,0 +1,312 @@
+"""
+Bulk import of an existing markdown collection
+
+A vault is a directory tree, or a zip archive of one. Each top level folder becomes a category, and every markdown file
+beneath it, at any depth, becomes a note of that category. Hidden files and folders, such as `.obsidian`, and files
+other than markdown are ignored.
+
+Notes are read, validated and parsed in parallel by `read_vault`. `stage_vault` then stages them with a single
+`FileSystemUnitOfWork`, so committing refreshes the repository and its caches once, and no event is pushed per note.
+
+Usage
+-----
+python -m mindref.lib.service.vault_import VAULT NOTES_PATH [--category NAME] [--overwrite]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING
+
+from kivy import Logger
+
+from mindref.lib.domain.markdown_note import MarkdownNote
+from mindref.lib.service.uow import FileSystemUnitOfWork
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from mindref.lib.adapters.notes.fs.fs_note_repository import (
+        FileSystemNoteRepository,
+    )
+
+NOTE_SUFFIXES = (".md", ".markdown")
+PARSE_BATCH_SIZE = 64
+
+
+@dataclass(slots=True)
+class VaultNote:
+    """
+    Attributes
+    ----------
+    source
+        Path within the vault, '/' separated
+    path
+        Where the note is written in storage
+    text
+    note
+        `text`, parsed
+    """
+
+    source: str
+    path: Path
+    text: str
+    note: MarkdownNote
+
+
+@dataclass
+class VaultImport:
+    """
+    Attributes
+    ----------
+    notes
+        Notes to import
+    skipped
+        Markdown files of the vault that aren't imported, with the reason
+    """
+
+    notes: list[VaultNote] = field(default_factory=list)
+    skipped: list[tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def categories(self) -> list[str]:
+        return sorted({vault_note.note.category for vault_note in self.notes})
+
+
+@contextmanager
+def _vault_members(source: Path) -> Iterator[Iterable[tuple[str, Callable[[], bytes]]]]:
+    """Vault paths, '/' separated, with a function reading each. The readers are safe to call from any thread."""
+    if source.is_dir():
+        yield (
+            (fp.relative_to(source).as_posix(), fp.read_bytes)
+            for fp in source.rglob("*")
+            if fp.is_file()
+        )
+    elif zipfile.is_zipfile(source):
+        lock = threading.Lock()
+        with zipfile.ZipFile(source) as archive:
+
+            def reader(info: zipfile.ZipInfo) -> Callable[[], bytes]:
+                def read():
+                    with lock:
+                        return archive.read(info)
+
+                return read
+
+            yield (
+                (info.filename, reader(info))
+                for info in archive.infolist()
+                if not info.is_dir()
+            )
+    else:
+        raise ValueError(f"{source} is neither a directory nor a zip archive")
+
+
+def note_target(source: str, root_category: str | None) -> tuple[str, str] | str | None:
+    """
+    Category and filename a vault path is imported as
+
+    Returns
+    -------
+    (category, filename)
+        If the path is imported
+    str
+        Why a markdown file isn't imported
+    None
+        If the path isn't a note
+    """
+    path = PurePosixPath(source)
+    if path.is_absolute() or ".." in path.parts:
+        return "unsafe path"
+    if path.suffix.lower() not in NOTE_SUFFIXES or any(
+        part.startswith(".") for part in path.parts
+    ):
+        return None
+    filename = f"{path.stem}.md"
+    if len(path.parts) > 1:
+        return path.parts[0], filename
+    if root_category:
+        return root_category, filename
+    return "not in a category folder"
+
+
+def parse_note(
+    source: str, read: Callable[[], bytes], category: str, path: Path
+) -> VaultNote | str:
+    """Read and parse a note, or return why it can't be imported"""
+    try:
+        text = read().decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return "not UTF-8"
+    except OSError as e:
+        return f"unreadable - {e}"
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    if not text.strip():
+        return "empty"
+    note = MarkdownNote.from_text(category, -1, text, path)
+    return VaultNote(source=source, path=path, text=text, note=note)
+
+
+def read_vault(
+    source: Path,
+    storage_path: Path,
+    root_category: str | None = None,
+    overwrite: bool = False,
+    max_workers: int | None = None,
+) -> VaultImport:
+    """
+    Read and parse the notes of a vault, in parallel. Nothing is written.
+
+    Parameters
+    ----------
+    source
+        Directory or zip archive
+    storage_path
+        Root of note storage the vault is imported to
+    root_category
+        Category of notes at the top level of the vault. By default, they're skipped.
+    overwrite
+        Replace notes that already exist in storage. By default, they're skipped.
+    max_workers
+        Threads reading and parsing notes
+
+    Raises
+    ------
+    ValueError
+        If `source` is neither a directory nor a zip archive
+    """
+    result = VaultImport()
+    claimed: dict[Path, str] = {}
+    jobs = []
+    with _vault_members(Path(source)) as members:
+        for name, read in members:
+            target = note_target(name, root_category)
+            match target:
+                case None:
+                    continue
+                case str() as reason:
+                    result.skipped.append((name, reason))
+                    continue
+            category, filename = target
+            path = storage_path / category / filename
+            if path in claimed:
+                result.skipped.append((name, f"duplicate of {claimed[path]}"))
+            elif not overwrite and path.exists():
+                result.skipped.append((name, "exists"))
+            else:
+                claimed[path] = name
+                jobs.append((name, read, category, path))
+
+        # Batched, one future per note costs more than parsing a short note
+        batches = [
+            jobs[i : i + PARSE_BATCH_SIZE]
+            for i in range(0, len(jobs), PARSE_BATCH_SIZE)
+        ]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            parsed = executor.map(
+                lambda batch: [parse_note(*job) for job in batch], batches
+            )
+            outcomes = (outcome for batch in parsed for outcome in batch)
+            for (name, *_), outcome in zip(jobs, outcomes, strict=True):
+                if isinstance(outcome, str):
+                    result.skipped.append((name, outcome))
+                else:
+                    result.notes.append(outcome)
+    Logger.info(
+        f"read_vault: {source} - {len(result.notes)} notes in {len(result.categories)} categories,"
+        f" {len(result.skipped)} skipped"
+    )
+    return result
+
+
+def stage_vault(vault: VaultImport, uow: FileSystemUnitOfWork):
+    """Stage writing every note of `vault`, with its parsed note"""
+    for vault_note in vault.notes:
+        uow.write(vault_note.path, vault_note.text, note=vault_note.note)
+
+
+def sync_storage():
+    """Flush written files to disk, once, after a commit that didn't fsync each file"""
+    if hasattr(os, "sync"):
+        os.sync()
+
+
+def import_vault(
+    source: Path,
+    repo: FileSystemNoteRepository,
+    invalidate: Callable[[Iterable[Path]], None] | None = None,
+    **kwargs,
+) -> VaultImport:
+    """
+    Read, stage and commit a vault, on the calling thread
+
+    Parameters
+    ----------
+    source
+    repo
+    invalidate
+        See `FileSystemUnitOfWork`
+    kwargs
+        Passed to `read_vault`
+    """
+    vault = read_vault(source, repo.storage_path, **kwargs)
+    with FileSystemUnitOfWork(repo, invalidate=invalidate, fsync=False) as uow:
+        stage_vault(vault, uow)
+        uow.commit()
+    if repo.fsync_writes:
+        sync_storage()
+    return vault
+
+
+def main(argv: list[str]) -> int:
+    from mindref.lib.adapters.notes.fs.fs_note_repository import (
+        FileSystemNoteRepository,
+    )
+
+    parser = argparse.ArgumentParser(
+        prog="python -m mindref.lib.service.vault_import",
+        description="Import a directory or zip archive of markdown notes. Top level folders become categories.",
+    )
+    parser.add_argument("vault", type=Path, help="Directory or zip archive")
+    parser.add_argument("notes_path", type=Path, help="MindRef note storage")
+    parser.add_argument(
+        "--category", help="Category for notes at the top level of the vault"
+    )
+    parser.add_argument(
+        "--overwrite", action="store_true", help="Replace notes that already exist"
+    )
+    parser.add_argument("--workers", type=int, help="Threads parsing notes")
+    args = parser.parse_args(argv)
+
+    args.notes_path.mkdir(parents=True, exist_ok=True)
+    # No app is running. Committing only refreshes categories, which pushes no events without an app.
+    repo = FileSystemNoteRepository(get_app=lambda: None)
+    repo.storage_path = args.notes_path
+    start = time.perf_counter()
+    vault = import_vault(
+        args.vault,
+        repo,
+        root_category=args.category,
+        overwrite=args.overwrite,
+        max_workers=args.workers,
+    )
+    for name, reason in vault.skipped:
+        print(f"Skipped {name}: {reason}")
+    print(
+        f"Imported {len(vault.notes)} notes into {len(vault.categories)} categories"
+        f" in {time.perf_counter() - start:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -19,6 +19,8 @@ from kivy import Logger
 from kivy.clock import Clock
 from kivy.lang import Builder
 
+from . import kv_cache
+from .files import atomic_replace
 from .triggers import trigger_factory
 
 if TYPE_CHECKING:
@@ -80,7 +82,7 @@ def import_kv(path: str | Path) -> None:
     kv_path = base_path.with_suffix(".kv")
     if kv_path.exists() and (sp := str(kv_path)) not in Builder.files:
         Logger.debug(f"Loading {kv_path.name}")
-        Builder.load_file(sp, rulesonly=True)
+        kv_cache.load_file(sp)
 
 
 def log_run_time(func: Callable[P, T]) -> Callable[P, T]:
@@ -245,6 +247,8 @@ class LazyLoaded(Generic[T]):
         setattr(owner, self.private_name, self.default)
 
     def __get__(self, obj, objtype=None) -> "T":
+        if obj is None:
+            return self
         value = getattr(obj, self.private_name)
         if value == self.default:
             value = getattr(obj, self.loader)()
@@ -1,5 +1,6 @@
+from collections import OrderedDict
 from functools import wraps
-from typing import TYPE_CHECKING, Optional, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, Optional, TypeVar
 
 from kivy.cache import Cache
 
@@ -13,6 +14,8 @@ if TYPE_CHECKING:
     KeyedCallable = Callable[POuter, Hashable]
     InnerCallable = Callable[PInner, TInner]
 
+V = TypeVar("V")
+
 
 def kivy_cache(
     cache_name: str,
@@ -55,6 +58,72 @@ def kivy_cache(
     return dec_kivy_cache
 
 
+def cache_remove_where(cache_name: str, predicate: "Callable[[Hashable], bool]") -> int:
+    """
+    Remove the entries of a Kivy Cache whose key matches `predicate`, leaving the rest of the category cached
+
+    Returns
+    -------
+    Number of entries removed
+    """
+    keys = [key for key in Cache._objects.get(cache_name, {}) if predicate(key)]
+    for key in keys:
+        Cache.remove(cache_name, key)
+    return len(keys)
+
+
+class ByteBoundedCache(Generic[V]):
+    """
+    LRU mapping bounded by the total size of its values, rather than their count as Kivy's `Cache` is
+
+    Parameters
+    ----------
+    max_bytes
+        Least recently used entries are evicted once the sizes given to `put` exceed this
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries: OrderedDict[Hashable, tuple[V, int]] = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: "Hashable"):
+        return key in self._entries
+
+    def get(self, key: "Hashable", default: V | None = None) -> V | None:
+        try:
+            value, _ = self._entries[key]
+        except KeyError:
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: "Hashable", value: V, nbytes: int):
+        """Store `value`, which takes up `nbytes`. Values larger than the cache itself are not stored."""
+        self.pop(key)
+        if nbytes > self.max_bytes:
+            return
+        self._entries[key] = (value, nbytes)
+        self.nbytes += nbytes
+        while self.nbytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+
+    def pop(self, key: "Hashable", default: V | None = None) -> V | None:
+        if (entry := self._entries.pop(key, None)) is None:
+            return default
+        value, nbytes = entry
+        self.nbytes -= nbytes
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+
 def cache_key_text_extents(**kwargs) -> str:
     """Generate key for 'text_extents' cache"""
     label = kwargs.get("label")
@@ -63,6 +132,20 @@ def cache_key_text_extents(**kwargs) -> str:
     return f"{text}-{opts['font_size']}-{opts['font_family']}"
 
 
+def cache_key_text_layout(*_args, **kwargs) -> tuple[str, tuple]:
+    """
+    Generate key for a rendered text layout. `options` are those of a core text label, which include its font,
+    padding and `text_size` (the width text is wrapped at).
+    """
+    text = kwargs.get("text")
+    options: dict[str, Any] = kwargs.get("options")
+    return text, tuple(
+        (k, tuple(v) if isinstance(v, list) else v)
+        for k, v in sorted(options.items())
+        if k != "text"
+    )
+
+
 def cache_key_text_contrast(*_args, **kwargs) -> tuple[tuple, int, tuple | None]:
     """Generate key for 'text_contrast'"""
     background_color = kwargs.get("background_color")
@@ -79,7 +162,8 @@ def cache_key_color_norm(*_args, **kwargs) -> tuple:
     return tuple(kwargs.get("color"))
 
 
-def cache_key_note(*_args, **kwargs) -> str:
+def cache_key_note(*_args, **kwargs) -> tuple[str, str, int]:
+    """Generate key for 'note_widget', led by the note's filepath so a note's widgets can be evicted together"""
     content_data = kwargs.get("content_data")
     parent = kwargs.pop("parent")
-    return f"{content_data['filepath']}-{content_data['text']}-{hash(parent)}"
+    return str(content_data["filepath"]), content_data["text"], hash(parent)
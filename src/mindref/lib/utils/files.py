@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+@contextmanager
+def atomic_replace(path: Path, tmp_dir: Path | None = None) -> Iterator[Path]:
+    """
+    Replace `path` with a file written to a temporary path, such that `path` is never left partially written
+
+    Examples
+    --------
+    >>> with atomic_replace(path) as tmp:
+    ...     tmp.write_text(text)
+
+    Parameters
+    ----------
+    path
+    tmp_dir
+        Directory for the temporary file, on the same filesystem as `path`. Defaults to the directory of `path`.
+
+    Notes
+    -----
+    Close the temporary file within the block. If the block raises, the temporary file is removed and `path` is
+    unchanged.
+    """
+    tmp = (tmp_dir or path.parent) / f".{path.name}.{threading.get_ident()}.tmp"
+    try:
+        yield tmp
+        tmp.replace(path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,236 @@
+"""
+Precompiled KV rule cache
+
+`Builder.load_file` lexes, parses and compiles every rule of a `.kv` file on each launch. Here the resulting `Parser`
+is pickled to a ``__kvcache__`` directory next to the `.kv` file (in the spirit of ``__pycache__``) and loaded on later
+starts. Cache files are named by a hash of the `.kv` content, the Kivy version and the bytecode magic number, so editing
+a `.kv` file or upgrading Python/Kivy invalidates the entry automatically.
+
+Caches can be prebuilt with ``python -m mindref.lib.utils.kv_cache [DIRECTORY ...]``.
+Set the environment variable ``MINDREF_KV_CACHE=0`` to bypass the cache.
+"""
+
+from __future__ import annotations
+
+import copyreg
+import hashlib
+import importlib.util
+import io
+import marshal
+import os
+import pickle
+import sys
+from functools import partial
+from pathlib import Path
+from types import CodeType
+from typing import TYPE_CHECKING
+
+import kivy
+from kivy import Logger
+from kivy.factory import Factory
+from kivy.lang import Builder
+from kivy.lang.parser import Parser, ParserException
+
+from .files import atomic_replace
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from kivy.lang.parser import ParserRule
+
+CACHE_DIR = "__kvcache__"
+CACHE_SUFFIX = ".kvc"
+CACHE_ENV = "MINDREF_KV_CACHE"
+
+
+class _CompileOnlyParser(Parser):
+    """Parses without executing directives, so caches can be built without importing the modules a `.kv` references"""
+
+    __slots__ = ()
+
+    def execute_directives(self):
+        pass
+
+
+def _load_code(data: bytes) -> CodeType:
+    return marshal.loads(data)
+
+
+def _reduce_code(co: CodeType):
+    return _load_code, (marshal.dumps(co),)
+
+
+_DISPATCH = copyreg.dispatch_table.copy()
+_DISPATCH[CodeType] = _reduce_code
+
+
+def enabled() -> bool:
+    return os.environ.get(CACHE_ENV, "1") not in {"", "0", "False", "false"}
+
+
+def cache_key(content: str) -> str:
+    h = hashlib.sha1(content.encode("utf8"))
+    h.update(kivy.__version__.encode())
+    h.update(importlib.util.MAGIC_NUMBER)
+    return h.hexdigest()[:20]
+
+
+def cache_path(kv_path: Path, content: str) -> Path:
+    return (
+        kv_path.parent
+        / CACHE_DIR
+        / f"{kv_path.stem}.{cache_key(content)}{CACHE_SUFFIX}"
+    )
+
+
+def dumps(parser: Parser) -> bytes:
+    fp = io.BytesIO()
+    pickler = pickle.Pickler(fp, protocol=pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = _DISPATCH
+    pickler.dump(parser)
+    return fp.getvalue()
+
+
+def _iter_rules(parser: Parser) -> Iterator[ParserRule]:
+    stack = [rule for _, rule in parser.rules]
+    stack.extend(template for *_, template in parser.templates)
+    if parser.root:
+        stack.append(parser.root)
+    seen = set()
+    while stack:
+        rule = stack.pop()
+        if id(rule) in seen:
+            continue
+        seen.add(id(rule))
+        yield rule
+        stack.extend(rule.children)
+        stack.extend(
+            c for c in (rule.canvas_before, rule.canvas_root, rule.canvas_after) if c
+        )
+
+
+def _relocate_code(co: CodeType, filename: str) -> CodeType:
+    consts = tuple(
+        _relocate_code(c, filename) if isinstance(c, CodeType) else c
+        for c in co.co_consts
+    )
+    return co.replace(co_filename=filename, co_consts=consts)
+
+
+def relocate(parser: Parser, filename: str) -> None:
+    """
+    Point a cached parser at `filename`. `Builder.unload_file` matches rules by filename and tracebacks use the
+    compiled code's filename, both of which may differ from where the cache was built.
+    """
+    if parser.filename == filename:
+        return
+    parser.filename = filename
+    for rule in _iter_rules(parser):
+        for prop in (*rule.properties.values(), *rule.handlers):
+            if isinstance(prop.co_value, CodeType):
+                prop.co_value = _relocate_code(prop.co_value, filename)
+
+
+def _read_cache(path: Path, filename: str) -> Parser | None:
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    try:
+        parser = pickle.loads(data)
+    except Exception as e:
+        Logger.warning(f"KVCache: Discarding unreadable cache {path.name} - {e}")
+        path.unlink(missing_ok=True)
+        return None
+    relocate(parser, filename)
+    return parser
+
+
+def _write_cache(path: Path, parser: Parser) -> None:
+    try:
+        path.parent.mkdir(exist_ok=True)
+        for stale in path.parent.glob(f"{path.name.rsplit('.', 2)[0]}.*{CACHE_SUFFIX}"):
+            stale.unlink(missing_ok=True)
+        with atomic_replace(path) as tmp:
+            tmp.write_bytes(dumps(parser))
+    except OSError as e:
+        Logger.debug(f"KVCache: Unable to write {path} - {e}")
+
+
+def compile_file(kv_path: Path) -> Path:
+    """Parse `kv_path` without side effects and store its cache entry. Returns the cache path."""
+    content = kv_path.read_text(encoding="utf8")
+    path = cache_path(kv_path, content)
+    if not path.exists():
+        parser = _CompileOnlyParser(content=content, filename=str(kv_path))
+        parser.__class__ = Parser
+        _write_cache(path, parser)
+    return path
+
+
+def get_parser(filename: str) -> Parser:
+    """Return the parsed rules of `filename`, from cache when possible. Directives are executed in either case."""
+    kv_path = Path(filename)
+    content = kv_path.read_text(encoding="utf8")
+    if not enabled():
+        return Parser(content=content, filename=filename)
+    path = cache_path(kv_path, content)
+    parser = _read_cache(path, filename)
+    if parser is not None:
+        parser.execute_directives()
+        return parser
+    parser = Parser(content=content, filename=filename)
+    _write_cache(path, parser)
+    return parser
+
+
+def load_file(filename: str) -> None:
+    """
+    Equivalent of `Builder.load_file(filename, rulesonly=True)` that reuses cached rules.
+
+    Parameters
+    ----------
+    filename : str
+        Absolute path of a `.kv` file containing only rules, templates and directives
+    """
+    if filename in Builder.files:
+        Logger.warning(
+            f"Lang: The file {filename} is loaded multiples times, "
+            "you might have unwanted behaviors."
+        )
+    Builder._current_filename = filename
+    try:
+        parser = get_parser(filename)
+        if parser.root:
+            raise ParserException(
+                parser,
+                parser.root.line,
+                f"The file <{filename}> contain also non-rules directives",
+            )
+        Builder.rules.extend(parser.rules)
+        Builder._clear_matchcache()
+        for name, cls, template in parser.templates:
+            Builder.templates[name] = (cls, template, filename)
+            Factory.register(
+                name, cls=partial(Builder.template, name), is_template=True, warn=True
+            )
+        for name, baseclasses in parser.dynamic_classes.items():
+            Factory.register(
+                name, baseclasses=baseclasses, filename=filename, warn=True
+            )
+        if parser.templates or parser.dynamic_classes or parser.rules:
+            Builder.files.append(filename)
+    finally:
+        Builder._current_filename = None
+
+
+def main(directories: list[str]) -> None:
+    roots = [Path(d) for d in directories] or [Path(__file__).parents[2]]
+    for root in roots:
+        for kv_path in sorted(root.rglob("*.kv")):
+            compiled = compile_file(kv_path.resolve())
+            print(f"{kv_path} -> {compiled.name}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,7 +1,18 @@
+from array import array
+from functools import partial
+from itertools import chain
 from typing import Any, Literal, NamedTuple
 
 from kivy.clock import Clock
-from kivy.graphics import Color, RoundedRectangle
+from kivy.core.text.markup import MarkupLabel as CoreMarkupLabel
+from kivy.graphics import (
+    Color,
+    InstructionGroup,
+    PopMatrix,
+    PushMatrix,
+    RoundedRectangle,
+    Translate,
+)
 from kivy.metrics import sp
 from kivy.properties import (
     BooleanProperty,
@@ -13,27 +24,77 @@ from kivy.properties import (
     VariableListProperty,
 )
 from kivy.uix.label import Label
-from kivy.utils import escape_markup
+from kivy.utils import escape_markup, get_hex_from_color
 
 from mindref.lib.ext import (
     color_str_components,
-    compute_ref_coords,
+    compute_ref_rects,
     compute_text_contrast,
 )
 from mindref.lib.utils import import_kv
 from mindref.lib.utils.caching import (
+    ByteBoundedCache,
     cache_key_color_norm,
     cache_key_text_contrast,
+    cache_key_text_layout,
     kivy_cache,
 )
 
 import_kv(__file__)
 
+
 class TextSnippet(NamedTuple):
     text: str
     highlight_tag: Literal["hl", "kbd"] | None
 
 
+class TextLayout(NamedTuple):
+    """Rendered markup, shared by every label displaying the same text with the same options"""
+
+    texture: Any
+    texture_size: tuple[int, int]
+    refs: dict[str, list[tuple[float, float, float, float]]]
+    anchors: dict[str, tuple[float, float]]
+    is_shortened: bool
+
+    @property
+    def nbytes(self) -> int:
+        w, h = self.texture_size
+        return w * h * 4
+
+    @classmethod
+    def from_label(cls, label: CoreMarkupLabel) -> "TextLayout":
+        """
+        Take ownership of a core label's texture, so a later `refresh` of the label creates a new texture rather than
+        rendering over this one
+        """
+        texture = label.texture
+        if texture is not None and texture is not label.texture_1px:
+            label.texture = None
+            texture.remove_reload_observer(label._texture_refresh)
+            texture.add_reload_observer(
+                partial(_rerender_layout, label.text, dict(label.options))
+            )
+        return cls(
+            texture=texture,
+            texture_size=tuple(texture.size) if texture is not None else (0, 0),
+            refs=dict(label.refs),
+            anchors=dict(label.anchors),
+            is_shortened=label.is_shortened,
+        )
+
+
+def _rerender_layout(text: str, options: dict[str, Any], texture, *_args):
+    """Render a cached layout back into its texture, after the GL context is lost"""
+    label = CoreMarkupLabel(**dict(options, text=text))
+    label.texture = texture
+    label.refresh()
+
+
+text_layouts: ByteBoundedCache[TextLayout] = ByteBoundedCache(max_bytes=32 * 1024**2)
+"""Process-wide cache of rendered markup, bounded by texture size"""
+
+
 class LabelHighlightInline(Label):
     """
     Useful for instances where text has inline highlighting. In other words, the text snippet is highlighted at the
@@ -89,6 +150,18 @@ class LabelHighlightInline(Label):
         self.markup_text_trigger = Clock.create_trigger(self.markup_text)
         self.handle_contrast_trigger = Clock.create_trigger(self.handle_contrast)
         self.draw_ref_spans_trigger = Clock.create_trigger(self.draw_ref_spans)
+        self._markup = ""
+        self._markup_snippets: list[TextSnippet] = []
+        self._markup_style: tuple[str, str, str] | None = None
+        # Ref highlights are drawn relative to the widget, so moving it only updates the translation
+        self._ref_spans_key = None
+        self.ref_spans = InstructionGroup()
+        self.ref_spans_translate = Translate()
+        before = self.canvas.before
+        before.add(PushMatrix())
+        before.add(self.ref_spans_translate)
+        before.add(self.ref_spans)
+        before.add(PopMatrix())
 
     def on_parent(self, *_args):
         fbind = self.fbind
@@ -101,7 +174,7 @@ class LabelHighlightInline(Label):
             fbind("snippets", self.markup_text_trigger)
             fbind("refs", self.draw_ref_spans_trigger)
             fbind("size", self.draw_ref_spans_trigger)
-            fbind("pos", self.draw_ref_spans_trigger)
+            fbind("pos", self.translate_ref_spans)
             fbind("padding_x", self.draw_ref_spans_trigger)
             fbind("padding_y", self.draw_ref_spans_trigger)
 
@@ -113,10 +186,50 @@ class LabelHighlightInline(Label):
             funbind("snippets", self.markup_text_trigger)
             funbind("refs", self.draw_ref_spans_trigger)
             funbind("size", self.draw_ref_spans_trigger)
-            funbind("pos", self.draw_ref_spans_trigger)
+            funbind("pos", self.translate_ref_spans)
             funbind("padding_x", self.draw_ref_spans_trigger)
             funbind("padding_y", self.draw_ref_spans_trigger)
 
+    def texture_update(self, *largs):
+        """
+        As `Label.texture_update`, but layouts are shared through `text_layouts`, so re-rendering markup that has
+        already been rendered at the same width and font skips text layout entirely.
+        """
+        text = self.text
+        if self.halign == "justify" or self.strip:
+            text = text.strip()
+        if not self.markup or not text:
+            return super().texture_update(*largs)
+
+        label = self._label
+        label.text = "".join(
+            (
+                "[color=",
+                get_hex_from_color(
+                    self.disabled_color if self.disabled else self.color
+                ),
+                "]",
+                text,
+                "[/color]",
+            )
+        )
+        key = cache_key_text_layout(text=label.text, options=label.options)
+        if (layout := text_layouts.get(key)) is None:
+            label.refresh()
+            # force the rendering to get the references
+            if label.texture:
+                label.texture.bind()
+            layout = TextLayout.from_label(label)
+            text_layouts.put(key, layout, layout.nbytes)
+
+        self.texture = None
+        self.refs = layout.refs
+        self.anchors = layout.anchors
+        if layout.texture is not None:
+            self.texture = layout.texture
+            self.texture_size = list(layout.texture_size)
+        self.is_shortened = layout.is_shortened
+
     def add_snippet(self, snippet: TextSnippet):
         self.snippets.append(snippet)
 
@@ -132,81 +245,79 @@ class LabelHighlightInline(Label):
             threshold=self.text_threshold,
             highlight_color=tuple(self.highlight_color),
         )
+        self.markup_text_trigger()
         return True
 
+    def snippet_markup(self, snippet: TextSnippet) -> str:
+        snippet_text = snippet.text
+        if snippet.highlight_tag == "hl":
+            snippet_text = escape_markup(snippet_text)
+            return (
+                f" [font={self.font_family_mono}]"
+                f"[color={self.text_color_highlight}]"
+                f"[ref=hl]{snippet_text}[/ref][/color][/font] "
+            )
+        if snippet.highlight_tag == "kbd":
+            snippet_text = escape_markup(snippet_text)
+            return (
+                f" [font={self.font_family_mono}]"
+                f"[color=#000000]"
+                f"[ref=kbd]{snippet_text}[/ref][/color][/font] "
+            )
+        return f"[color={self.text_color}]{snippet_text}[/color]"
+
     def markup_text(self, *_args, **_kwargs):
-        """Update the markup within text to reflect new colors"""
-        texts = []
-        for snippet in self.snippets:
-            # If our last snippet is highlighted we add additional
-            snippet_text = snippet.text
-            if snippet.highlight_tag == "hl":
-                snippet_text = escape_markup(snippet_text)
-                texts.append(
-                    f" [font={self.font_family_mono}]"
-                    f"[color={self.text_color_highlight}]"
-                    f"[ref=hl]{snippet_text}[/ref][/color][/font] "
-                )
-            elif snippet.highlight_tag == "kbd":
-                snippet_text = escape_markup(snippet_text)
-                texts.append(
-                    f" [font={self.font_family_mono}]"
-                    f"[color=#000000]"
-                    f"[ref=kbd]{snippet_text}[/ref][/color][/font] "
-                )
-            else:
-                texts.append(f"[color={self.text_color}]{snippet_text}[/color]")
+        """
+        Update the markup within text to reflect new colors
+
+        Notes
+        -----
+        The markup of each snippet is kept until the colors or font change. Snippets are only ever appended, so
+        when the previous snippets are unchanged their markup is extended rather than regenerated.
+        """
+        if self.handle_contrast_trigger.is_triggered:
+            # Colors are about to change, `handle_contrast` calls us once they have
+            return True
+        style = (self.font_family_mono, self.text_color, self.text_color_highlight)
+        snippets = list(self.snippets)
+        rendered = self._markup_snippets
+        if style == self._markup_style and snippets[: len(rendered)] == rendered:
+            markup = self._markup + "".join(
+                self.snippet_markup(snippet) for snippet in snippets[len(rendered) :]
+            )
+        else:
+            markup = "".join(self.snippet_markup(snippet) for snippet in snippets)
+        self._markup = markup
+        self._markup_snippets = snippets
+        self._markup_style = style
 
         # Snippets preserve leading/trailing whitespace
-        self.text = "".join(texts)
+        self.text = markup
         return True
 
-    def compute_ref_coords(
-        self, span: tuple[float, float, float, float]
-    ) -> tuple[float, float, float, float]:
+    def compute_ref_rects(
+        self, spans: list[tuple[float, float, float, float]]
+    ) -> list[tuple[float, float, float, float]]:
         """
-        Since spans are computed relative to texture, we want them in window form
-
-        Spans (x1, y1) references the top left corner of the texture
-        Spans y2 increases as it moves down
-
-        Kivy's typical origin is (0,0) at bottom-left.
-
-        ┌───────────────────────────────────────────────────────────────────────┐
-        │                                 Parent                                │
-        │   ┌───────────────────────────────────────────────────────────────┐   │
-        │   │                             Label                             │   │
-        │   │                                                               │   │
-        │   │   ┌────────────────────────────────────────────────────────┐  │   │
-        │   │   │                                                        │  │   │
-        │   │   │                        Texture                         │  │   │
-        │   │   └────────────────────────────────────────────────────────┘  │   │
-        │   │                                                               │   │
-        │   └───────────────────────────────────────────────────────────────┘   │
-        │                                                                       │
-        │                                                                       │
-        └───────────────────────────────────────────────────────────────────────┘
-
-
-        Parameters
-        ----------
-        span
-
-        Returns
-        -------
+        Convert texture-relative spans to (x, y, w, h) relative to the widget, with a single native call
 
+        Spans (x1, y1) reference the top left corner of the texture and y2 increases as it moves down, whereas Kivy's
+        origin is (0, 0) at the bottom-left.
         """
-        return compute_ref_coords(
+        return compute_ref_rects(
             self.width,
             self.height,
-            self.x,
-            self.y,
+            0,
+            0,
             *self.texture_size,
-            *span,
+            array("d", chain.from_iterable(spans)),
             self.highlight_padding_x,
             self.highlight_padding_y,
         )
 
+    def translate_ref_spans(self, *_args):
+        self.ref_spans_translate.xy = self.pos
+
     def draw_ref_spans(self, *_args, **_kwargs):
         """
         Draw ref highlights
@@ -215,40 +326,57 @@ class LabelHighlightInline(Label):
         ------
         These have a bounding box at (x1, y1, x2, y2).
         These coordinates are relative to the top left corner of the text, with the y value increasing downwards.
+
+        Highlights are drawn into `ref_spans`, relative to the widget's position. They are only rebuilt when their
+        geometry or colors change, a change in position only updates `ref_spans_translate`.
         """
+        self.translate_ref_spans()
+        key = (
+            tuple(self.size),
+            tuple(self.texture_size),
+            self.highlight_padding_x,
+            self.highlight_padding_y,
+            tuple(self.highlight_radius),
+            tuple(self.highlight_color),
+            tuple(self.kbd_color),
+            tuple(self.kbd_shadow_color),
+            dict(self.refs),
+        )
+        if key == self._ref_spans_key:
+            return
+        self._ref_spans_key = key
+
+        group = self.ref_spans
+        group.clear()
         if not self.refs:
-            with self.canvas.before:
-                self.canvas.before.clear()
             return
-        with self.canvas.before:
-            self.canvas.before.clear()
-            Color(*self.highlight_color)
-
-            for span in self.refs.get("hl", []):
-                x1, y1, x2, y2 = self.compute_ref_coords(span)
-                w = x2 - x1
-                h = y2 - y1
+        group.add(Color(*self.highlight_color))
+
+        for x1, y1, w, h in self.compute_ref_rects(self.refs.get("hl", [])):
+            group.add(
                 RoundedRectangle(
                     pos=(x1, y1), size=(w, h), radius=self.highlight_radius
                 )
-
-            kbd_inset_x = sp(1.75)
-            kbd_inset_y = sp(1.75)
-            for span in self.refs.get("kbd", []):
-                x1, y1, x2, y2 = self.compute_ref_coords(span)
-                w = x2 - x1
-                h = y2 - y1
-                # darker background
-                Color(*self.kbd_shadow_color)
+            )
+
+        kbd_inset_x = sp(1.75)
+        kbd_inset_y = sp(1.75)
+        for x1, y1, w, h in self.compute_ref_rects(self.refs.get("kbd", [])):
+            # darker background
+            group.add(Color(*self.kbd_shadow_color))
+            group.add(
                 RoundedRectangle(
                     pos=(x1 - kbd_inset_x, y1 - kbd_inset_y),
                     size=(w, h),
                     radius=self.highlight_radius,
                 )
-                Color(*self.kbd_color)
+            )
+            group.add(Color(*self.kbd_color))
+            group.add(
                 RoundedRectangle(
                     pos=(x1, y1), size=(w, h), radius=self.highlight_radius
                 )
+            )
 
 
 @kivy_cache(cache_name="text_contrast", key_func=cache_key_text_contrast, limit=1000)
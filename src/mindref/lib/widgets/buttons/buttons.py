@@ -67,8 +67,7 @@ class ThemedButton(ButtonBehavior, BoxLayout, RippleMixin):
     def _on_touch_down_ripple(self, touch):
         if super().on_touch_down(touch):
             self.touch = self.normalize_touch_pos(*touch.pos)
-            self.no_touch_trigger.cancel()
-            self.has_touch_trigger()
+            self.start_ripple()
             return True
         return False
 
@@ -80,8 +79,7 @@ class ThemedButton(ButtonBehavior, BoxLayout, RippleMixin):
 
     def _on_touch_up(self, touch):
         super().on_touch_up(touch)
-        self.has_touch_trigger.cancel()
-        self.no_touch_trigger()
+        self.release_ripple()
         return True
 
 
@@ -1,3 +1,7 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from kivy.clock import Clock
 from kivy.loader import Loader
 from kivy.properties import ObjectProperty, StringProperty
@@ -6,11 +10,15 @@ from mindref.lib.utils import get_app, import_kv
 from mindref.lib.widgets.buttons.buttons import ThemedButton
 from mindref.lib.widgets.effects.ripple import RippleMixin
 
+if TYPE_CHECKING:
+    from pathlib import Path
+
 import_kv(__file__)
 
 
 class NoteCategoryButton(ThemedButton, RippleMixin):
     source = StringProperty()
+    thumbnail = StringProperty()
     text = StringProperty()
     image = ObjectProperty()
     tx_category = ObjectProperty(Loader.loading_image.texture)
@@ -23,18 +31,61 @@ class NoteCategoryButton(ThemedButton, RippleMixin):
         self.set_category_tx_trigger = Clock.create_trigger(
             self.category_tx_loaded, timeout=0.1
         )
-        self.fbind("source", self.load_category_tx_trigger)
+        self.fbind("source", self.request_thumbnail)
+        self.fbind("thumbnail", self.load_category_tx_trigger)
+        self.text = text
+        self.refresh_source()
+
+    def refresh_source(self):
+        """Look up the category image again, reloading the texture if it changed"""
         self.source = (
-            str(uri) if (uri := get_app().note_service.category_image_uri(text)) else ""
+            str(uri)
+            if (uri := get_app().note_service.category_image_uri(self.text))
+            else ""
         )
-        self.text = text
 
     def category_tx_loaded(self, *_args):
         self.tx_category = self.img_loader.texture
 
+    def request_thumbnail(self, *_args):
+        """Category images can be full size photos, load a copy scaled to the button instead"""
+        if not self.source:
+            return
+        app = get_app()
+        size = int(self.height)
+        if app.category_atlas.enabled:
+            app.category_atlas.request(
+                self.text,
+                self.source,
+                on_complete=self.atlas_region_loaded,
+                size=(size, size),
+            )
+            return
+        self.request_standalone_thumbnail()
+
+    def request_standalone_thumbnail(self):
+        size = int(self.height)
+        get_app().thumbnail_service.request(
+            self.source, on_complete=self.thumbnail_loaded, size=(size, size)
+        )
+
+    def atlas_region_loaded(self, uri: str | None):
+        if uri is None:
+            # Fall back to a standalone thumbnail
+            self.request_standalone_thumbnail()
+            return
+        from kivy.core.image import Image as CoreImage
+
+        self.tx_category = CoreImage(uri).texture
+
+    def thumbnail_loaded(self, thumbnail: Path | None):
+        # Fall back to the source image if it could not be thumbnailed
+        self.img_loader = None
+        self.thumbnail = str(thumbnail) if thumbnail else self.source
+
     def load_category_texture(self, *_args):
         if self.img_loader is None:
-            self.img_loader = Loader.image(self.source)
+            self.img_loader = Loader.image(self.thumbnail)
         if self.img_loader.loaded:
             self.tx_category = self.img_loader.texture
         else:
@@ -1,6 +1,7 @@
 from kivy.clock import Clock
 from kivy.properties import (
     ListProperty,
+    NumericProperty,
     ObjectProperty,
 )
 from kivy.uix.boxlayout import BoxLayout
@@ -12,38 +13,81 @@ import_kv(__file__)
 
 
 class NoteCategories(BoxLayout):
+    """
+    Grid of category buttons, kept in the order of `categories`
+
+    Buttons are keyed by category. Removed categories keep their button, so clearing and rediscovering categories
+    (as a refresh does) reattaches the existing buttons rather than rebuilding them and reloading their images.
+    Buttons are dropped when `storage_path` changes.
+
+    Attributes
+    ----------
+    storage_path
+        Root of the storage `categories` belong to
+    create_batch_size
+        Maximum number of buttons created per frame. Remaining buttons are created in the following frames.
+    """
+
     category_container = ObjectProperty()
     categories = ListProperty()
+    storage_path = ObjectProperty(allownone=True)
+    create_batch_size = NumericProperty(12)
 
     def __init__(self, **kwargs):
+        self.buttons: dict[str, NoteCategoryButton] = {}
         super().__init__(**kwargs)
         fbind = self.fbind
         self.draw_categories_trigger = Clock.create_trigger(self.draw_categories)
         fbind("categories", self.draw_categories_trigger)
 
+    def on_storage_path(self, *_args):
+        """Categories of another storage, the kept buttons won't be reused"""
+        if self.category_container is not None:
+            for cat_btn in self.buttons.values():
+                if cat_btn.parent is self.category_container:
+                    self.category_container.remove_widget(cat_btn)
+        self.buttons.clear()
+
     def category_callback(self, instance: "NoteCategoryButton"):
         self.parent.category_selected(instance)
 
+    def make_button(self, category: str) -> NoteCategoryButton:
+        cat_btn = NoteCategoryButton(text=category)
+        cat_btn.bind(on_release=self.category_callback)
+        return cat_btn
+
     def draw_categories(self, *_args):
+        """
+        Reconcile the container's children with `categories`, moving only the buttons that are out of place.
+
+        Notes
+        -----
+        Widget children are stored in reverse, the GridLayout displays `children[-1]` first.
+        """
         container = self.category_container
+        categories = list(dict.fromkeys(self.categories))
+        wanted = set(categories)
 
-        screen_categories = {child.text for child in container.children}
-        prop_categories = set(self.categories)
+        # Removal
+        for child in [c for c in container.children if c.text not in wanted]:
+            container.remove_widget(child)
 
-        remove_categories = screen_categories - prop_categories
-        add_categories = prop_categories - screen_categories
+        # Addition and ordering
+        created = 0
+        for position, category in enumerate(categories):
+            if (cat_btn := self.buttons.get(category)) is None:
+                if created >= self.create_batch_size:
+                    # Continue next frame, the categories placed so far are already in order
+                    self.draw_categories_trigger()
+                    return
+                cat_btn = self.buttons[category] = self.make_button(category)
+                created += 1
+            elif cat_btn.parent is None:
+                cat_btn.refresh_source()
 
-        # Removal
-        for r_cat in remove_categories:
-            matched_btn = next(
-                (child for child in container.children if child.text == r_cat), None
-            )
-            if not matched_btn:
+            children = container.children
+            if position < len(children) and children[-1 - position] is cat_btn:
                 continue
-            container.remove_widget(matched_btn)
-
-        # Addition
-        for a_cat in add_categories:
-            cat_btn = NoteCategoryButton(text=a_cat)
-            cat_btn.bind(on_release=self.category_callback)
-            self.category_container.add_widget(cat_btn)
+            if cat_btn.parent is container:
+                container.remove_widget(cat_btn)
+            container.add_widget(cat_btn, index=len(children) - position)
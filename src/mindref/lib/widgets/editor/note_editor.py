@@ -6,7 +6,6 @@ from kivy.properties import (
     StringProperty,
 )
 from kivy.uix.boxlayout import BoxLayout
-from pygments.lexers import get_lexer_by_name
 
 from mindref.lib.utils import attrsetter, import_kv, sch_cb
 
@@ -30,13 +29,16 @@ class NoteEditor(BoxLayout):
     """
 
     editor = ObjectProperty()
-    lexer = ObjectProperty(get_lexer_by_name("Markdown"))
+    lexer = ObjectProperty()
     style_name = StringProperty("paraiso-dark")
     init_text = StringProperty()
     mode = OptionProperty("edit", options=["add", "edit"])
     title_widget = ObjectProperty()
 
     def __init__(self, **kwargs):
+        from pygments.lexers import get_lexer_by_name
+
+        kwargs.setdefault("lexer", get_lexer_by_name("Markdown"))
         super().__init__(**kwargs)
         self.bind(init_text=self.handle_init_text)
         self.title_widget = NoteTitleInput(size_hint_y=0.1, pos_hint={"top": 0})
@@ -1,2 +1,3 @@
+from .animation import AnimatedEffectWidget, AnimationDriver, animations
 from .pulsing import PulsingEffect
 from .spinning import SpinningEffect
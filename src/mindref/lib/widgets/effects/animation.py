@@ -0,0 +1,139 @@
+"""
+Single per-frame driver for widget animations
+
+Effects register a callback with `animations.start` rather than scheduling their own Clock intervals. The driver
+ticks every running animation from one Clock callback, and unschedules itself when nothing is running.
+
+Animations whose widget is detached from the window, fully off-screen or transparent are suspended: their callback
+is not called until the widget is visible again. While every animation is suspended the driver only polls their
+visibility, at `idle_interval`.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from weakref import WeakMethod, ref
+
+from kivy.clock import Clock
+from kivy.uix.effectwidget import EffectWidget
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from kivy.clock import ClockEvent
+    from kivy.uix.widget import Widget
+
+    AnimationCallback = Callable[[float], bool | None]
+    AnimationKey = tuple[int, Callable]
+
+
+def is_visible(widget: Widget) -> bool:
+    """Whether `widget` is attached to the window, on-screen and not transparent"""
+    if (window := widget.get_root_window()) is None:
+        return False
+    node = widget
+    while node is not window:
+        if node.opacity <= 0:
+            return False
+        node = node.parent
+    x1, y1 = widget.to_window(widget.x, widget.y)
+    x2, y2 = widget.to_window(widget.right, widget.top)
+    return x2 > 0 and y2 > 0 and x1 < window.width and y1 < window.height
+
+
+class AnimationDriver:
+    """
+    Parameters
+    ----------
+    idle_interval
+        Seconds between visibility checks while every animation is suspended
+    """
+
+    def __init__(self, idle_interval: float = 0.25):
+        self.idle_interval = idle_interval
+        self._animations: dict[
+            AnimationKey, tuple[ref[Widget], WeakMethod[AnimationCallback]]
+        ] = {}
+        self._event: ClockEvent | None = None
+        self._idle = False
+
+    def __len__(self):
+        return len(self._animations)
+
+    @staticmethod
+    def _key(callback: AnimationCallback) -> AnimationKey:
+        return id(callback.__self__), callback.__func__
+
+    def is_running(self, callback: AnimationCallback) -> bool:
+        return self._key(callback) in self._animations
+
+    def start(self, widget: Widget, callback: AnimationCallback):
+        """
+        Call `callback(dt)` every frame while `widget` is visible, until it returns False or `stop` is called.
+
+        Parameters
+        ----------
+        widget
+            Widget the animation is drawn on. Only weakly referenced.
+        callback
+            Bound method, only weakly referenced
+        """
+        self._animations[self._key(callback)] = (ref(widget), WeakMethod(callback))
+        if self._event is None or self._idle:
+            self._schedule(idle=False)
+
+    def stop(self, callback: AnimationCallback):
+        self._animations.pop(self._key(callback), None)
+
+    def _schedule(self, idle: bool):
+        if self._event is not None:
+            self._event.cancel()
+        self._idle = idle
+        self._event = Clock.schedule_interval(
+            self._tick, self.idle_interval if idle else 0
+        )
+
+    def _tick(self, dt: float):
+        animated = False
+        for key, (widget_ref, callback_ref) in list(self._animations.items()):
+            widget, callback = widget_ref(), callback_ref()
+            if widget is None or callback is None:
+                self._animations.pop(key, None)
+                continue
+            if not is_visible(widget):
+                continue
+            animated = True
+            if self._idle:
+                # Resuming, dt spans the suspension
+                continue
+            if callback(dt) is False:
+                self._animations.pop(key, None)
+
+        if not self._animations:
+            if self._event is not None:
+                self._event.cancel()
+                self._event = None
+        elif animated == self._idle:
+            self._schedule(idle=not animated)
+
+
+animations = AnimationDriver()
+
+
+class AnimatedEffectWidget(EffectWidget):
+    """
+    `EffectWidget` whose shader time is driven by `animations`, rather than an interval that runs for the lifetime of
+    the widget
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        Clock.unschedule(self._update_glsl)
+        self.fbind("parent", self._toggle_animation)
+        self._toggle_animation()
+
+    def _toggle_animation(self, *_args):
+        if self.parent is not None:
+            animations.start(self, self._update_glsl)
+        else:
+            animations.stop(self._update_glsl)
@@ -2,13 +2,15 @@ from kivy.base import EventLoop
 from kivy.properties import BoundedNumericProperty, NumericProperty
 from kivy.uix.effectwidget import EffectBase
 
+from mindref.lib.widgets.effects.shaders import shaders
+
 # cubicPulse Function from Iñigo Quiles
 # www.iquilezles.org/www/articles/functions/functions.htm
 
 effect_vars = """
-const float PULSE_WIDTH = {pulse_width:f};
-const float PULSE_PERIOD = {pulse_period:f};
-const float MIN_COLOR = {min_color:f}; 
+uniform float pulse_width;
+uniform float pulse_period;
+uniform float min_color;
 """
 
 effect_pulsing = """
@@ -21,14 +23,16 @@ float cubicPulse( float c, float w, float x ) {
 
 vec4 effect(vec4 color, sampler2D texture, vec2 text_coords, vec2 coords) {
     vec2 st = coords.xy/resolution; 
-    float hlPulse = cubicPulse(tan((time * PULSE_PERIOD)), PULSE_WIDTH, st.x);
-    hlPulse += MIN_COLOR;
+    float hlPulse = cubicPulse(tan((time * pulse_period)), pulse_width, st.x);
+    hlPulse += min_color;
     vec4 cl = vec4(color.r*(hlPulse), color.g*(hlPulse), color.b*(hlPulse), 1.0);
     // This is required to avoid Android crashing
     return (texture2D (texture, text_coords) * cl);
 }
 """
 
+shaders.register("pulsing", effect_vars + effect_pulsing)
+
 
 class PulsingEffect(EffectBase):
     pulse_width = BoundedNumericProperty(defaultvalue=0.35, min=1e-1)
@@ -53,16 +57,20 @@ class PulsingEffect(EffectBase):
         EventLoop.ensure_window()
         super().__init__(*args, **kwargs)
         self.bind(
-            pulse_width=self.build_shader,
-            pulse_period=self.build_shader,
-            min_color=self.build_shader,
+            fbo=self.set_uniforms,
+            pulse_width=self.set_uniforms,
+            pulse_period=self.set_uniforms,
+            min_color=self.set_uniforms,
         )
         self.build_shader()
 
     def build_shader(self):
-        fs_vars = effect_vars.format(
-            pulse_width=self.pulse_width,
-            pulse_period=self.pulse_period,
-            min_color=self.min_color,
-        )
-        self.glsl = fs_vars + effect_pulsing
+        """Every instance shares the same source, its parameters are uniforms set by `set_uniforms`"""
+        self.glsl = shaders.source("pulsing")
+
+    def set_uniforms(self, *_args):
+        if (fbo := self.fbo) is None:
+            return
+        fbo["pulse_width"] = float(self.pulse_width)
+        fbo["pulse_period"] = float(self.pulse_period)
+        fbo["min_color"] = float(self.min_color)
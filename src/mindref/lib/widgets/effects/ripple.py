@@ -1,6 +1,5 @@
 from kivy.base import EventLoop
 from kivy.clock import Clock
-from kivy.graphics import RenderContext
 from kivy.properties import (
     BoundedNumericProperty,
     ListProperty,
@@ -8,6 +7,9 @@ from kivy.properties import (
     StringProperty,
 )
 
+from mindref.lib.widgets.effects.animation import animations
+from mindref.lib.widgets.effects.shaders import shaders
+
 fs_header = """
 $HEADER$
 uniform vec2 resolution;
@@ -31,6 +33,8 @@ void main(void) {
 }
 """
 
+shaders.register("ripple", fs_header + fs_main)
+
 
 class RippleMixin:
     touch = ListProperty([0.0, 0.0])
@@ -43,19 +47,13 @@ class RippleMixin:
     def __init__(self, **kwargs):
         EventLoop.ensure_window()
         super().__init__(**kwargs)
-        self.canvas = RenderContext(
+        self.canvas = shaders.render_context(
+            "ripple",
             use_parent_projection=True,
             use_parent_modelview=True,
             use_parent_frag_modelview=True,
         )
-        self.has_touch_trigger = Clock.create_trigger(
-            self.increment_touch_time, interval=True, timeout=1 / 60
-        )
-        self.no_touch_trigger = Clock.create_trigger(
-            self.decrement_touch_time, interval=True, timeout=1 / 60
-        )
         Clock.schedule_once(self.init_glsl_uniforms, 0)
-        Clock.schedule_once(lambda dt: setattr(self, "fs", fs_header + fs_main), 1 / 60)
 
     def init_glsl_uniforms(self, _dt):
         """
@@ -71,7 +69,7 @@ class RippleMixin:
 
     def on_fs(self, _instance, value):
         """
-        Update the fragment shader
+        Replace the shared ripple shader with a custom one
         """
         shader = self.canvas.shader
         old_value = shader.fs
@@ -80,6 +78,16 @@ class RippleMixin:
         if not shader.success:
             shader.fs = old_value
 
+    def start_ripple(self):
+        """Grow the ripple while the touch is held"""
+        animations.stop(self.decrement_touch_time)
+        animations.start(self, self.increment_touch_time)
+
+    def release_ripple(self):
+        """Fade the ripple out once the touch is released"""
+        animations.stop(self.increment_touch_time)
+        animations.start(self, self.decrement_touch_time)
+
     def increment_touch_time(self, dt):
         """
         Increase the touch_time since the touch event is still active
@@ -88,13 +96,17 @@ class RippleMixin:
         """
 
         self.touch_time = min(self.touch_time + (dt * self.growth_rate), 2.0)
+        if self.touch_time == 2.0:
+            # Nothing left to animate until the touch is released
+            return False
+        return None
 
     def decrement_touch_time(self, dt):
         touch_time = max(self.touch_time - dt, 0)
         if touch_time == 0:
             self.touch_time = 0.0
             self.touch = [0.0, 0.0]
-            # Cancel the trigger
+            # Stop the animation
             return False
         self.touch_time = touch_time
         return None
@@ -12,6 +12,7 @@ from kivy.uix.floatlayout import FloatLayout
 
 from mindref.lib.ext import compute_overscroll
 from mindref.lib.utils import get_app, import_kv
+from mindref.lib.widgets.effects.animation import animations
 
 import_kv(__file__)
 
@@ -26,15 +27,12 @@ class RefreshSymbol(FloatLayout):
     def __init__(self, **kwargs):
         self.source = get_app().atlas_service.uri_for("refresh", atlas_name="icons")
         super().__init__(**kwargs)
-        self._scheduler = None
 
     def on_parent(self, *_args):
-        if self._scheduler:
-            self._scheduler.cancel()
-            self._scheduler = None
         if self.parent:
-            self._scheduler = Clock.schedule_interval(self.increment_spin, 1 / 60)
-            self._scheduler()
+            animations.start(self, self.increment_spin)
+        else:
+            animations.stop(self.increment_spin)
 
     def increment_spin(self, dt):
         self.event_dt = self.event_dt + dt
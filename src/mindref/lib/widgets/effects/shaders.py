@@ -0,0 +1,53 @@
+"""
+Registry of effect shader programs
+
+Effects register their GLSL source once, at import. Anything specific to an instance (touch position, pulse width
+...) is passed as a uniform, so every instance uses identical source. Kivy caches compiled shader stages by their
+source (the `kv.shader` cache), so after the first instance the remaining ones only link a program.
+"""
+
+from __future__ import annotations
+
+from kivy import Logger
+from kivy.graphics import RenderContext
+
+
+class ShaderRegistry:
+    def __init__(self):
+        self._sources: dict[str, str] = {}
+        self._failed: set[str] = set()
+
+    def register(self, name: str, fs: str) -> str:
+        """Register the fragment shader source of an effect. Returns `fs`."""
+        self._sources[name] = fs
+        self._failed.discard(name)
+        return fs
+
+    def source(self, name: str) -> str:
+        return self._sources[name]
+
+    def render_context(self, name: str, **kwargs) -> RenderContext:
+        """
+        Create a `RenderContext` using the named fragment shader.
+
+        The shader is given to the constructor, rather than replacing the default shader afterwards, so it is compiled
+        once. If the shader fails to compile, the default shader is used and later contexts don't try it again.
+
+        Parameters
+        ----------
+        name
+            Name given to `register`
+        kwargs
+            Passed to `RenderContext`
+        """
+        if name in self._failed:
+            return RenderContext(**kwargs)
+        context = RenderContext(fs=self._sources[name], **kwargs)
+        if not context.shader.success:
+            Logger.error(f"{type(self).__name__}: Shader '{name}' failed to compile")
+            self._failed.add(name)
+            return RenderContext(**kwargs)
+        return context
+
+
+shaders = ShaderRegistry()
@@ -13,10 +13,11 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.scrollview import ScrollView
 
-from mindref.lib.utils import fmt_items, import_kv, sch_cb, schedulable
+from mindref.lib.utils import fmt_items, import_kv
 
 if TYPE_CHECKING:
     from mindref.lib.domain.markdown_note import MarkdownNoteDict
+    from mindref.lib.domain.note_meta import ObservableNoteMeta
 
 import_kv(__file__)
 
@@ -26,19 +27,20 @@ class ScrollingListView(ScrollView):
 
 
 class ListView(GridLayout):
-    meta_notes = ListProperty()
+    meta_notes = ObjectProperty(allownone=True)
     pending_items = ListProperty()
     """
     Attributes
     ----------
-    meta_notes : ListProperty
-        Reflects App's note_meta
+    meta_notes : ObjectProperty
+        App's `ObservableNoteMeta`. A reset rebuilds the list, other events patch only the affected rows.
     pending_items : ListProperty
         Works a queue. When self.add_item_trigger is called, we process one at a time until returning False
     
     """
 
     def __init__(self, **kwargs):
+        self._bound_meta: "ObservableNoteMeta | None" = None
         super().__init__(**kwargs)
         self.add_item_trigger = Clock.create_trigger(
             self.add_item, timeout=0.01, interval=True
@@ -56,25 +58,77 @@ class ListView(GridLayout):
         Logger.info(f"{type(self).__name__}: add_item - complete - cancel trigger")
         return False
 
-    def on_meta_notes(self, _, value: list["MarkdownNoteDict"]):
-        Logger.info(f"{type(self).__name__} : on_meta_notes : {len(value)} items")
-        clear_widgets = schedulable(self.clear_widgets)
-        startup_timer = schedulable(self.add_item_trigger)
-        self.pending_items = []
+    def on_meta_notes(self, _, value: "ObservableNoteMeta | None"):
+        handlers = {
+            "on_reset": self.reset_items,
+            "on_insert": self.insert_item,
+            "on_remove": self.remove_item,
+            "on_update": self.update_item,
+            "on_move": self.move_item,
+        }
+        if (previous := self._bound_meta) is not None:
+            for event, handler in handlers.items():
+                previous.funbind(event, handler)
+        self._bound_meta = value
+        if value is None:
+            self.reset_items(None, [])
+            return
+        for event, handler in handlers.items():
+            value.fbind(event, handler)
+        self.reset_items(value, list(value))
+
+    def reset_items(self, _, value: list["MarkdownNoteDict"]):
+        Logger.info(f"{type(self).__name__} : reset_items : {len(value)} items")
+        # Stop adding rows and clear now, so rows from the new items aren't cleared with the old ones
+        self.add_item_trigger.cancel()
+        self.clear_widgets()
+        self.pending_items = value[::-1]
         if value:
-            self.pending_items = value[::-1]
-            sch_cb(clear_widgets, startup_timer, timeout=0.05)
-        else:
-            sch_cb(clear_widgets)
-            if self.add_item_trigger.is_triggered:
-                self.add_item_trigger.cancel()
+            self.add_item_trigger()
+
+    def _rebuilding(self) -> bool:
+        """Rows are still being added after a reset, rebuild from the current meta instead of patching"""
+        if self.pending_items or self.add_item_trigger.is_triggered:
+            self.reset_items(self.meta_notes, list(self.meta_notes))
+            return True
+        return False
+
+    def _row(self, index: int) -> "ListItem":
+        # Widget children are stored in reverse
+        return self.children[-1 - index]
+
+    def insert_item(self, _, index: int, item: "MarkdownNoteDict"):
+        if self._rebuilding():
+            return
+        self.add_widget(ListItem(content_data=item), index=len(self.children) - index)
+
+    def remove_item(self, _, index: int, _item: "MarkdownNoteDict"):
+        if self._rebuilding():
+            return
+        self.remove_widget(self._row(index))
+
+    def update_item(self, _, index: int, item: "MarkdownNoteDict"):
+        if self._rebuilding():
+            return
+        self._row(index).content_data = item
+
+    def move_item(self, _, old: int, new: int, _item: "MarkdownNoteDict"):
+        if self._rebuilding():
+            return
+        widget = self._row(old)
+        self.remove_widget(widget)
+        self.add_widget(widget, index=len(self.children) - new)
 
 
 class ListItem(ButtonBehavior, BoxLayout):
     title_text = StringProperty()
     index = NumericProperty()
+    content_data = ObjectProperty()
 
     def __init__(self, content_data: "MarkdownNoteDict", **kwargs):
         super().__init__(**kwargs)
+        self.content_data = content_data
+
+    def on_content_data(self, _, content_data: "MarkdownNoteDict"):
         self.title_text = content_data["title"]
         self.index = content_data["idx"]
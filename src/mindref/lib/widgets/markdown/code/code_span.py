@@ -1,7 +1,5 @@
 from kivy.properties import ObjectProperty, StringProperty
 from kivy.uix.gridlayout import GridLayout
-from pygments import styles
-from pygments.token import Token
 
 from mindref.lib.utils import import_kv
 
@@ -15,12 +13,16 @@ class MarkdownCodeSpan(GridLayout):
     background_color = StringProperty()
 
     def __init__(self, text, **kwargs):
+        from pygments import styles
+
         super().__init__(**kwargs)
         self.styler = styles.get_style_by_name("paraiso-dark")
         self.background_color = self.styler.background_color
         self.raw_text = text
 
     def on_raw_text(self, _, new):
+        from pygments.token import Token
+
         # Wrap in BBCode
         bb_text = f"[color={self.styler.styles[Token.Text]}]{new}[/color]"
         self.text = bb_text
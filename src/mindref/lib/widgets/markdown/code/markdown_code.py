@@ -1,10 +1,6 @@
 from kivy import Logger
 from kivy.properties import AliasProperty, ObjectProperty, StringProperty
 from kivy.uix.gridlayout import GridLayout
-from pygments import lexers, styles
-from pygments.formatters.bbcode import BBCodeFormatter
-from pygments.lexers import PythonLexer
-from pygments.util import ClassNotFound
 
 from mindref.lib.utils import import_kv
 
@@ -14,7 +10,7 @@ import_kv(__file__)
 class MarkdownCode(GridLayout):
     _text_content = StringProperty()
     content = ObjectProperty()
-    lexer = ObjectProperty(PythonLexer())
+    lexer = ObjectProperty()
     background_color = StringProperty()
     lexer_name = StringProperty()
 
@@ -29,6 +25,11 @@ class MarkdownCode(GridLayout):
     )
 
     def __init__(self, lexer: str | None, **kwargs):
+        # Pygments is imported on first use
+        from pygments import lexers, styles
+        from pygments.formatters.bbcode import BBCodeFormatter
+        from pygments.util import ClassNotFound
+
         super().__init__(**kwargs)
         self.styler = styles.get_style_by_name("paraiso-dark")
         self.formatter = BBCodeFormatter(style=self.styler)
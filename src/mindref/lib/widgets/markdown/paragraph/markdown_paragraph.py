@@ -1,6 +1,5 @@
 from kivy.properties import ObjectProperty, StringProperty
 from kivy.uix.gridlayout import GridLayout
-from pygments import styles
 
 from mindref.lib.utils import import_kv
 
@@ -13,6 +12,8 @@ class MarkdownParagraph(GridLayout):
     background_color = StringProperty()
 
     def __init__(self, **kwargs):
+        from pygments import styles
+
         super().__init__(**kwargs)
         self.styler = styles.get_style_by_name("paraiso-dark")
         self.background_color = self.styler.background_color
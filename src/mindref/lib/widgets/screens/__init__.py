@@ -1 +1,13 @@
-from .note_screen import NoteCategoryScreen
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .note_screen import NoteCategoryScreen
+
+
+def __getattr__(name: str):
+    # Screens are built on first display, importing them here would defeat that
+    if name == "NoteCategoryScreen":
+        from .note_screen import NoteCategoryScreen
+
+        return NoteCategoryScreen
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
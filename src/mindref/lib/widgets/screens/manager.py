@@ -1,5 +1,7 @@
 from collections.abc import Callable
-from typing import TYPE_CHECKING
+from importlib import import_module
+from time import perf_counter
+from typing import TYPE_CHECKING, ClassVar
 
 from kivy import Logger
 from kivy.properties import BooleanProperty, ObjectProperty
@@ -10,13 +12,12 @@ from mindref.lib import DisplayState
 from mindref.lib.domain.events import FilePickerEvent
 from mindref.lib.ext import RollingIndex
 from mindref.lib.utils import import_kv, sch_cb, schedulable, trigger_factory
-from mindref.lib.widgets.app_menu.app_menu import AppMenu
 from mindref.lib.widgets.behavior.interact_behavior import InteractBehavior
 from mindref.lib.widgets.behavior.refresh_behavior import RefreshBehavior
-from mindref.lib.widgets.dialog.filepicker_dialog import LoadDialog
-from mindref.lib.widgets.editor.category_editor import CategoryEditor
 
 if TYPE_CHECKING:
+    from kivy.uix.screenmanager import Screen
+
     from mindref.lib.domain.events import PAGINATION_DIRECTION
     from mindref.lib.domain.markdown_note import MarkdownNoteDict
     from mindref.lib.widgets.buttons.category import NoteCategoryButton
@@ -33,6 +34,23 @@ class NoteAppScreenManager(InteractBehavior, RefreshBehavior, ScreenManager):
     reversed_transition = BooleanProperty(False)
     screen_triggers: Callable[[str], None]
 
+    lazy_screens: ClassVar[dict[str, str]] = {
+        "note_screen_0": "mindref.lib.widgets.screens.note_screen.NoteCategoryScreen",
+        "note_screen_1": "mindref.lib.widgets.screens.note_screen.NoteCategoryScreen",
+        "list_view_screen": "mindref.lib.widgets.screens.list_view_screen.NoteListViewScreen",
+        "note_edit_screen": "mindref.lib.widgets.screens.note_edit_screen.NoteEditScreen",
+        "screen_container": "mindref.lib.widgets.screens.screen_container.ScreenContainer",
+        "error_message_screen": "mindref.lib.widgets.screens.message_screen.ErrorMessageScreen",
+    }
+    """
+    Attributes
+    ----------
+    lazy_screens: ClassVar[dict[str, str]]
+        Screen name -> dotted path of its class. These screens (and the modules, KV rules and libraries behind them)
+        are only imported and built the first time they're requested with `get_screen`, i.e. on first display.
+        Only the chooser screen is declared in KV.
+    """
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.note_screen_cycler = RollingIndex(size=2)
@@ -42,16 +60,37 @@ class NoteAppScreenManager(InteractBehavior, RefreshBehavior, ScreenManager):
         self.app.bind(menu_open=self.setter("menu_open"))
         self.fbind("menu_open", self.handle_menu_state)
         self.fbind("reversed_transition", self.handle_reversed_transition)
-        self.screen_triggers = trigger_factory(self, "current", self.screen_names)
+        self.screen_triggers = trigger_factory(
+            self, "current", [*self.screen_names, *self.lazy_screens]
+        )
         self.drawer = self.drawer_cls(size_hint=(0.3, 1))
         self.drawer.bind(on_close=lambda *_: setattr(self.app, "menu_open", False))
 
+    def get_screen(self, name: str) -> "Screen":
+        if name in self.lazy_screens and not self.has_screen(name):
+            self.load_screen(name)
+        return super().get_screen(name)
+
+    def load_screen(self, name: str) -> "Screen":
+        """Import, build and add a screen from `lazy_screens`"""
+        start = perf_counter()
+        module_path, _, cls_name = self.lazy_screens[name].rpartition(".")
+        screen_cls = getattr(import_module(module_path), cls_name)
+        screen = screen_cls(name=name)
+        self.add_widget(screen)
+        Logger.info(
+            f"{type(self).__name__}: load_screen - {name} in {(perf_counter() - start) * 1000:.1f}ms"
+        )
+        return screen
+
     def on_refresh(self, state: bool):
         self.dispatch_children("on_refresh", state)
         return True
 
     def handle_menu_state(self, _, menu_open: bool):
         if menu_open:
+            from mindref.lib.widgets.app_menu.app_menu import AppMenu
+
             view = AppMenu()
             self.drawer.content = view
             self.drawer.open()
@@ -88,17 +127,10 @@ class NoteAppScreenManager(InteractBehavior, RefreshBehavior, ScreenManager):
             case (_, "error"):
                 self.handle_error_message()
             case (_, "category_editor"):
+                from mindref.lib.widgets.editor.category_editor import CategoryEditor
+
                 # Attach a CategoryEditor to the ScreenContainer
-                container_screen = next(
-                    (
-                        screen
-                        for screen in self.screens
-                        if screen.name == "screen_container"
-                    ),
-                    None,
-                )
-                if not container_screen:
-                    raise ValueError("No Screen Container Found")
+                container_screen = self.get_screen("screen_container")
                 container_screen.content = CategoryEditor()
                 trigger_screen = schedulable(self.screen_triggers, "screen_container")
                 sch_cb(trigger_screen, timeout=0.1)
@@ -177,14 +209,14 @@ class NoteAppScreenManager(InteractBehavior, RefreshBehavior, ScreenManager):
         self.screen_triggers("error_message_screen")
 
     def open_file_picker(self, event: FilePickerEvent):
+        from mindref.lib.widgets.dialog.filepicker_dialog import LoadDialog
+
         action = event.Action
 
         match event:
             case FilePickerEvent(
-                action=action.OPEN_FOLDER
-                | action.OPEN_FILE as event_action,
-                ext_filter=list()
-                | None as ext_filter,
+                action=action.OPEN_FOLDER | action.OPEN_FILE as event_action,
+                ext_filter=list() | None as ext_filter,
                 on_complete=on_complete,
                 start_folder=start_folder,
             ):
@@ -39,6 +39,9 @@ class NoteEditScreen(InteractScreen):
         app = get_app()
         app.bind(editor_note=self.handle_app_editor_note)
         app.bind(display_state=self.handle_app_display_state)
+        # Built on first display, after the app set the note and mode to edit
+        self.handle_app_editor_note(app, app.editor_note)
+        self.handle_app_display_state(app, app.display_state)
 
     def handle_app_display_state(self, _, value: DisplayState):
         _, new = value
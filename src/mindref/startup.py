@@ -0,0 +1,140 @@
+"""
+Startup timing
+
+Records milestones relative to the moment `mindref` was first imported, and optionally the time spent importing
+individual modules. The report is logged once the first frame has been drawn.
+
+This module must stay import-light (stdlib only) since it's imported before Kivy.
+
+Set the environment variable ``MINDREF_STARTUP_REPORT=1`` to include per-module import times in the report.
+"""
+
+from __future__ import annotations
+
+import importlib.abc
+import os
+import sys
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from importlib.machinery import ModuleSpec
+    from types import ModuleType
+
+_T0 = perf_counter()
+_MARKS: list[tuple[str, float]] = []
+_IMPORTS: dict[str, float] = {}
+_REPORTED = False
+
+REPORT_ENV = "MINDREF_STARTUP_REPORT"
+TIMED_PACKAGES = ("mindref", "kivy", "PIL", "pygments", "mistune", "toolz")
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Wraps a Loader, recording the time spent executing the module (inclusive of nested imports)"""
+
+    def __init__(self, loader: importlib.abc.Loader):
+        self.loader = loader
+
+    def create_module(self, spec: ModuleSpec) -> ModuleType | None:
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        start = perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            _IMPORTS[module.__name__] = perf_counter() - start
+
+    def __getattr__(self, item):
+        # Resource readers, get_data, etc. are forwarded to the wrapped loader
+        return getattr(self.loader, item)
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """Meta path finder that defers to the remaining finders and times modules within `packages`"""
+
+    def __init__(self, packages: Sequence[str] = TIMED_PACKAGES):
+        self.packages = tuple(packages)
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None = None,
+        target: ModuleType | None = None,
+    ) -> ModuleSpec | None:
+        if fullname.partition(".")[0] not in self.packages:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader)
+            return spec
+        return None
+
+
+def install(packages: Sequence[str] = TIMED_PACKAGES) -> ImportTimer:
+    """Install an `ImportTimer` ahead of the default finders. Idempotent."""
+    installed = next((f for f in sys.meta_path if isinstance(f, ImportTimer)), None)
+    if installed:
+        return installed
+    timer = ImportTimer(packages)
+    sys.meta_path.insert(0, timer)
+    return timer
+
+
+def uninstall() -> None:
+    sys.meta_path[:] = [f for f in sys.meta_path if not isinstance(f, ImportTimer)]
+
+
+def enabled() -> bool:
+    return os.environ.get(REPORT_ENV, "0") not in {"", "0", "False", "false"}
+
+
+def elapsed() -> float:
+    """Seconds since `mindref` was first imported"""
+    return perf_counter() - _T0
+
+
+def mark(label: str) -> float:
+    """Record a named milestone, returning seconds since start"""
+    t = elapsed()
+    _MARKS.append((label, t))
+    return t
+
+
+def import_times(limit: int | None = None) -> list[tuple[str, float]]:
+    """Recorded import times, slowest first"""
+    ordered = sorted(_IMPORTS.items(), key=lambda x: x[1], reverse=True)
+    return ordered[:limit] if limit is not None else ordered
+
+
+def format_report(limit: int = 20) -> list[str]:
+    lines = [f"{label:<24} {t * 1000:>9.1f} ms" for label, t in _MARKS]
+    if _IMPORTS:
+        lines.append(f"Slowest imports (cumulative, {len(_IMPORTS)} timed)")
+        lines.extend(
+            f"  {name:<60} {t * 1000:>9.1f} ms" for name, t in import_times(limit)
+        )
+    return lines
+
+
+def first_frame(*_args) -> None:
+    """
+    Schedule with `Clock.schedule_once` from `App.on_start`. Marks time-to-first-frame and logs the report once.
+    """
+    global _REPORTED
+    if _REPORTED:
+        return
+    _REPORTED = True
+    mark("first_frame")
+
+    from kivy import Logger
+
+    for line in format_report():
+        Logger.info(f"Startup: {line}")
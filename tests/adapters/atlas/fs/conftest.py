@@ -65,3 +65,13 @@ def stored_atlas(tmpdir, img_name, img_maker):
         return atlas_folder_path, img_names
 
     return _stored_atlas
+
+
+@pytest.fixture
+def gl_window():
+    """Loading textures needs a GL context"""
+    from kivy.core.window import Window
+
+    if Window is None:
+        pytest.skip("No window provider")
+    return Window
@@ -5,6 +5,7 @@ import string
 from pathlib import Path
 
 import pytest
+from PIL import Image
 
 from mindref.lib.adapters.atlas.fs.fs_atlas_repository import AtlasService
 
@@ -101,3 +102,179 @@ def test_append_atlas(stored_atlas, atlas_type, n, img_name, duplicated, img_mak
         == f"atlas://{atlas_file.with_suffix('')}/{app_img_name}"
     )
     assert set(atlas_folder.iterdir()).issuperset(atlas_folder_contents)
+
+
+@pytest.mark.atlas
+def test_atlas_index(stored_atlas, monkeypatch):
+    """
+    Given a stored atlas
+    Lookups are served from the index until the atlas file changes
+    """
+    atlas_folder, image_names = stored_atlas("test_atlas", "multi", 5)
+    atlas_file = (atlas_folder / "test_atlas").with_suffix(".atlas")
+    service = AtlasService(storage_path=atlas_folder.parent)
+
+    for img in image_names:
+        assert f"test_atlas.{img}" in service
+        assert service.get_from_atlas(img, "test_atlas").size == (10, 10)
+    assert "test_atlas.missing" not in service
+    with pytest.raises(KeyError):
+        service.get_from_atlas("missing", "test_atlas")
+
+    def no_read(*args, **kwargs):
+        raise AssertionError("Atlas file was reread")
+
+    with monkeypatch.context() as m:
+        m.setattr(json, "load", no_read)
+        assert all(f"test_atlas.{img}" in service for img in image_names)
+
+    # Rewrite the file externally, dropping an image
+    data = json.loads(atlas_file.read_text())
+    removed = image_names[0]
+    data = {
+        page: {k: v for k, v in m.items() if k != removed} for page, m in data.items()
+    }
+    atlas_file.write_text(json.dumps(data, indent=1))
+    assert f"test_atlas.{removed}" not in service
+    assert f"test_atlas.{image_names[1]}" in service
+
+
+def save_images(img_maker, directory, names, size):
+    paths = []
+    for name in names:
+        fp = (Path(directory) / name).with_suffix(".png")
+        img_maker(*size).save(fp)
+        paths.append(fp)
+    return paths
+
+
+@pytest.mark.atlas
+def test_append_fills_free_space(stored_atlas, img_maker, tmp_path):
+    """
+    Given a mono atlas page with free space
+    Saving small images packs them into that page instead of a new one
+    """
+    atlas_folder, image_names = stored_atlas("test_atlas", "mono", 5)
+    atlas_file = (atlas_folder / "test_atlas").with_suffix(".atlas")
+    service = AtlasService(storage_path=atlas_folder.parent)
+    pages = set(json.loads(atlas_file.read_text()))
+
+    new_names = ["newa", "newb"]
+    new_paths = save_images(img_maker, tmp_path, new_names, (8, 8))
+    service.save_to_atlas(new_paths, new_names, atlas_name="test_atlas")
+
+    data = json.loads(atlas_file.read_text())
+    assert set(data) == pages
+    assert sorted(n for members in data.values() for n in members) == sorted(
+        image_names + new_names
+    )
+    for name, fp in zip(new_names, new_paths):
+        expected = Image.open(fp).convert("RGBA")
+        assert list(service.get_from_atlas(name, "test_atlas").getdata()) == list(
+            expected.getdata()
+        )
+
+
+@pytest.mark.atlas
+def test_compact_atlas(stored_atlas):
+    """
+    Given a multi atlas with one image per page
+    Compacting repacks all images into a single power-of-two page
+    """
+    atlas_folder, image_names = stored_atlas("test_atlas", "multi", 6)
+    atlas_file = (atlas_folder / "test_atlas").with_suffix(".atlas")
+    service = AtlasService(storage_path=atlas_folder.parent)
+    before = {
+        name: list(service.get_from_atlas(name, "test_atlas").convert("RGBA").getdata())
+        for name in image_names
+    }
+    assert len(json.loads(atlas_file.read_text())) == 6
+
+    pages = service.compact_atlas("test_atlas")
+
+    assert len(pages) == 1
+    data = json.loads(atlas_file.read_text())
+    assert list(data) == ["test-atlas-0.png"]
+    assert sorted(p.name for p in atlas_folder.glob("*.png")) == ["test-atlas-0.png"]
+    for name in image_names:
+        assert f"test_atlas.{name}" in service
+        assert (
+            list(service.get_from_atlas(name, "test_atlas").getdata()) == before[name]
+        )
+
+
+@pytest.mark.atlas
+def test_get_many_from_atlas(stored_atlas, monkeypatch):
+    """
+    Given a multi page atlas
+    Batch retrieval decodes each page once and matches single retrieval
+    """
+    atlas_folder, image_names = stored_atlas("test_atlas", "multi", 5)
+    service = AtlasService(storage_path=atlas_folder.parent, page_cache_size=2)
+    expected = {
+        name: list(service.get_from_atlas(name, "test_atlas").getdata())
+        for name in image_names
+    }
+
+    service = AtlasService(storage_path=atlas_folder.parent, page_cache_size=2)
+    opened = []
+    real_open = Image.open
+
+    def counting_open(fp, *args, **kwargs):
+        opened.append(Path(fp).name)
+        return real_open(fp, *args, **kwargs)
+
+    monkeypatch.setattr(Image, "open", counting_open)
+    images = service.get_many_from_atlas(image_names, "test_atlas")
+
+    assert {name: list(img.getdata()) for name, img in images.items()} == expected
+    assert len(opened) == len(set(opened)) == 5
+    assert len(service._pages) == 2
+
+    # Most recently used pages are served from cache
+    service.get_from_atlas(image_names[-1], "test_atlas")
+    assert len(opened) == 5
+    with pytest.raises(KeyError):
+        service.get_many_from_atlas(["missing"], "test_atlas")
+
+
+@pytest.mark.atlas
+def test_reload_rewritten_pages(tmp_path, gl_window):
+    """
+    Given an atlas whose regions were loaded through `atlas://`
+    Save to, compact and remove from the atlas, rewriting its pages under the same filenames
+    Check that reloaded regions show the current pixels
+    """
+    from kivy.core.image import Image as CoreImage
+
+    colors = {"red": (255, 0, 0, 255), "blue": (0, 0, 255, 255)}
+    for name, color in colors.items():
+        Image.new("RGBA", (16, 16), color).save(tmp_path / f"{name}.png")
+    storage_path = tmp_path / "atlas"
+    storage_path.mkdir()
+    service = AtlasService(storage_path=storage_path, builtin_atlases={"test_atlas"})
+
+    def center(name: str) -> tuple[int, ...]:
+        texture = CoreImage(service.uri_for(name, "test_atlas")).texture
+        w, h = texture.size
+        i = (h // 2 * w + w // 2) * 4
+        return tuple(texture.pixels[i : i + 4])
+
+    service.save_to_atlas(
+        [tmp_path / "red.png"], ["red"], "test_atlas", atlas_size=(64, 64)
+    )
+    assert center("red") == colors["red"]
+
+    # Packed into the page already loaded
+    service.save_to_atlas([tmp_path / "blue.png"], ["blue"], "test_atlas")
+    assert center("blue") == colors["blue"]
+    assert center("red") == colors["red"]
+
+    # Moves both regions
+    service.compact_atlas("test_atlas")
+    assert center("blue") == colors["blue"]
+    assert center("red") == colors["red"]
+
+    service.remove_from_atlas(["red"], "test_atlas")
+    service.compact_atlas("test_atlas")
+    assert center("blue") == colors["blue"]
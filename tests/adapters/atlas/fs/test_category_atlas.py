@@ -0,0 +1,126 @@
+import json
+import os
+
+import pytest
+from PIL import Image
+
+from mindref.lib.adapters.atlas.fs.category_atlas import CategoryAtlas
+from mindref.lib.adapters.atlas.fs.fs_atlas_repository import AtlasService
+from mindref.lib.adapters.atlas.fs.thumbnails import ThumbnailService
+
+SIZE = (32, 32)
+
+
+@pytest.fixture
+def category_atlas(tmp_path):
+    storage_path = tmp_path / "atlas"
+    storage_path.mkdir()
+    atlas_service = AtlasService(
+        storage_path=storage_path, builtin_atlases={CategoryAtlas.atlas_name}
+    )
+    thumbnail_service = ThumbnailService(tmp_path / "thumbnails")
+    return CategoryAtlas(atlas_service, thumbnail_service, page_size=(128, 128))
+
+
+@pytest.fixture
+def category_images(tmp_path, img_maker):
+    def _category_images(*categories):
+        images = {}
+        for category in categories:
+            fp = tmp_path / f"{category}.jpg"
+            img_maker(400, 300).save(fp)
+            images[category] = fp
+        return images
+
+    return _category_images
+
+
+def pack(category_atlas, images):
+    """Runs a batch of requests without the Clock, returning category to uri"""
+    uris = {}
+    pending = [
+        (category, source, SIZE, lambda uri, c=category: uris.__setitem__(c, uri))
+        for category, source in images.items()
+    ]
+    thumbnails = {
+        i: category_atlas.thumbnail_service.get_thumbnail(source, SIZE)
+        for i, (_, source, *_) in enumerate(pending)
+    }
+    category_atlas._pack(pending, thumbnails)
+    return uris
+
+
+def atlas_data(category_atlas):
+    service = category_atlas.atlas_service
+    return json.loads(service._match_atlas(category_atlas.atlas_name).path.read_text())
+
+
+def test_pack_categories(category_atlas, category_images):
+    images = category_images("Python", "Kivy")
+    uris = pack(category_atlas, images)
+
+    assert set(uris) == {"Python", "Kivy"}
+    assert all(uri.startswith("atlas://") for uri in uris.values())
+    data = atlas_data(category_atlas)
+    assert len(data) == 1
+    assert sum(len(m) for m in data.values()) == 2
+
+
+def test_pack_incremental(category_atlas, category_images):
+    pack(category_atlas, category_images("Python", "Kivy"))
+
+    # A new category is packed into the existing page
+    uris = pack(category_atlas, category_images("Rust"))
+    data = atlas_data(category_atlas)
+    assert len(data) == 1
+    assert sum(len(m) for m in data.values()) == 3
+    assert uris["Rust"].rsplit("/", 1)[1] in next(iter(data.values()))
+
+    # A changed image replaces its category's member
+    (source,) = category_images("Python").values()
+    st = source.stat()
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    before = category_atlas.atlas_service.image_names(category_atlas.atlas_name)
+    uris = pack(category_atlas, {"Python": source})
+    after = category_atlas.atlas_service.image_names(category_atlas.atlas_name)
+    assert len(after) == 3
+    assert uris["Python"].rsplit("/", 1)[1] in after - before
+
+
+def test_save_nothing_to_empty_atlas(category_atlas):
+    service = category_atlas.atlas_service
+    service.save_to_atlas([], [], atlas_name=category_atlas.atlas_name)
+    assert service.image_names(category_atlas.atlas_name) == set()
+
+
+def test_reload_across_batches(category_atlas, tmp_path, gl_window):
+    """
+    Given categories packed in two batches, as buttons are created in batches
+    Load each batch's regions through `atlas://` after packing it
+    Check that every region shows its own image after the later batch repacked the page
+    """
+    from kivy.core.image import Image as CoreImage
+
+    colors = {
+        "Python": (255, 0, 0, 255),
+        "Kivy": (0, 255, 0, 255),
+        "Rust": (0, 0, 255, 255),
+    }
+    images = {}
+    for category, color in colors.items():
+        images[category] = tmp_path / f"{category}.png"
+        Image.new("RGBA", (64, 64), color).save(images[category])
+
+    def center(uri: str) -> tuple[int, ...]:
+        texture = CoreImage(uri).texture
+        w, h = texture.size
+        i = (h // 2 * w + w // 2) * 4
+        return tuple(texture.pixels[i : i + 4])
+
+    first = pack(category_atlas, {c: images[c] for c in ("Python", "Kivy")})
+    assert {c: center(uri) for c, uri in first.items()} == {c: colors[c] for c in first}
+
+    second = pack(category_atlas, {"Rust": images["Rust"]})
+    assert len(atlas_data(category_atlas)) == 1
+    uris = first | second
+    assert {c: center(uri) for c, uri in uris.items()} == colors
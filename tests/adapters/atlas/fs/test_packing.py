@@ -0,0 +1,60 @@
+import random
+from itertools import combinations
+
+import pytest
+
+from mindref.lib.adapters.atlas.fs.packing import (
+    MaxRectsBin,
+    Rect,
+    next_power_of_two,
+    pack,
+    pack_pages,
+)
+
+
+def assert_valid(placements, page_sizes):
+    for _, (i, rect) in placements.items():
+        w, h = page_sizes[i]
+        assert Rect(0, 0, w, h).contains(rect)
+    for (_, (i, a)), (_, (j, b)) in combinations(placements.items(), 2):
+        assert i != j or not a.intersects(b)
+
+
+@pytest.mark.parametrize("n", [1, 10, 50])
+def test_pack_no_overlap(n):
+    rng = random.Random(n)
+    sizes = {k: (rng.randint(4, 60), rng.randint(4, 60)) for k in range(n)}
+    bins = []
+    placements = pack(sizes, bins, (128, 128))
+    assert set(placements) == set(sizes)
+    assert_valid(placements, [(b.width, b.height) for b in bins])
+
+
+def test_pack_fills_existing_bin():
+    existing = MaxRectsBin(64, 64, occupied=[Rect(0, 0, 32, 64)])
+    bins = [existing]
+    placements = pack({"a": (32, 32), "b": (32, 32)}, bins, (64, 64))
+
+    assert len(bins) == 1
+    assert {i for i, _ in placements.values()} == {0}
+    assert all(rect.x >= 32 for _, rect in placements.values())
+
+
+def test_pack_oversized_item():
+    bins = []
+    placements = pack({"big": (300, 20)}, bins, (128, 128))
+    assert (bins[0].width, bins[0].height) == (512, 128)
+    assert placements["big"] == (0, Rect(0, 0, 300, 20))
+
+
+@pytest.mark.parametrize("n", [1, 16, 40])
+def test_pack_pages(n):
+    sizes = {k: (30, 30) for k in range(n)}
+    pages, placements = pack_pages(sizes, max_page_size=128)
+
+    assert_valid(placements, pages)
+    assert all(
+        w == next_power_of_two(w) and h == next_power_of_two(h) for w, h in pages
+    )
+    # 16 items of 30x30 fit a 128x128 page
+    assert len(pages) == -(-n // 16)
@@ -0,0 +1,49 @@
+import os
+
+import pytest
+from PIL import Image
+
+from mindref.lib.adapters.atlas.fs.thumbnails import ThumbnailService
+
+
+@pytest.fixture
+def thumbnail_service(tmp_path):
+    return ThumbnailService(storage_path=tmp_path / "thumbnails", size=(64, 64))
+
+
+@pytest.mark.parametrize("fmt", ["jpeg", "png"])
+def test_get_thumbnail(thumbnail_service, img_maker, tmp_path, fmt):
+    """
+    Given a large source image
+    The thumbnail fits the requested size, keeping aspect ratio
+    """
+    source = tmp_path / f"source.{fmt}"
+    img_maker(1600, 800).save(source, format=fmt)
+
+    thumbnail = thumbnail_service.get_thumbnail(source)
+    assert thumbnail.parent.parent == thumbnail_service.storage_path
+    with Image.open(thumbnail) as img:
+        assert img.size == (64, 32)
+
+    with Image.open(thumbnail_service.get_thumbnail(source, size=(16, 16))) as img:
+        assert img.size == (16, 8)
+
+
+def test_thumbnail_cached(thumbnail_service, img_maker, tmp_path, monkeypatch):
+    """
+    Given a thumbnailed source
+    The thumbnail is reused until the source is modified
+    """
+    source = tmp_path / "source.jpg"
+    img_maker(300, 300).save(source)
+    thumbnail = thumbnail_service.get_thumbnail(source)
+
+    with monkeypatch.context() as m:
+        m.setattr(ThumbnailService, "_make_thumbnail", pytest.fail)
+        assert thumbnail_service.get_thumbnail(source) == thumbnail
+
+    st = source.stat()
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    updated = thumbnail_service.get_thumbnail(source)
+    assert updated != thumbnail
+    assert updated.exists()
@@ -0,0 +1,22 @@
+import pytest
+
+from mindref.lib.adapters.atlas.fs.utils import read_img_size, read_img_sizes
+
+
+@pytest.mark.parametrize("fmt", ["png", "jpeg", "gif"])
+def test_read_img_size(img_maker, tmp_path, fmt):
+    fp = tmp_path / f"img.{fmt}"
+    img_maker(37, 21).save(fp, format=fmt)
+    assert read_img_size(fp) == (37, 21)
+
+
+def test_read_img_sizes(img_maker, tmp_path):
+    imgs = []
+    for i in range(1, 10):
+        fp = tmp_path / f"{i}.png"
+        img_maker(i * 3, i * 2).save(fp)
+        imgs.append(fp)
+
+    sizes = read_img_sizes(imgs, max_workers=4)
+    assert list(sizes) == imgs
+    assert [sizes[fp] for fp in imgs] == [(i * 3, i * 2) for i in range(1, 10)]
@@ -0,0 +1,65 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from mindref.lib.adapters.notes.android.listing import decode_listing
+
+
+class LocalStorageManager:
+    """
+    Stands in for AndroidStorageManager, with a local directory as external storage.
+
+    Listings are sent as parallel arrays, as MindRefUtils sends them, and callbacks are invoked synchronously.
+    """
+
+    def __init__(self, external_root: Path, app_root: Path, can_list: bool = True):
+        self.external_root = external_root
+        self.app_root = app_root
+        self.can_list = can_list
+        self.copied: list[str] = []
+        self.full_copies = 0
+
+    def arrays(self) -> tuple[list[str], list[int], list[int], list[bool]]:
+        paths, sizes, last_modified, is_dir = [], [], [], []
+        for dirpath, dirnames, filenames in os.walk(self.external_root):
+            for name in (*dirnames, *filenames):
+                path = Path(dirpath) / name
+                stat = path.stat()
+                paths.append(path.relative_to(self.external_root).as_posix())
+                sizes.append(0 if path.is_dir() else stat.st_size)
+                last_modified.append(stat.st_mtime_ns // 1_000_000)
+                is_dir.append(path.is_dir())
+        return paths, sizes, last_modified, is_dir
+
+    def list_external(self, on_complete):
+        if not self.can_list:
+            on_complete(None)
+            return
+        on_complete(decode_listing(*self.arrays()))
+
+    def copy_to_app_storage(self, paths, on_complete):
+        for path in paths:
+            target = self.app_root / path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(self.external_root / path, target)
+            self.copied.append(path)
+        on_complete(True)
+
+    def copy_all_to_app_storage(self, on_complete):
+        shutil.copytree(self.external_root, self.app_root, dirs_exist_ok=True)
+        self.full_copies += 1
+        on_complete(True)
+
+
+@pytest.fixture
+def local_storage(tmp_path):
+    external, app = tmp_path / "external", tmp_path / "app"
+    (external / "Python").mkdir(parents=True)
+    (external / "Python" / "Zen.md").write_text("# Zen")
+    (external / "Python" / "Python.png").write_bytes(b"png")
+    (external / "Rust").mkdir()
+    (external / "Rust" / "Ownership.md").write_text("# Ownership")
+    app.mkdir()
+    return LocalStorageManager(external, app)
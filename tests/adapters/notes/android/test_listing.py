@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from mindref.lib.adapters.notes.android.listing import (
+    decode_listing,
+    listed_categories,
+    listed_category_resources,
+)
+from mindref.lib.adapters.notes.android.mirror import ExternalEntry, StorageMirror
+from mindref.lib.domain.note_resource import CategoryResourceFiles
+
+
+def test_decode_listing():
+    listing = decode_listing(
+        ["Python", "Python/Zen.md"], [0, 12], [1, 1700000000000], [True, False]
+    )
+    assert listing == [
+        ExternalEntry("Python", 0, 1, True),
+        ExternalEntry("Python/Zen.md", 12, 1700000000000, False),
+    ]
+
+
+def test_decode_listing_length_mismatch():
+    with pytest.raises(ValueError):
+        decode_listing(["Python", "Python/Zen.md"], [0], [1, 2], [True, False])
+
+
+def test_listed_categories():
+    listing = [
+        ExternalEntry("Rust", 0, 2, True),
+        ExternalEntry("Python", 0, 3, True),
+        ExternalEntry("Python/Zen.md", 1, 9, False),
+        ExternalEntry("Python/Nested", 0, 9, True),
+    ]
+    assert listed_categories(listing, "Title", ascending=True) == ["Python", "Rust"]
+    assert listed_categories(listing, "Last Modified Date", ascending=False) == [
+        "Python",
+        "Rust",
+    ]
+    assert listed_categories(listing, "Creation Date", ascending=True) == [
+        "Rust",
+        "Python",
+    ]
+
+
+@pytest.mark.parametrize("sort_strategy", ["Title", "Last Modified Date"])
+@pytest.mark.parametrize("ascending", [True, False])
+def test_resources_match_app_storage(local_storage, sort_strategy, ascending):
+    """Resources decoded from a listing match those read from the mirrored files"""
+    external = local_storage.external_root
+    (external / "Python" / "Decorators.md").write_text("# Decorators")
+    # Distinct, whole millisecond, modification times. The copies keep them.
+    for i, name in enumerate(
+        [
+            "Python/Zen.md",
+            "Python/Decorators.md",
+            "Python/Python.png",
+            "Rust/Ownership.md",
+        ]
+    ):
+        os.utime(external / name, ns=(0, (1_700_000_000_000 - i) * 1_000_000))
+    StorageMirror(local_storage, local_storage.app_root).sync(lambda _: None)
+
+    listing = decode_listing(*local_storage.arrays())
+    resources = listed_category_resources(
+        listing, local_storage.app_root, sort_strategy, ascending
+    )
+
+    assert set(resources) == {"Python", "Rust"}
+    for category, resource in resources.items():
+        expected = CategoryResourceFiles.from_files(
+            category,
+            (local_storage.app_root / category).iterdir(),
+            sort_strategy,
+            ascending,
+        )
+        assert [n.path for n in resource.notes] == [n.path for n in expected.notes]
+        assert [n.index_ for n in resource.notes] == [n.index_ for n in expected.notes]
+        assert resource.get_image_uri() == expected.get_image_uri()
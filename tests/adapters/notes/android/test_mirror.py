@@ -0,0 +1,92 @@
+import os
+
+from mindref.lib.adapters.notes.android.mirror import (
+    ExternalEntry,
+    MirrorManifest,
+    StorageMirror,
+)
+
+
+def sync(manager):
+    results = []
+    StorageMirror(manager, manager.app_root).sync(results.append)
+    assert results == [True]
+
+
+def test_initial_sync_copies_everything(local_storage):
+    sync(local_storage)
+
+    assert sorted(local_storage.copied) == [
+        "Python/Python.png",
+        "Python/Zen.md",
+        "Rust/Ownership.md",
+    ]
+    assert (
+        local_storage.app_root / "Rust" / "Ownership.md"
+    ).read_text() == "# Ownership"
+
+
+def test_unchanged_files_are_skipped(local_storage):
+    sync(local_storage)
+    local_storage.copied.clear()
+
+    sync(local_storage)
+    assert local_storage.copied == []
+
+
+def test_changed_and_new_files_are_copied(local_storage):
+    sync(local_storage)
+    local_storage.copied.clear()
+    external = local_storage.external_root
+    (external / "Python" / "Zen.md").write_text("# Zen of Python")
+    (external / "Python" / "Decorators.md").write_text("# Decorators")
+
+    sync(local_storage)
+    assert sorted(local_storage.copied) == ["Python/Decorators.md", "Python/Zen.md"]
+    assert (
+        local_storage.app_root / "Python" / "Zen.md"
+    ).read_text() == "# Zen of Python"
+
+
+def test_missing_copy_is_restored(local_storage):
+    sync(local_storage)
+    local_storage.copied.clear()
+    os.remove(local_storage.app_root / "Python" / "Zen.md")
+
+    sync(local_storage)
+    assert local_storage.copied == ["Python/Zen.md"]
+
+
+def test_deletions_are_mirrored(local_storage):
+    sync(local_storage)
+    (local_storage.app_root / "Python" / "Local.md").write_text("Not mirrored")
+    os.remove(local_storage.external_root / "Python" / "Zen.md")
+    (local_storage.external_root / "Rust" / "Ownership.md").unlink()
+    (local_storage.external_root / "Rust").rmdir()
+
+    sync(local_storage)
+    app = local_storage.app_root
+    assert not (app / "Python" / "Zen.md").exists()
+    assert not (app / "Rust").exists()
+    # Only what was mirrored is removed
+    assert (app / "Python" / "Local.md").exists()
+
+
+def test_falls_back_to_full_copy(local_storage):
+    local_storage.can_list = False
+    sync(local_storage)
+
+    assert local_storage.full_copies == 1
+    assert (local_storage.app_root / "Python" / "Zen.md").exists()
+
+
+def test_unsafe_paths_are_skipped(tmp_path):
+    manifest = MirrorManifest(tmp_path)
+    plan = manifest.plan(
+        [
+            ExternalEntry("../Outside.md", 1, 1, False),
+            ExternalEntry("/etc/passwd", 1, 1, False),
+            ExternalEntry("Python/Zen.md", 1, 1, False),
+        ]
+    )
+    assert [entry.path for entry in plan.copy] == ["Python/Zen.md"]
@@ -0,0 +1,87 @@
+from concurrent.futures import CancelledError
+
+import pytest
+from kivy.clock import Clock
+
+from mindref.lib.adapters.notes.android.operations import (
+    OperationFailed,
+    PendingOperations,
+)
+
+
+class Starts:
+    """Records the request ids operations were started with"""
+
+    def __init__(self):
+        self.keys = []
+
+    def __call__(self, key):
+        self.keys.append(key)
+
+
+def test_same_kind_operations_are_concurrent():
+    operations, starts = PendingOperations(), Starts()
+    first = operations.submit("WRITE|NOTES", starts)
+    second = operations.submit("WRITE|NOTES", starts)
+    assert len(set(starts.keys)) == 2
+
+    # Completing out of order resolves the matching future
+    operations.resolve(starts.keys[1], "b")
+    assert second.result() == ("b",) and not first.done()
+    operations.resolve(starts.keys[0])
+    assert first.result() == ()
+    assert len(operations) == 0
+
+
+def test_failure():
+    operations, starts = PendingOperations(), Starts()
+    future = operations.submit("WRITE|NOTES", starts)
+    operations.resolve(-starts.keys[0])
+    with pytest.raises(OperationFailed):
+        future.result()
+
+
+def test_start_raising_fails_operation():
+    def start(_key):
+        raise NotImplementedError
+
+    future = PendingOperations().submit("MIRROR|READ", start)
+    assert isinstance(future.exception(), NotImplementedError)
+
+
+def test_bounded_in_flight():
+    operations, starts = PendingOperations(max_in_flight=2), Starts()
+    futures = [operations.submit("MIRROR", starts) for _ in range(4)]
+    prompt = operations.submit("PROMPT", starts, bounded=False)
+    # Two bounded operations and the unbounded prompt started
+    assert len(starts.keys) == 3
+
+    operations.resolve(starts.keys[0])
+    assert len(starts.keys) == 4
+    # Cancelling a queued operation frees its place in the queue
+    futures[3].cancel()
+    operations.resolve(starts.keys[1])
+    operations.resolve(starts.keys[3])
+    assert len(starts.keys) == 4
+    assert [f.done() for f in futures] == [True, True, True, True]
+    assert not prompt.done()
+
+
+def test_cancel_in_flight():
+    operations, starts = PendingOperations(), Starts()
+    future = operations.submit("MIRROR", starts)
+    assert operations.cancel(starts.keys[0])
+    with pytest.raises(CancelledError):
+        future.result()
+    # A late result is ignored
+    assert not operations.resolve(starts.keys[0])
+
+
+def test_timeout():
+    operations, starts = PendingOperations(), Starts()
+    future = operations.submit("MIRROR", starts, timeout=0)
+    untimed = operations.submit("PROMPT", starts, timeout=None)
+    Clock.tick()
+    assert isinstance(future.exception(), TimeoutError)
+    assert not untimed.done()
+    assert not operations.resolve(starts.keys[0])
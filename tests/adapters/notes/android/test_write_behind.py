@@ -0,0 +1,100 @@
+import pytest
+
+from mindref.lib.adapters.notes.android.write_behind import WriteBehindQueue
+
+
+class RecordingWriter:
+    """Records writes, completing them when `complete` is called"""
+
+    def __init__(self):
+        self.written = []
+        self.in_flight = []
+
+    def write_external(self, path, on_complete):
+        self.in_flight.append((path, on_complete))
+
+    def complete(self, success=True):
+        path, on_complete = self.in_flight.pop(0)
+        if success:
+            self.written.append(path)
+        on_complete(success)
+
+    def complete_all(self):
+        while self.in_flight:
+            self.complete()
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / "Python").mkdir()
+    for name in ("Zen.md", "Decorators.md"):
+        (tmp_path / "Python" / name).write_text(name)
+    return tmp_path
+
+
+def test_saves_are_coalesced(root):
+    writer = RecordingWriter()
+    queue = WriteBehindQueue(writer, root)
+    zen = root / "Python" / "Zen.md"
+    for _ in range(3):
+        queue.enqueue(zen)
+    queue.enqueue(root / "Python" / "Decorators.md")
+
+    results = []
+    queue.flush(results.append)
+    writer.complete_all()
+    assert writer.written == [zen, root / "Python" / "Decorators.md"]
+    assert results == [True]
+    assert len(queue) == 0
+
+
+def test_journal_survives_restart(root):
+    writer = RecordingWriter()
+    WriteBehindQueue(writer, root).enqueue(root / "Python" / "Zen.md")
+
+    # Process killed before the queue was flushed
+    recovered = WriteBehindQueue(writer, root)
+    assert list(recovered.pending) == ["Python/Zen.md"]
+    recovered.flush()
+    writer.complete_all()
+    assert writer.written == [root / "Python" / "Zen.md"]
+    assert len(WriteBehindQueue(writer, root)) == 0
+
+
+def test_failed_write_stays_queued(root):
+    writer = RecordingWriter()
+    queue = WriteBehindQueue(writer, root)
+    queue.enqueue(root / "Python" / "Zen.md")
+
+    results = []
+    queue.flush(results.append)
+    writer.complete(success=False)
+    assert results == [False]
+    assert list(WriteBehindQueue(writer, root).pending) == ["Python/Zen.md"]
+
+
+def test_saved_while_writing(root):
+    writer = RecordingWriter()
+    queue = WriteBehindQueue(writer, root)
+    zen = root / "Python" / "Zen.md"
+    queue.enqueue(zen)
+    queue.flush()
+    # Saved again before the first copy completed, the newer version is written too
+    queue.enqueue(zen)
+    writer.complete()
+    assert len(queue) == 1
+    writer.complete()
+    assert writer.written == [zen, zen]
+    assert len(queue) == 0
+
+
+def test_flush_joins_running_flush(root):
+    writer = RecordingWriter()
+    queue = WriteBehindQueue(writer, root)
+    queue.enqueue(root / "Python" / "Zen.md")
+    results = []
+    queue.flush(results.append)
+    queue.flush(results.append)
+    writer.complete_all()
+    assert results == [True, True]
+    assert len(writer.written) == 1
@@ -242,6 +242,74 @@ def test_get_note(n_notes, cat_selected, note_repo_factory):
         assert type(fs.get_note("0", 0, None)) == MarkdownNote
 
 
+@pytest.mark.parametrize("is_new", [True, False])
+def test_save_note(is_new, note_repo_factory):
+    """
+    Given NoteRepository
+    Save a new or edited note
+    Check it's written off the main thread, completes on the main thread and leaves no temporary files
+    """
+    from kivy.clock import Clock
+
+    from mindref.lib.domain.editable import EditableNote
+
+    fs = note_repo_factory(n_notes=3, category_selected=True)
+    category = fs.current_category
+    if is_new:
+        note = EditableNote(category=category, idx=3, md_note=None, edit_title="New")
+    else:
+        note = EditableNote.from_markdown_note(fs.get_note(category, 0, None))
+    note.edit_text = "# Saved\n\nContents"
+
+    saved = []
+    fs.save_note(note, saved.append)
+    fs.flush()
+    assert not saved
+    Clock.tick()
+
+    (md_note,) = saved
+    assert md_note.filepath.read_text(encoding="utf-8") == note.edit_text
+    assert fs.index_size() == (4 if is_new else 3)
+    assert not list(fs.storage_path.rglob("*.tmp"))
+
+
+def test_save_note_failure(note_repo_factory, app_registry, monkeypatch):
+    """
+    Given NoteRepository
+    Save an edited note, failing to replace the file
+    Check a failure event is pushed, the note is unchanged and no temporary file is left
+    """
+    from kivy.clock import Clock
+
+    from mindref.lib.domain.editable import EditableNote
+    from mindref.lib.domain.events import SaveNoteFailureEvent
+
+    fs = note_repo_factory(n_notes=3, category_selected=True)
+    md_note = fs.get_note(fs.current_category, 0, None)
+    original = md_note.filepath.read_text(encoding="utf-8")
+    note = EditableNote.from_markdown_note(md_note)
+    note.edit_text = "# Saved\n\nContents"
+
+    def replace(*_args):
+        raise PermissionError("Read only")
+
+    pushed = []
+    monkeypatch.setattr(app_registry.registry, "push_event", pushed.append)
+    monkeypatch.setattr("pathlib.Path.replace", replace)
+    saved = []
+    fs.save_note(note, saved.append)
+    fs.flush()
+    Clock.tick()
+
+    assert not saved
+    (event,) = pushed
+    assert isinstance(event, SaveNoteFailureEvent)
+    assert event.path == md_note.filepath
+    assert "Read only" in event.error
+    assert md_note.filepath.read_text(encoding="utf-8") == original
+    assert not list(fs.storage_path.rglob("*.tmp"))
+
+
 @pytest.mark.parametrize("platform", ["android", "other"])
 def test_note_repo_factory(platform, monkeypatch):
     """
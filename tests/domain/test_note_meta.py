@@ -0,0 +1,147 @@
+import random
+
+import pytest
+
+from mindref.lib.domain.note_meta import ObservableNoteMeta, meta_diff, meta_patch
+
+
+def make_meta(n):
+    return [{"filepath": f"{i}.md", "idx": i, "title": str(i)} for i in range(n)]
+
+
+def apply(meta, saved):
+    start, stop, replacement = meta_patch(meta, saved)
+    patched = list(meta)
+    patched[start:stop] = replacement
+    return patched, start, stop
+
+
+@pytest.mark.parametrize("position", [0, 3, 5])
+def test_insert(position):
+    meta = make_meta(5)
+    saved = {"filepath": "new.md", "idx": position, "title": "new"}
+    patched, start, _ = apply(meta, saved)
+
+    assert start == position
+    assert [m["filepath"] for m in patched] == [
+        *(m["filepath"] for m in meta[:position]),
+        "new.md",
+        *(m["filepath"] for m in meta[position:]),
+    ]
+    assert [m["idx"] for m in patched] == list(range(6))
+    # Entries before the insertion are untouched
+    assert all(a is b for a, b in zip(patched[:position], meta[:position]))
+
+
+@pytest.mark.parametrize("old, new", [(2, 2), (4, 0), (0, 4), (1, 3)])
+def test_edit(old, new):
+    meta = make_meta(5)
+    saved = {"filepath": f"{old}.md", "idx": new, "title": "edited"}
+    patched, start, stop = apply(meta, saved)
+
+    assert (start, stop) == (min(old, new), max(old, new) + 1)
+    assert patched[new] is saved
+    assert [m["idx"] for m in patched] == list(range(5))
+    assert sorted(m["filepath"] for m in patched) == sorted(m["filepath"] for m in meta)
+    # The original entries are not mutated
+    assert [m["idx"] for m in meta] == list(range(5))
+
+
+def apply_ops(meta, ops):
+    patched = list(meta)
+    for kind, index, target, item in ops:
+        match kind:
+            case "remove":
+                assert patched.pop(index)["filepath"] == item["filepath"]
+            case "insert":
+                patched.insert(index, item)
+            case "update":
+                assert patched[index]["filepath"] == item["filepath"]
+                patched[index] = item
+            case "move":
+                patched.insert(target, patched.pop(index))
+    return patched
+
+
+def test_diff_random():
+    rng = random.Random(0)
+    pool = [{"filepath": f"{i}.md", "title": str(i)} for i in range(30)]
+    for _ in range(200):
+        old = rng.sample(pool, rng.randint(0, 20))
+        new = [
+            {**m, "title": "edited"} if rng.random() < 0.1 else m
+            for m in rng.sample(pool, rng.randint(0, 20))
+        ]
+        assert apply_ops(old, meta_diff(old, new)) == new
+
+
+def test_diff_offset():
+    meta = make_meta(6)
+    replacement = [meta[4], meta[2], meta[3]]
+    ops = meta_diff(meta[2:5], replacement, offset=2)
+    assert ops == [("move", 4, 2, meta[4])]
+    assert apply_ops(meta, ops)[2:5] == replacement
+
+
+@pytest.fixture
+def observed():
+    meta = ObservableNoteMeta()
+    events = []
+    for name in ("on_reset", "on_insert", "on_remove", "on_update", "on_move"):
+        meta.fbind(
+            name, lambda _instance, *args, name=name: events.append((name, *args))
+        )
+    meta.reset_ratio = 1
+    return meta, events
+
+
+def test_observable_save(observed):
+    meta, events = observed
+    meta.assign(make_meta(5))
+    assert [e[0] for e in events] == ["on_reset"]
+    events.clear()
+
+    # Edit a note, moving it from 4 to 1
+    saved = {"filepath": "4.md", "idx": 1, "title": "edited"}
+    meta.patch(*meta_patch(meta, saved))
+    assert [m["filepath"] for m in meta] == ["0.md", "4.md", "1.md", "2.md", "3.md"]
+    assert events[0] == ("on_move", 4, 1, make_meta(5)[4])
+    assert ("on_update", 1, saved) in events
+    # Shifted notes are updated in place with their new index
+    assert [e[1] for e in events if e[0] == "on_update"] == [1, 2, 3, 4]
+    assert [m["idx"] for m in meta] == list(range(5))
+
+
+def test_observable_reset(observed):
+    meta, events = observed
+    meta.assign(make_meta(4))
+    meta.reset_ratio = 0.5
+    events.clear()
+    meta.assign(make_meta(4)[::-1])
+    assert [e[0] for e in events] == ["on_reset"]
+    assert list(meta) == make_meta(4)[::-1]
+
+    events.clear()
+    meta.assign(list(meta))
+    assert events == []
+
+    meta.assign([])
+    assert [e[0] for e in events] == ["on_reset"]
+    assert len(meta) == 0
+
+
+def test_app_meta_per_instance():
+    from mindref.app import MindRefApp
+
+    first, second = MindRefApp(), MindRefApp()
+    assert isinstance(first.note_category_meta, ObservableNoteMeta)
+    assert first.note_category_meta is not second.note_category_meta
+    first.note_category_meta.assign(make_meta(2))
+    assert len(second.note_category_meta) == 0
+
+    # A Kivy property, bindings see the meta replaced
+    seen = []
+    first.fbind("note_category_meta", lambda _, value: seen.append(value))
+    replacement = ObservableNoteMeta()
+    first.note_category_meta = replacement
+    assert seen == [replacement]
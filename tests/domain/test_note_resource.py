@@ -0,0 +1,61 @@
+import os
+import random
+
+import pytest
+
+from mindref.lib.domain.note_resource import CategoryResourceFiles
+
+
+def make_category(tmp_path, n_notes, sort_strategy, ascending):
+    names = [f"{i:03}.md" for i in range(n_notes)]
+    random.Random(n_notes).shuffle(names)
+    for i, name in enumerate(names):
+        (fp := tmp_path / name).write_text(name)
+        os.utime(fp, ns=(0, (i + 1) * 10**9))
+    return CategoryResourceFiles.from_files(
+        "Category", tmp_path.iterdir(), sort_strategy, ascending
+    )
+
+
+def assert_consistent(resource: CategoryResourceFiles):
+    """Ordered by stat, and indexed by position"""
+    key = (
+        (lambda n: n.path.name)
+        if resource.sort_strategy == "Title"
+        else (lambda n: n.path.stat().st_mtime_ns)
+    )
+    expected = sorted(resource.notes, key=key, reverse=not resource.ascending)
+    assert [n.path for n in resource.notes] == [n.path for n in expected]
+    assert [n.index_ for n in resource.notes] == list(range(len(resource.notes)))
+
+
+strategies = pytest.mark.parametrize(
+    "sort_strategy", ["Creation Date", "Title", "Last Modified Date"]
+)
+ascending = pytest.mark.parametrize("ascending", [True, False])
+
+
+@strategies
+@ascending
+@pytest.mark.parametrize("n_notes", [0, 1, 20])
+def test_add_note_from_path(tmp_path, sort_strategy, ascending, n_notes):
+    resource = make_category(tmp_path, n_notes, sort_strategy, ascending)
+    for name, mtime in (("050.md", 10**12), ("-1.md", 1), ("010.5.md", 5 * 10**9)):
+        (fp := tmp_path / name).write_text(name)
+        os.utime(fp, ns=(0, mtime))
+        note = resource.add_note_from_path(fp)
+        assert resource.get_note_by_idx(note.index_) is note
+        assert_consistent(resource)
+
+
+@strategies
+@ascending
+def test_reposition_note(tmp_path, sort_strategy, ascending):
+    resource = make_category(tmp_path, 20, sort_strategy, ascending)
+    for position, mtime in ((0, 10**12), (19, 1), (7, 15 * 10**9 + 1)):
+        note = resource.notes[position]
+        os.utime(note.path, ns=(0, mtime))
+        resource.update_note_ages(note)
+        resource.reposition_note(note)
+        assert resource.get_note_by_idx(note.index_) is note
+        assert_consistent(resource)
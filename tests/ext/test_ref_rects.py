@@ -0,0 +1,25 @@
+from array import array
+
+import pytest
+
+from mindref.lib.ext import compute_ref_coords, compute_ref_rects
+
+
+@pytest.mark.parametrize("origin", [(0, 0), (24, 300)])
+def test_compute_ref_rects_matches_coords(origin):
+    spans = [(4, 0, 504, 22), (0, 22, 50, 44), (120.5, 44, 180, 66)]
+    layout = (520, 80, *origin, 510, 66)
+    padding = (3, 1)
+
+    rects = compute_ref_rects(
+        *layout, array("d", [v for span in spans for v in span]), *padding
+    )
+
+    assert len(rects) == len(spans)
+    for (x, y, w, h), span in zip(rects, spans, strict=True):
+        x1, y1, x2, y2 = compute_ref_coords(*layout, *span, *padding)
+        assert (x, y, w, h) == pytest.approx((x1, y1, x2 - x1, y2 - y1))
+
+
+def test_compute_ref_rects_empty():
+    assert compute_ref_rects(10, 10, 0, 0, 10, 10, array("d"), 0, 0) == []
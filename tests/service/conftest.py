@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+from mindref.lib.adapters.notes.fs.fs_note_repository import FileSystemNoteRepository
+
+
+@pytest.fixture
+def app():
+    events = []
+    registry = type("registry", (object,), {"push_event": events.append})
+    return type("FakeApp", (object,), {"registry": registry, "events": events})
+
+
+@pytest.fixture
+def repo(tmp_path, app):
+    for category in ("Alpha", "Beta"):
+        folder = tmp_path / category
+        folder.mkdir()
+        for i in range(3):
+            fp = folder / f"{category.lower()}{i}.md"
+            fp.write_text(f"# {category} {i}\n\ntext", encoding="utf-8")
+            os.utime(fp, ns=(i * 1_000_000_000, i * 1_000_000_000))
+    fs = FileSystemNoteRepository(get_app=lambda: app, note_sorting="Title")
+    fs.fsync_writes = False
+    fs.storage_path = tmp_path
+    fs.discover_categories(None)
+    fs.current_category = "Alpha"
+    app.events.clear()
+    return fs
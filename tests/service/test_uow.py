@@ -0,0 +1,95 @@
+import pytest
+
+from mindref.lib.service.uow import FileSystemUnitOfWork
+
+
+def titles(repo, category):
+    return [note.get_note().title for note in repo.category_files[category].notes]
+
+
+def leftovers(repo):
+    return [p.name for p in repo.storage_path.iterdir() if p.name.startswith(".uow")]
+
+
+def test_commit(repo, app):
+    root = repo.storage_path
+    unchanged = repo.category_files["Alpha"].get_note_by_path(root / "Alpha/alpha0.md")
+    invalidated = []
+    with FileSystemUnitOfWork(repo, invalidate=invalidated.extend) as uow:
+        uow.write(root / "Alpha/alpha1.md", "# Edited\n\ntext")
+        uow.write(root / "Gamma/gamma0.md", "# Gamma 0\n\ntext")
+        uow.move(root / "Beta/beta0.md", root / "Alpha/beta0.md")
+        uow.delete(root / "Beta/beta1.md")
+        # Nothing is applied before committing
+        assert (root / "Alpha/alpha1.md").read_text().startswith("# Alpha")
+        assert not (root / "Gamma").exists()
+        uow.commit()
+
+    # Sorted by filename, descending
+    assert titles(repo, "Alpha") == ["Beta 0", "Alpha 2", "Edited", "Alpha 0"]
+    assert titles(repo, "Beta") == ["Beta 2"]
+    assert titles(repo, "Gamma") == ["Gamma 0"]
+    assert [n.index_ for n in repo.category_files["Alpha"].notes] == list(range(4))
+    assert repo.index_size() == 4
+    # Unchanged notes keep their loaded MarkdownNote
+    assert repo.category_files["Alpha"].get_note_by_path(unchanged.path) is unchanged
+    assert [e.category for e in app.events] == ["Gamma"]
+    assert set(invalidated) == {
+        root / "Alpha/alpha1.md",
+        root / "Gamma/gamma0.md",
+        root / "Beta/beta0.md",
+        root / "Alpha/beta0.md",
+        root / "Beta/beta1.md",
+    }
+    assert leftovers(repo) == []
+
+
+def test_failed_commit_rolls_back(repo):
+    root = repo.storage_path
+    before = {p: p.read_text() for p in root.rglob("*.md")}
+    notes = repo.category_files["Alpha"].notes
+    with FileSystemUnitOfWork(repo) as uow:
+        uow.write(root / "Alpha/alpha1.md", "# Edited\n\ntext")
+        uow.write(root / "Gamma/gamma0.md", "# Gamma 0\n\ntext")
+        uow.delete(root / "Beta/beta1.md")
+        # Fails, the destination exists
+        uow.move(root / "Beta/beta0.md", root / "Alpha/alpha0.md")
+        with pytest.raises(FileExistsError):
+            uow.commit()
+
+    assert {p: p.read_text() for p in root.rglob("*.md")} == before
+    assert not (root / "Gamma").exists()
+    assert repo.category_files["Alpha"].notes is notes
+    assert leftovers(repo) == []
+
+
+def test_discard_without_commit(repo):
+    root = repo.storage_path
+    with FileSystemUnitOfWork(repo) as uow:
+        uow.write(root / "Alpha/new.md", "# New")
+        assert len(uow) == 1
+    assert not (root / "Alpha/new.md").exists()
+    assert leftovers(repo) == []
+
+
+def test_rejects_paths_outside_categories(repo):
+    with FileSystemUnitOfWork(repo) as uow, pytest.raises(ValueError):
+        uow.delete(repo.storage_path / "top-level.md")
+
+
+def test_mirrored_storage_refuses_removals(repo, monkeypatch):
+    from mindref.lib.service.uow import UnsupportedChange
+
+    root = repo.storage_path
+    monkeypatch.setattr(repo, "mirrored_storage", True)
+    with FileSystemUnitOfWork(repo) as uow:
+        with pytest.raises(UnsupportedChange):
+            uow.delete(root / "Beta/beta1.md")
+        with pytest.raises(UnsupportedChange):
+            uow.move(root / "Beta/beta0.md", root / "Alpha/beta0.md")
+        uow.write(root / "Alpha/alpha1.md", "# Edited\n\ntext")
+        assert len(uow) == 1
+        uow.commit()
+    assert (root / "Beta/beta0.md").exists()
+    assert (root / "Beta/beta1.md").exists()
+    assert titles(repo, "Alpha")[1] == "Edited"
@@ -0,0 +1,117 @@
+import zipfile
+
+import pytest
+
+from mindref.lib.domain.markdown_note import MarkdownNote
+from mindref.lib.service.vault_import import import_vault, note_target, read_vault
+
+VAULT = {
+    "Gamma/one.md": "# One\n\ntext",
+    "Gamma/nested/two.markdown": "# Two\r\n\r\ntext",
+    "Alpha/new.md": "# New\n\ntext",
+    "Alpha/alpha0.md": "# Replaced\n\ntext",
+    "Delta/dupe.md": "# Dupe\n\ntext",
+    "Delta/nested/dupe.md": "# Dupe again\n\ntext",
+    "Delta/empty.md": "  \n",
+    "root.md": "# Root\n\ntext",
+    "Gamma/image.png": "not a note",
+    ".obsidian/workspace.md": "# Hidden",
+}
+
+
+@pytest.fixture(params=["directory", "zip"])
+def vault(request, tmp_path_factory):
+    root = tmp_path_factory.mktemp("vault")
+    if request.param == "directory":
+        for name, text in VAULT.items():
+            fp = root / name
+            fp.parent.mkdir(parents=True, exist_ok=True)
+            fp.write_bytes(text.encode("utf-8"))
+        return root
+    archive = root / "vault.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        for name, text in VAULT.items():
+            zf.writestr(name, text)
+    return archive
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("Cat/note.md", ("Cat", "note.md")),
+        ("Cat/a/b/note.MARKDOWN", ("Cat", "note.md")),
+        ("note.md", "not in a category folder"),
+        ("../Cat/note.md", "unsafe path"),
+        ("/Cat/note.md", "unsafe path"),
+        ("Cat/.hidden.md", None),
+        ("Cat/image.png", None),
+    ],
+)
+def test_note_target(source, expected):
+    assert note_target(source, None) == expected
+
+
+def test_read_vault(vault, repo):
+    result = read_vault(vault, repo.storage_path)
+    imported = {note.source: note for note in result.notes}
+
+    assert result.categories == ["Alpha", "Delta", "Gamma"]
+    assert set(imported) == {
+        "Gamma/one.md",
+        "Gamma/nested/two.markdown",
+        "Alpha/new.md",
+        next(name for name in imported if name.endswith("dupe.md")),
+    }
+    two = imported["Gamma/nested/two.markdown"]
+    assert two.path == repo.storage_path / "Gamma" / "two.md"
+    assert two.text == "# Two\n\ntext"
+    assert two.note.title == "Two"
+    skipped = dict(result.skipped)
+    assert skipped["Alpha/alpha0.md"] == "exists"
+    assert skipped["Delta/empty.md"] == "empty"
+    assert skipped["root.md"] == "not in a category folder"
+    assert len(result.skipped) == 4
+    # Nothing is written
+    assert not (repo.storage_path / "Gamma").exists()
+
+
+def test_import_vault(vault, repo, app, monkeypatch):
+    invalidated = []
+    parsed = []
+    from_text = MarkdownNote.from_text.__func__
+
+    def counting_from_text(cls, *args, **kwargs):
+        parsed.append(args)
+        return from_text(cls, *args, **kwargs)
+
+    monkeypatch.setattr(MarkdownNote, "from_text", classmethod(counting_from_text))
+    result = import_vault(
+        vault, repo, invalidate=invalidated.extend, root_category="Alpha"
+    )
+
+    root = repo.storage_path
+    assert (root / "Alpha/root.md").read_text() == "# Root\n\ntext"
+    assert (root / "Alpha/alpha0.md").read_text().startswith("# Alpha")
+    assert {n.path.name for n in repo.category_files["Gamma"].notes} == {
+        "one.md",
+        "two.md",
+    }
+    assert repo.index_size() == 5
+    # One event per new category, none per note
+    assert sorted(e.category for e in app.events) == ["Delta", "Gamma"]
+    assert sorted(invalidated) == sorted(note.path for note in result.notes)
+    # Imported notes are parsed once, while reading the vault
+    imported = [note.path for note in result.notes]
+    metas = repo._get_category_meta("Alpha", refresh=False)
+    assert sorted(args[-1] for args in parsed if args[-1] in imported) == sorted(
+        imported
+    )
+    assert [m["idx"] for m in metas] == list(range(5))
+    assert not [p for p in root.iterdir() if p.name.startswith(".uow")]
+
+
+def test_read_vault_rejects_other_files(tmp_path, repo):
+    source = tmp_path / "notes.txt"
+    source.write_text("text")
+    with pytest.raises(ValueError):
+        read_vault(source, repo.storage_path)
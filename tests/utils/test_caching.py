@@ -0,0 +1,53 @@
+from mindref.lib.utils.caching import ByteBoundedCache, cache_key_text_layout
+
+
+def test_byte_bounded_eviction():
+    cache = ByteBoundedCache(max_bytes=10)
+    cache.put("a", 1, 4)
+    cache.put("b", 2, 4)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3, 4)
+
+    assert "b" not in cache
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.nbytes == 8
+
+    cache.put("a", 4, 2)
+    assert cache.get("a") == 4
+    assert cache.nbytes == 6
+
+
+def test_byte_bounded_oversized():
+    cache = ByteBoundedCache(max_bytes=10)
+    cache.put("a", 1, 4)
+    cache.put("b", 2, 11)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+
+
+def test_cache_key_text_layout():
+    options = {"text": "stale", "font_size": 12, "padding": [0, 0, 0, 0]}
+    key = cache_key_text_layout(text="[b]a[/b]", options=options)
+    assert hash(key)
+    assert key == cache_key_text_layout(
+        text="[b]a[/b]", options=dict(options, text="other")
+    )
+    assert key != cache_key_text_layout(
+        text="[b]a[/b]", options=dict(options, text_size=(100, None))
+    )
+
+
+def test_cache_remove_where():
+    from kivy.cache import Cache
+
+    from mindref.lib.utils.caching import cache_remove_where
+
+    Cache.register("test_remove_where")
+    for key in (("a.md", "1"), ("a.md", "2"), ("b.md", "1")):
+        Cache.append("test_remove_where", key, object())
+
+    assert cache_remove_where("test_remove_where", lambda k: k[0] == "a.md") == 2
+    assert Cache.get("test_remove_where", ("a.md", "1")) is None
+    assert Cache.get("test_remove_where", ("b.md", "1")) is not None
+    assert cache_remove_where("unregistered", lambda k: True) == 0
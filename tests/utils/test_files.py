@@ -0,0 +1,29 @@
+import pytest
+
+from mindref.lib.utils import atomic_replace
+
+
+def test_atomic_replace(tmp_path):
+    path = tmp_path / "file.json"
+    path.write_text("before")
+
+    with atomic_replace(path) as tmp:
+        assert tmp.parent == tmp_path
+        tmp.write_text("after")
+        assert path.read_text() == "before"
+    assert path.read_text() == "after"
+    assert [p.name for p in tmp_path.iterdir()] == ["file.json"]
+
+
+def test_atomic_replace_failure(tmp_path):
+    path = tmp_path / "file.json"
+    path.write_text("before")
+    tmp_dir = tmp_path / "staging"
+    tmp_dir.mkdir()
+
+    with pytest.raises(RuntimeError), atomic_replace(path, tmp_dir) as tmp:
+        assert tmp.parent == tmp_dir
+        tmp.write_text("partial")
+        raise RuntimeError
+    assert path.read_text() == "before"
+    assert list(tmp_dir.iterdir()) == []
@@ -0,0 +1,72 @@
+import pytest
+from kivy.factory import Factory
+from kivy.lang import Builder
+
+from mindref.lib.utils import kv_cache
+
+KV = """
+#:set cached_width 42
+<KVCacheTestLabel@Label>:
+    text: "cached"
+    width: cached_width
+    on_touch_down: self.text = "touched"
+"""
+
+
+@pytest.fixture
+def kv_file(tmp_path):
+    kv_path = tmp_path / "kv_cache_test.kv"
+    kv_path.write_text(KV)
+    yield kv_path
+    Builder.unload_file(str(kv_path))
+
+
+def test_load_file_writes_cache(kv_file):
+    kv_cache.load_file(str(kv_file))
+
+    cached = list((kv_file.parent / kv_cache.CACHE_DIR).iterdir())
+    assert [p.name for p in cached] == [kv_cache.cache_path(kv_file, KV).name]
+    assert str(kv_file) in Builder.files
+    assert Factory.KVCacheTestLabel().text == "cached"
+
+
+def test_load_file_from_cache(kv_file, monkeypatch):
+    kv_cache.compile_file(kv_file)
+
+    def no_parse(*args, **kwargs):
+        raise AssertionError("Cache was not used")
+
+    monkeypatch.setattr(kv_cache, "Parser", no_parse)
+    kv_cache.load_file(str(kv_file))
+    label = Factory.KVCacheTestLabel()
+    assert label.text == "cached"
+    assert label.width == 42
+
+
+def test_cache_invalidated_on_change(kv_file):
+    first = kv_cache.compile_file(kv_file)
+    kv_file.write_text(KV.replace('"cached"', '"changed"'))
+    kv_cache.load_file(str(kv_file))
+
+    assert not first.exists()
+    assert Factory.KVCacheTestLabel().text == "changed"
+
+
+def test_relocate(kv_file, tmp_path):
+    cache = kv_cache.compile_file(kv_file)
+    moved = tmp_path / "moved.kv"
+    parser = kv_cache._read_cache(cache, str(moved))
+
+    assert parser.filename == str(moved)
+    (_, rule), *_ = parser.rules
+    assert rule.handlers[0].co_value.co_filename == str(moved)
+
+
+def test_load_file_rejects_root_widget(tmp_path):
+    from kivy.lang.parser import ParserException
+
+    kv_path = tmp_path / "kv_cache_root.kv"
+    kv_path.write_text(KV + "\nLabel:\n    text: 'root'\n")
+    with pytest.raises(ParserException, match="non-rules directives"):
+        kv_cache.load_file(str(kv_path))
+    assert str(kv_path) not in Builder.files
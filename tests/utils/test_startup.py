@@ -0,0 +1,36 @@
+import sys
+
+import pytest
+
+from mindref import startup
+
+
+@pytest.fixture
+def import_timer():
+    timer = startup.install(packages=("json",))
+    yield timer
+    startup.uninstall()
+
+
+def test_import_timer_records(import_timer):
+    """
+    Given an installed ImportTimer
+    Importing a module within its packages records an import time
+    """
+    sys.modules.pop("json.tool", None)
+    import json.tool  # noqa: F401
+
+    times = dict(startup.import_times())
+    assert "json.tool" in times
+    assert times["json.tool"] >= 0
+
+
+def test_import_timer_idempotent(import_timer):
+    assert startup.install() is import_timer
+    assert sum(isinstance(f, startup.ImportTimer) for f in sys.meta_path) == 1
+
+
+def test_mark_report():
+    t = startup.mark("test_mark")
+    assert t > 0
+    assert any(line.startswith("test_mark") for line in startup.format_report())
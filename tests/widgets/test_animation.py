@@ -0,0 +1,75 @@
+import pytest
+from kivy.base import EventLoop
+from kivy.uix.widget import Widget
+
+from mindref.lib.widgets.effects.animation import AnimationDriver
+
+
+class Spinner(Widget):
+    def __init__(self, frames=None, **kwargs):
+        super().__init__(**kwargs)
+        self.ticks = []
+        self.frames = frames
+
+    def tick(self, dt):
+        self.ticks.append(dt)
+        if self.frames is not None and len(self.ticks) >= self.frames:
+            return False
+        return None
+
+
+@pytest.fixture
+def window():
+    EventLoop.ensure_window()
+    window = EventLoop.window
+    added = []
+    yield window, added
+    for widget in added:
+        window.remove_widget(widget)
+
+
+@pytest.fixture
+def driver():
+    driver = AnimationDriver()
+    yield driver
+    if driver._event is not None:
+        driver._event.cancel()
+
+
+def attach(window, widget):
+    win, added = window
+    widget.size_hint = (None, None)
+    widget.size = (10, 10)
+    win.add_widget(widget)
+    added.append(widget)
+
+
+def test_ticks_until_stopped(driver, window):
+    spinner = Spinner(frames=2)
+    attach(window, spinner)
+    driver.start(spinner, spinner.tick)
+
+    for _ in range(3):
+        driver._tick(0.5)
+
+    assert spinner.ticks == [0.5, 0.5]
+    assert len(driver) == 0
+    assert driver._event is None
+
+
+def test_suspends_hidden_widgets(driver, window):
+    detached, offscreen = Spinner(), Spinner(pos=(-100, -100))
+    attach(window, offscreen)
+    driver.start(detached, detached.tick)
+    driver.start(offscreen, offscreen.tick)
+
+    driver._tick(0.1)
+    assert detached.ticks == offscreen.ticks == []
+    assert driver._idle
+
+    offscreen.pos = (0, 0)
+    driver._tick(0.25)  # Resumes, the suspended time is not animated
+    driver._tick(0.1)
+    assert offscreen.ticks == [0.1]
+    assert not driver._idle
+    assert detached.ticks == []
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+from kivy.uix.button import Button
+from kivy.uix.gridlayout import GridLayout
+
+from mindref.lib.widgets.categories import NoteCategories
+
+
+class StubCategoryButton(Button):
+    def refresh_source(self):
+        pass
+
+
+class StubCategories(NoteCategories):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.created = []
+        self.category_container = GridLayout(cols=4)
+
+    def make_button(self, category):
+        self.created.append(category)
+        return StubCategoryButton(text=category)
+
+
+@pytest.fixture
+def note_categories():
+    widget = StubCategories(create_batch_size=5)
+    yield widget
+    widget.draw_categories_trigger.cancel()
+
+
+def displayed(widget):
+    return [child.text for child in reversed(widget.category_container.children)]
+
+
+def test_batched_creation(note_categories):
+    categories = [f"Category {i}" for i in range(12)]
+    note_categories.categories = categories
+
+    note_categories.draw_categories()
+    assert displayed(note_categories) == categories[:5]
+    assert note_categories.draw_categories_trigger.is_triggered
+
+    note_categories.draw_categories()
+    note_categories.draw_categories()
+    assert displayed(note_categories) == categories
+
+
+def test_reorder_and_refresh(note_categories):
+    categories = [str(i) for i in range(20)]
+    rng = random.Random(0)
+    for _ in range(50):
+        note_categories.categories = rng.sample(categories, rng.randint(0, 20))
+        for _ in range(5):
+            note_categories.draw_categories()
+        assert displayed(note_categories) == note_categories.categories
+
+    # Buttons are reused once created
+    assert sorted(note_categories.created) == sorted(set(note_categories.created))
+
+
+def test_storage_path_change(note_categories):
+    note_categories.storage_path = "/notes"
+    note_categories.categories = ["a", "b"]
+    note_categories.draw_categories()
+    assert set(note_categories.buttons) == {"a", "b"}
+
+    # Buttons of categories from another storage are dropped, not kept for reuse
+    note_categories.storage_path = "/other"
+    assert note_categories.buttons == {}
+    assert displayed(note_categories) == []
+    note_categories.categories = ["c"]
+    note_categories.draw_categories()
+    assert set(note_categories.buttons) == {"c"}
+    assert displayed(note_categories) == ["c"]
@@ -0,0 +1,57 @@
+from collections import defaultdict
+
+import pytest
+from kivy.app import App
+from kivy.event import EventDispatcher
+from kivy.properties import DictProperty, NumericProperty
+
+from mindref.lib.widgets.list_view.list_view import ListView
+
+
+class FakeApp(EventDispatcher):
+    colors = defaultdict(lambda: (0, 0, 0, 1))
+    fonts = DictProperty({"mono": "RobotoMono", "default": "Roboto"})
+    base_font_size = NumericProperty(16)
+
+
+@pytest.fixture
+def list_view(monkeypatch):
+    monkeypatch.setattr(App, "_running_app", FakeApp())
+    widget = ListView()
+    yield widget
+    widget.add_item_trigger.cancel()
+
+
+def items(*titles):
+    return [{"title": title, "idx": idx} for idx, title in enumerate(titles)]
+
+
+def drain(widget):
+    while widget.add_item() is not False:
+        pass
+
+
+def displayed(widget):
+    return [child.title_text for child in reversed(widget.children)]
+
+
+def test_reset_while_rebuilding(list_view):
+    list_view.reset_items(None, items(*"abcdef"))
+    list_view.add_item()
+    list_view.add_item()
+    assert displayed(list_view) == ["a", "b"]
+
+    # Rows of the earlier reset are cleared at once, rows of this one are kept
+    list_view.reset_items(None, items(*"xyz"))
+    assert displayed(list_view) == []
+    assert list_view.add_item_trigger.is_triggered
+    drain(list_view)
+    assert displayed(list_view) == ["x", "y", "z"]
+
+
+def test_reset_empty(list_view):
+    list_view.reset_items(None, items("a", "b"))
+    drain(list_view)
+    list_view.reset_items(None, [])
+    assert displayed(list_view) == []
+    assert not list_view.add_item_trigger.is_triggered
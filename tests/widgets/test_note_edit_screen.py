@@ -0,0 +1,37 @@
+import pytest
+from kivy.app import App
+from kivy.event import EventDispatcher
+from kivy.properties import ObjectProperty
+
+
+class FakeApp(EventDispatcher):
+    editor_note = ObjectProperty(allownone=True)
+    display_state = ObjectProperty(("display", "display"))
+
+
+class FakeNote:
+    edit_text = "# Title\n\nBody"
+
+
+@pytest.fixture
+def app(monkeypatch):
+    fake = FakeApp()
+    monkeypatch.setattr(App, "_running_app", fake)
+    return fake
+
+
+@pytest.mark.parametrize("mode", ["edit", "add"])
+def test_built_after_editor_note_is_set(app, mode):
+    """The screen is built lazily, once the app has already set the note and mode"""
+    from mindref.lib.widgets.screens.note_edit_screen import NoteEditScreen
+
+    app.editor_note = FakeNote()
+    app.display_state = ("display", mode)
+
+    # Without KV rules, which need the app's services
+    screen = NoteEditScreen(name="note_edit_screen", **{"__no_builder": True})
+    assert screen.init_text == FakeNote.edit_text
+    assert screen.mode == mode
+
+    app.editor_note = None
+    assert screen.init_text == ""